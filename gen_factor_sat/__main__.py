@@ -1,8 +1,20 @@
 import argparse
+import cProfile
+import dataclasses
+import functools
+import json
 import os
+import random
 import sys
 
+from gen_factor_sat import batch, binary, estimate
+from gen_factor_sat.cache import InstanceCache
+from gen_factor_sat.circuit.instances import strategies
 from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.ordering import ORDERS
+from gen_factor_sat.formula.stats import EncodingStats
+from gen_factor_sat.output import COMPRESSIONS, default_number_file, default_numbers_file, default_random_file, \
+    write_binary_cnf, write_cnf
 
 parser = argparse.ArgumentParser(
     prog='gen_factor_sat',
@@ -13,22 +25,70 @@ parser = argparse.ArgumentParser(
     epilog='''examples:
     gen_factor_sat number 100 --outfile factor_100.cnf
     gen_factor_sat random --prime --error 0.001 --seed 10 --min-value 10 100 --outfile
+    gen_factor_sat batch out/ 10000:1000000:10 0:3:7 --error 0.0 --seed 10
+    gen_factor_sat numbers 35 33 39 --outfile factor_6bit.icnf
+    gen_factor_sat solve 35 1031 --solver cadical --solver glucose4 --timeout 60
+    gen_factor_sat convert factor_number100.cnfb --outfile factor_100.cnf
+    gen_factor_sat estimate 2048 4096 --strategy TseitinFactoringStrategy --max-memory-mb 4096
     ''',
     formatter_class=argparse.RawDescriptionHelpFormatter
 )
 
 parser.add_argument('--version', action='version', version='%(prog)s v{0}'.format(FactoringSat.VERSION))
 
-commands = ['number', 'random']
+commands = ['number', 'random', 'batch', 'numbers', 'solve', 'convert', 'estimate']
 subparsers = parser.add_subparsers(dest='command', required=True)
 
-parser_number = subparsers.add_parser(commands[0], help="specify a number to be factorized")
-parser_number.add_argument(
-    'value', type=int,
-    help="the number to be factorized"
+# Options shared by several commands
+encoding_options = argparse.ArgumentParser(add_help=False)
+encoding_options.add_argument(
+    '--simplify', action='store_true',
+    help='''
+    simplify the CNF by unit propagation and renumber the remaining variables.
+    The factors are encoded in the first variables.
+    '''
 )
 
-parser_number.add_argument(
+encoding_options.add_argument(
+    '--xor', action='store_true',
+    help='''
+    encode XOR-Gates as native XOR constraints and merge chains of them. The constraints
+    are written as x lines (extended DIMACS), which require a solver like CryptoMiniSat.
+    '''
+)
+
+encoding_options.add_argument(
+    '--polarity', action='store_true',
+    help='''
+    use the Plaisted-Greenbaum encoding, i.e. only encode the implications of a gate
+    required by the polarity in which its output is used.
+    '''
+)
+
+encoding_options.add_argument(
+    '--order', choices=ORDERS,
+    help='''
+    sort the clauses topologically, i.e. grouped by gate, such that the DIMACS is deterministic.
+    bfs additionally renumbers the variables by a breadth-first search from the factors.
+    '''
+)
+
+parallel_options = argparse.ArgumentParser(add_help=False)
+parallel_options.add_argument(
+    '--parallel-depth', metavar='DEPTH', type=int,
+    help='''
+    build the sub-products of the Karatsuba multiplication below the specified depth of the
+    recursion in parallel processes. The CNF only depends on the depth, not on the number of workers.
+    '''
+)
+
+parallel_options.add_argument(
+    '-w', '--workers', type=int,
+    help='''the number of processes used with --parallel-depth. (default: number of processors)'''
+)
+
+output_options = argparse.ArgumentParser(add_help=False)
+output_options.add_argument(
     '-o', '--outfile', nargs='?', type=str, const='', default='-',
     help='''
     redirect the output from stdout to the specified file. If no filename or a directory is
@@ -36,7 +96,66 @@ parser_number.add_argument(
     '''
 )
 
-parser_random = subparsers.add_parser(commands[1], help="generate a random number to be factorized")
+output_options.add_argument(
+    '--binary', action='store_true',
+    help='''
+    write the memory-mappable binary format instead of DIMACS. The format is also detected by the
+    extension .cnfb of the output file. Use the convert command to obtain the DIMACS.
+    '''
+)
+
+cache_options = argparse.ArgumentParser(add_help=False)
+cache_options.add_argument(
+    '--cache', metavar='DIRECTORY', type=str,
+    help='''
+    load the instance from the specified cache directory if it was encoded before with the same
+    options. Otherwise, the instance is encoded and stored in the cache.
+    '''
+)
+
+cache_options.add_argument(
+    '--cache-size', metavar='MB', type=int,
+    help='evict the least recently used instances if the cache exceeds the specified size in megabytes.'
+)
+
+compression_options = argparse.ArgumentParser(add_help=False)
+compression_options.add_argument(
+    '--compress', choices=COMPRESSIONS,
+    help='''
+    compress the output with gzip, xz or bz2 while it is written. The compression is also detected
+    by the extension of the output file, and default file names get the extension.
+    '''
+)
+
+instrumentation_options = argparse.ArgumentParser(add_help=False)
+instrumentation_options.add_argument(
+    '--stats', metavar='FILE', type=str,
+    help='''
+    write statistics about the encoding as JSON to the specified file, e.g. the number of
+    gates by type, the clauses by length and the time of each phase. Use - for stderr.
+    '''
+)
+
+instrumentation_options.add_argument(
+    '--profile', metavar='FILE', type=str,
+    help='profile the encoding and write the cProfile statistics to the specified file.'
+)
+
+instance_options = [
+    encoding_options, parallel_options, output_options, cache_options, compression_options, instrumentation_options
+]
+
+parser_number = subparsers.add_parser(
+    commands[0], parents=instance_options, help="specify a number to be factorized"
+)
+parser_number.add_argument(
+    'value', type=int,
+    help="the number to be factorized"
+)
+
+parser_random = subparsers.add_parser(
+    commands[1], parents=instance_options, help="generate a random number to be factorized"
+)
 parser_random.add_argument(
     'max_value', metavar='max-value', type=int,
     help='the largest value the random number can take.'
@@ -75,73 +194,337 @@ parser_random.add_argument(
     help='''the number of tries to generate a number with the specified properties. (default: 100)'''
 )
 
-parser_random.add_argument(
+
+def colon_separated(count):
+    def parse(value):
+        parts = value.split(':')
+        if len(parts) != count:
+            raise argparse.ArgumentTypeError('expected {0} colon separated integers'.format(count))
+
+        return list(map(int, parts))
+
+    return parse
+
+
+parser_batch = subparsers.add_parser(
+    commands[2], parents=[encoding_options, cache_options, compression_options],
+    help="generate random numbers for several intervals in parallel"
+)
+parser_batch.add_argument(
+    'directory', type=str,
+    help='the output directory. Each interval is written to a subdirectory factor_<min>-<max>.'
+)
+
+parser_batch.add_argument(
+    'interval', metavar='start:stop:step', type=colon_separated(3),
+    help='''
+    split the numbers from start to stop into the intervals [start, start * step),
+    [start * step, start * step^2), ...
+    '''
+)
+
+parser_batch.add_argument(
+    'numbers', metavar='random:prime:composite', type=colon_separated(3),
+    help='the number of random, prime and composite numbers generated per interval'
+)
+
+parser_batch.add_argument(
+    '-e', '--error', type=float, default=0.0,
+    help='''
+    the probability that a composite number is declared to be a prime number.
+    If set to 0 a deterministic but slower primality test is used. (default: 0.0)
+    '''
+)
+
+parser_batch.add_argument(
+    '-s', '--seed', type=int,
+    help='''
+    use the seed to derive the seeds of all instances. The instances only depend
+    on the seed and not on the number of workers.
+    '''
+)
+
+parser_batch.add_argument(
+    '-t', '--tries', type=int, default=1000,
+    help='''the number of tries to generate a number with the specified properties. (default: 1000)'''
+)
+
+parser_batch.add_argument(
+    '-w', '--workers', type=int,
+    help='''the number of processes used to generate the instances. (default: number of processors)'''
+)
+
+parser_numbers = subparsers.add_parser(
+    commands[3], parents=[compression_options],
+    help="factorize several numbers of the same length with a shared incremental CNF"
+)
+parser_numbers.add_argument(
+    'values', type=int, nargs='*',
+    help='the numbers to be factorized. All numbers must have the same bit length.'
+)
+
+parser_numbers.add_argument(
+    '-i', '--infile', type=argparse.FileType('r'),
+    help='read additional numbers, separated by whitespace, from the specified file. Use - for stdin.'
+)
+
+parser_numbers.add_argument(
     '-o', '--outfile', nargs='?', type=str, const='', default='-',
     help='''
     redirect the output from stdout to the specified file. If no filename or a directory is
-    specified, a default name is used. (default: stdout)
+    specified, a default name is used. The output uses the iCNF format with one assumption
+    block per number. (default: stdout)
+    '''
+)
+
+parser_solve = subparsers.add_parser(commands[4], help="encode numbers and solve them with pysat")
+parser_solve.add_argument(
+    'values', type=int, nargs='+',
+    help='the numbers to be factorized'
+)
+
+parser_solve.add_argument(
+    '--solver', dest='solvers', action='append',
+    help='''
+    the pysat solver to be used, e.g. cadical, glucose4 or maplechrono. If specified multiple
+    times, the solvers are raced in separate processes and the first answer is used. (default: cadical)
     '''
 )
 
+parser_solve.add_argument(
+    '--timeout', type=float,
+    help='the time in seconds after which a number is reported as UNKNOWN. Runs the solvers in separate processes.'
+)
+
+parser_solve.add_argument(
+    '--simplify', action='store_true',
+    help='simplify the CNF by unit propagation before solving it.'
+)
+
+parser_solve.add_argument(
+    '--csv', metavar='FILE', type=str,
+    help='append the results to the specified CSV file in the format of results/results.csv.'
+)
+
+parser_convert = subparsers.add_parser(
+    commands[5], parents=[compression_options], help="convert a binary CNF into DIMACS"
+)
+parser_convert.add_argument(
+    'infile', type=str,
+    help='the file in the binary format'
+)
+
+parser_convert.add_argument(
+    '-o', '--outfile', nargs='?', type=str, const='', default='-',
+    help='''
+    redirect the output from stdout to the specified file. If no filename or a directory is
+    specified, the name of the binary file with the extension .cnf is used. (default: stdout)
+    '''
+)
+
+parser_estimate = subparsers.add_parser(
+    commands[6], help="count the variables, clauses and bytes of instances without storing the clauses"
+)
+parser_estimate.add_argument(
+    'bits', type=int, nargs='+',
+    help='the bit lengths of the numbers'
+)
+
+parser_estimate.add_argument(
+    '--strategy', dest='strategies', action='append', choices=sorted(strategies()),
+    help='the strategy to be estimated, can be repeated. (default: all strategies)'
+)
+
+parser_estimate.add_argument(
+    '--seed', type=int, default=0,
+    help='the seed used to generate the numbers. (default: 0)'
+)
+
+parser_estimate.add_argument(
+    '--json', metavar='FILE', type=str,
+    help='write the estimates, including the clauses by length, as JSON to the specified file.'
+)
+
+parser_estimate.add_argument(
+    '--max-dimacs-mb', type=float,
+    help='fail if the DIMACS of an instance exceeds the specified size in megabytes.'
+)
+
+parser_estimate.add_argument(
+    '--max-memory-mb', type=float,
+    help='fail if the compactly stored clauses of an instance exceed the specified size in megabytes.'
+)
+
 args = parser.parse_args()
 
 
+def instance_cache():
+    if args.cache is None:
+        return None
+
+    return InstanceCache(args.cache, None if args.cache_size is None else args.cache_size * 2 ** 20)
+
+
+def write_instrumented(encode, filename, default_file):
+    stats = EncodingStats() if args.stats else None
+    profile = cProfile.Profile() if args.profile else None
+
+    if profile is not None:
+        profile.enable()
+
+    try:
+        if args.binary or filename.endswith('.' + binary.EXTENSION):
+            write_binary_cnf(functools.partial(encode, stats=stats), filename, default_file)
+        else:
+            write_cnf(functools.partial(encode, stats=stats), filename, default_file, compression=args.compress)
+    finally:
+        if profile is not None:
+            profile.disable()
+            profile.dump_stats(args.profile)
+
+    if stats is not None:
+        if args.stats == '-':
+            json.dump(stats.to_dict(), sys.stderr, indent=2)
+            sys.stderr.write('\n')
+        else:
+            with open(args.stats, 'w') as file:
+                json.dump(stats.to_dict(), file, indent=2)
+                file.write('\n')
+
+
 def run():
     if args.command == commands[0]:
-        result = FactoringSat.factorize_number(args.value)
-        default = 'factor_number{0}.cnf'.format(result.number.value)
-        write_cnf(result, args.outfile, default)
+        encode = functools.partial(
+            FactoringSat.factorize_number,
+            args.value,
+            simplify=args.simplify,
+            xor=args.xor,
+            polarity=args.polarity,
+            ordering=args.order,
+            cache=instance_cache(),
+            parallel_depth=args.parallel_depth,
+            workers=args.workers
+        )
+
+        write_instrumented(encode, args.outfile, default_number_file)
 
     elif args.command == commands[1]:
-        result = FactoringSat.factorize_random_number(
+        encode = functools.partial(
+            FactoringSat.factorize_random_number,
             max_value=args.max_value,
             min_value=args.min_value,
             seed=args.seed,
             prime=args.prime,
             error=args.error,
-            max_tries=args.tries
+            max_tries=args.tries,
+            simplify=args.simplify,
+            xor=args.xor,
+            polarity=args.polarity,
+            ordering=args.order,
+            cache=instance_cache(),
+            parallel_depth=args.parallel_depth,
+            workers=args.workers
         )
 
-        number_type = result.number.fold_type(
-            v_det_prime='prime',
-            v_prob_prime='prob-prime',
-            v_det_comp='composite',
-            v_prob_comp='composite',
-            v_unknown='random'
-        )
+        write_instrumented(encode, args.outfile, default_random_file)
+
+    elif args.command == commands[2]:
+        seed = args.seed
+        if seed is None:
+            seed = random.randrange(sys.maxsize)
+            print('Seed: {0}'.format(seed), file=sys.stderr)
 
-        default = 'factor_seed{0}_minn{1}_maxn{2}_{3}.cnf'.format(
-            result.generator.seed,
-            result.generator.min_value,
-            result.generator.max_value,
-            number_type
+        start, stop, step = args.interval
+        num_random, num_prime, num_composite = args.numbers
+        instances = batch.create_instances(
+            directory=args.directory,
+            start=start,
+            stop=stop,
+            step=step,
+            num_random=num_random,
+            num_prime=num_prime,
+            num_composite=num_composite,
+            error=args.error,
+            seed=seed,
+            max_tries=args.tries,
+            simplify=args.simplify,
+            xor=args.xor,
+            polarity=args.polarity,
+            ordering=args.order,
+            compression=args.compress,
+            cache=args.cache,
+            cache_size=None if args.cache_size is None else args.cache_size * 2 ** 20
         )
 
-        write_cnf(result, args.outfile, default)
+        batch.generate_batch(instances, args.directory, workers=args.workers)
 
-    else:
-        raise ValueError('Invalid command: ' + str(args.command))
+    elif args.command == commands[3]:
+        values = list(args.values)
+        if args.infile is not None:
+            values.extend(map(int, args.infile.read().split()))
 
+        encode = functools.partial(FactoringSat.factorize_numbers, values)
+        write_cnf(encode, args.outfile, default_numbers_file, compression=args.compress)
 
-def write_cnf(cnf, filename, default_file):
-    if filename == '-':
-        sys.stdout.write(cnf.to_dimacs())
-    else:
-        if not filename:
-            filename = default_file
-        else:
-            name, extension = os.path.splitext(filename)
-            if (os.path.exists(filename) and os.path.isdir(filename)) or (not extension):
-                directory = filename
-                filename = os.path.join(directory, default_file)
+    elif args.command == commands[4]:
+        # Only solving requires pysat
+        from gen_factor_sat import solve
+
+        solvers = args.solvers if args.solvers else ['cadical']
+        results = []
+        for value in args.values:
+            factor_sat = FactoringSat.factorize_number(value, simplify=args.simplify)
+
+            if len(solvers) == 1 and args.timeout is None:
+                result = solve.solve(factor_sat, solvers[0])
             else:
-                directory = os.path.dirname(os.path.realpath(filename))
+                result = solve.solve_portfolio(factor_sat, solvers, args.timeout)
 
-            if not os.path.exists(directory):
-                os.makedirs(directory)
+            factors = '' if result.factor_1 is None else ' {0} * {1}'.format(result.factor_1, result.factor_2)
+            solver = '' if result.solver is None else ' ({0})'.format(result.solver)
+            print('{0}: {1}{2} in {3} ms{4}'.format(
+                result.number, result.result, factors, result.time_ms, solver
+            ), flush=True)
 
-        with open(filename, 'w') as file:
-            file.write(cnf.to_dimacs())
+            results.append(result)
+
+        if args.csv:
+            solve.append_results(args.csv, results)
+
+    elif args.command == commands[5]:
+        dimacs_file = os.path.splitext(os.path.basename(args.infile))[0] + '.cnf'
+        with binary.open_binary(args.infile) as instance:
+            write_cnf(instance.write_dimacs, args.outfile, lambda _: dimacs_file, compression=args.compress)
+
+    elif args.command == commands[6]:
+        names = args.strategies if args.strategies else sorted(strategies())
+        estimates = []
+        print(estimate.HEADER, flush=True)
+        for name in names:
+            for bits in args.bits:
+                estimates.append(estimate.estimate(name, bits, args.seed))
+                print(estimate.format_estimate(estimates[-1]), flush=True)
+
+        if args.json:
+            with open(args.json, 'w') as file:
+                json.dump([dataclasses.asdict(entry) for entry in estimates], file, indent=2)
+                file.write('\n')
+
+        # Exceeding a limit is not a usage error, hence the usage is not printed
+        limits = [('DIMACS', 'dimacs_bytes', args.max_dimacs_mb), ('compact', 'compact_bytes', args.max_memory_mb)]
+        exceeded = [
+            'The {0} size of {1} at {2} bits exceeds {3} MB'.format(description, entry.strategy, entry.bits, limit)
+            for entry in estimates
+            for description, metric, limit in limits
+            if limit is not None and getattr(entry, metric) > limit * 2 ** 20
+        ]
+
+        if exceeded:
+            print('\n'.join(exceeded), file=sys.stderr)
+            sys.exit(1)
+
+    else:
+        raise ValueError('Invalid command: ' + str(args.command))
 
 
 try:
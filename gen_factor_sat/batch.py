@@ -0,0 +1,240 @@
+"""
+Batch generation
+
+Generate many random instances at once. The numbers are split into intervals,
+and for each interval a given number of random, prime and composite numbers is
+encoded. The instances are generated in parallel by a pool of processes.
+"""
+import csv
+import functools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from random import Random
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from gen_factor_sat.cache import InstanceCache
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.output import compressed_name, default_random_file, write_cnf
+from gen_factor_sat.template import TemplateCache
+
+MANIFEST_FILE = 'manifest.csv'
+MANIFEST_HEADER = ['File', 'Number', 'Length', 'Type', 'Min', 'Max', 'Seed', 'Variables', 'Clauses']
+
+# Each worker process encodes the multiplication circuit once per bit length
+_templates = TemplateCache()
+
+# Each worker process counts the bytes written to a cache to schedule its eviction
+_caches: Dict[Tuple[str, Optional[int]], InstanceCache] = {}
+
+
+@dataclass(frozen=True)
+class BatchInstance:
+    """
+    The configuration of a single instance of a batch.
+    """
+    directory: str
+    min_value: int
+    max_value: int
+    seed: int
+    prime: Optional[bool]
+    error: float
+    max_tries: int
+    simplify: bool = False
+    xor: bool = False
+    polarity: bool = False
+    ordering: Optional[str] = None
+    compression: Optional[str] = None
+    cache: Optional[str] = None
+    cache_size: Optional[int] = None
+
+
+def intervals(start: int, stop: int, step: int) -> Iterator[Tuple[int, int]]:
+    """
+    Split the interval [start, stop) into subintervals whose bounds grow by
+    the factor step, i.e. [start, start * step), [start * step, start * step^2), ...
+
+    :param start: the smallest value of the first interval
+    :param stop: the smallest value not starting an interval
+    :param step: the factor between the bounds of an interval
+    :return: the bounds of all intervals
+    :raises ValueError if step < 2
+    """
+    if step < 2:
+        raise ValueError('The step must be at least 2')
+
+    min_value = start
+    while min_value < stop:
+        max_value = min_value * step
+        yield min_value, max_value
+        min_value = max_value
+
+
+def instance_seed(seed: int, min_value: int, max_value: int, index: int) -> int:
+    """
+    Derive the seed of a single instance from the seed of the batch. The seed
+    only depends on the position of the instance within the batch.
+
+    :param seed: the seed of the batch
+    :param min_value: the smallest value of the interval
+    :param max_value: the largest value of the interval
+    :param index: the index of the instance within the interval
+    :return: the seed of the instance
+    """
+    rand = Random('{0}:{1}:{2}:{3}'.format(seed, min_value, max_value, index))
+    return rand.randrange(sys.maxsize)
+
+
+def create_instances(
+        directory: str,
+        start: int,
+        stop: int,
+        step: int,
+        num_random: int,
+        num_prime: int,
+        num_composite: int,
+        error: float = 0.0,
+        seed: int = 0,
+        max_tries: int = 1000,
+        simplify: bool = False,
+        xor: bool = False,
+        polarity: bool = False,
+        ordering: Optional[str] = None,
+        compression: Optional[str] = None,
+        cache: Optional[str] = None,
+        cache_size: Optional[int] = None
+) -> List[BatchInstance]:
+    """
+    Configure all instances of a batch. Each interval is written to its own
+    directory named factor_<min>-<max>. Within each interval, first the
+    random, then the prime and finally the composite numbers are created.
+
+    :param directory: the output directory
+    :param start: the smallest value of the first interval
+    :param stop: the smallest value not starting an interval
+    :param step: the factor between the bounds of an interval
+    :param num_random: the number of random numbers per interval
+    :param num_prime: the number of prime numbers per interval
+    :param num_composite: the number of composite numbers per interval
+    :param error: the permitted error probability of the primality test
+    :param seed: the seed of the batch
+    :param max_tries: the number of tries to generate a number
+    :param simplify: whether the CNFs should be simplified
+    :param xor: whether XOR-Gates should be encoded as XOR constraints
+    :param polarity: whether the Plaisted-Greenbaum encoding should be used
+    :param ordering: the order of the clauses and variables, 'topological' or 'bfs'
+    :param compression: the compression of the files, 'gz', 'xz', 'bz2' or None
+    :param cache: the directory of an instance cache (see gen_factor_sat.cache)
+    :param cache_size: the maximum size of the instance cache in bytes
+    :return: the configurations of all instances
+    """
+    types = [None] * num_random + [True] * num_prime + [False] * num_composite
+
+    return [
+        BatchInstance(
+            directory=os.path.join(directory, 'factor_{0}-{1}'.format(min_value, max_value)),
+            min_value=min_value,
+            max_value=max_value,
+            seed=instance_seed(seed, min_value, max_value, index),
+            prime=prime,
+            error=error,
+            max_tries=max_tries,
+            simplify=simplify,
+            xor=xor,
+            polarity=polarity,
+            ordering=ordering,
+            compression=compression,
+            cache=cache,
+            cache_size=cache_size
+        )
+        for min_value, max_value in intervals(start, stop, step)
+        for index, prime in enumerate(types)
+    ]
+
+
+def generate_instance(instance: BatchInstance) -> List[str]:
+    """
+    Encode the specified instance and write it to its directory using the
+    default file name. The multiplication circuits are reused across the
+    instances of a process (see TemplateCache). If an instance cache is
+    configured, instances that were encoded before are loaded instead.
+
+    :param instance: the configuration of the instance
+    :return: the manifest row of the instance
+    """
+    encode = functools.partial(
+        FactoringSat.factorize_random_number,
+        max_value=instance.max_value,
+        min_value=instance.min_value,
+        seed=instance.seed,
+        prime=instance.prime,
+        error=instance.error,
+        max_tries=instance.max_tries,
+        templates=_templates,
+        simplify=instance.simplify,
+        xor=instance.xor,
+        polarity=instance.polarity,
+        ordering=instance.ordering,
+        cache=_instance_cache(instance.cache, instance.cache_size)
+    )
+
+    result = write_cnf(encode, instance.directory, default_random_file, compression=instance.compression)
+    number_type = result.number.fold_type(
+        v_det_prime='prime',
+        v_prob_prime='prob-prime',
+        v_det_comp='composite',
+        v_prob_comp='composite',
+        v_unknown='random'
+    )
+
+    return [
+        os.path.join(instance.directory, compressed_name(default_random_file(result), instance.compression)),
+        str(result.number.value),
+        str(result.number.value.bit_length()),
+        number_type,
+        str(instance.min_value),
+        str(instance.max_value),
+        str(instance.seed),
+        str(result.cnf.number_of_variables),
+        str(len(result.cnf.clauses) + len(result.cnf.xors))
+    ]
+
+
+def _instance_cache(directory: Optional[str], max_bytes: Optional[int]) -> Optional[InstanceCache]:
+    if directory is None:
+        return None
+
+    return _caches.setdefault((directory, max_bytes), InstanceCache(directory, max_bytes))
+
+
+def generate_batch(instances: List[BatchInstance], directory: str, workers: Optional[int] = None) -> List[List[str]]:
+    """
+    Generate all instances in a pool of processes and write a manifest of the
+    generated files to the output directory. The files are listed relative to
+    the output directory. As the seed of every instance is
+    fixed beforehand, the result does not depend on the number of workers.
+
+    :param instances: the configurations of the instances
+    :param directory: the output directory containing the manifest
+    :param workers: the number of processes (default: number of processors)
+    :return: the rows of the manifest
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    if workers == 1:
+        rows = list(map(generate_instance, instances))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rows = list(executor.map(generate_instance, instances))
+
+    for row in rows:
+        row[0] = os.path.relpath(row[0], directory)
+
+    with open(os.path.join(directory, MANIFEST_FILE), 'w', newline='') as manifest:
+        writer = csv.writer(manifest)
+        writer.writerow(MANIFEST_HEADER)
+        writer.writerows(rows)
+
+    return rows
+
@@ -0,0 +1,7 @@
+"""
+This package provides benchmarks of the individual components of the encoding.
+Each component is measured separately for several bit lengths, which allows
+comparing the performance of the hot paths between different versions:
+
+python -m gen_factor_sat.benchmark components --bits 16 64 256 --json results.json --csv results.csv
+"""
@@ -0,0 +1,204 @@
+import argparse
+import csv
+import dataclasses
+import sys
+from random import Random
+
+from gen_factor_sat.benchmark import measure, scaling
+from gen_factor_sat.benchmark.components import COMPONENTS
+from gen_factor_sat.factoring_sat import FactoringSat
+
+parser = argparse.ArgumentParser(
+    prog='python -m gen_factor_sat.benchmark',
+    description='''
+    Benchmark the components of the encoding. The results can be written
+    to JSON and CSV files to compare different versions.
+    ''',
+    epilog='''examples:
+    python -m gen_factor_sat.benchmark components --bits 16 64 --label $(git rev-parse --short HEAD) --csv results.csv
+    python -m gen_factor_sat.benchmark components --component n_bit_adder subtract --bits 1024 --runs 10
+    python -m gen_factor_sat.benchmark scaling --update-baseline
+    python -m gen_factor_sat.benchmark scaling --strategy TseitinFactoringStrategy --bits 16 64 256 --tolerance 0.5
+    ''',
+    formatter_class=argparse.RawDescriptionHelpFormatter
+)
+
+commands = ['components', 'scaling']
+subparsers = parser.add_subparsers(dest='command', required=True)
+
+parser_components = subparsers.add_parser(commands[0], help="measure the components for several bit lengths")
+parser_components.add_argument(
+    '-c', '--component', dest='components', nargs='+', choices=list(COMPONENTS), default=list(COMPONENTS),
+    help='the components to be measured. (default: all)'
+)
+
+parser_components.add_argument(
+    '-b', '--bits', nargs='+', type=int, default=[16, 64, 256],
+    help='the bit lengths the components are measured for. (default: 16 64 256)'
+)
+
+parser_components.add_argument(
+    '-r', '--runs', type=int, default=5,
+    help='the number of timed runs per component and bit length. (default: 5)'
+)
+
+parser_components.add_argument(
+    '-s', '--seed', type=int, default=0,
+    help='the seed used to generate the inputs. (default: 0)'
+)
+
+parser_components.add_argument(
+    '-l', '--label', type=str, default='v' + FactoringSat.VERSION,
+    help='a label identifying the measured version, e.g. a commit. (default: the current version)'
+)
+
+parser_components.add_argument(
+    '--json', type=str,
+    help='write the results to the specified JSON file'
+)
+
+parser_components.add_argument(
+    '--csv', type=str,
+    help='append the results to the specified CSV file'
+)
+
+parser_scaling = subparsers.add_parser(
+    commands[1], help="measure how the encoding of all strategies scales and compare it to a baseline"
+)
+parser_scaling.add_argument(
+    '--strategy', dest='strategies', nargs='+', choices=list(scaling.strategies()), default=list(scaling.strategies()),
+    help='the strategies to be measured. (default: all)'
+)
+
+parser_scaling.add_argument(
+    '-b', '--bits', nargs='+', type=int, default=scaling.DEFAULT_BITS,
+    help='the bit lengths of the numbers. (default: 16 32 ... 4096)'
+)
+
+parser_scaling.add_argument(
+    '-s', '--seed', type=int, default=0,
+    help='the seed used to generate the numbers. (default: 0)'
+)
+
+parser_scaling.add_argument(
+    '-m', '--mode', choices=scaling.MODES, default='stream',
+    help='''
+    how the clauses are stored: streamed to /dev/null, in a ClauseStore or in a set. (default: stream)
+    '''
+)
+
+parser_scaling.add_argument(
+    '--time-limit', type=float, default=60.0,
+    help='''skip the larger lengths of a strategy once encoding takes longer than this many seconds. (default: 60)'''
+)
+
+parser_scaling.add_argument(
+    '-l', '--label', type=str, default='v' + FactoringSat.VERSION,
+    help='a label identifying the measured version, e.g. a commit. (default: the current version)'
+)
+
+parser_scaling.add_argument(
+    '--baseline', type=str, default=scaling.DEFAULT_BASELINE,
+    help='the baseline to compare the results to. (default: {0})'.format(scaling.DEFAULT_BASELINE)
+)
+
+parser_scaling.add_argument(
+    '--update-baseline', action='store_true',
+    help='store the results as the new baseline instead of comparing them'
+)
+
+parser_scaling.add_argument(
+    '--metric', dest='metrics', nargs='+', choices=scaling.METRICS, default=scaling.METRICS,
+    help='the metrics compared to the baseline. (default: all)'
+)
+
+parser_scaling.add_argument(
+    '-t', '--tolerance', type=float, default=0.25,
+    help='the permitted relative increase of a metric compared to the baseline. (default: 0.25)'
+)
+
+parser_scaling.add_argument(
+    '--exponent-tolerance', type=float, default=0.1,
+    help='the permitted absolute increase of a scaling exponent compared to the baseline. (default: 0.1)'
+)
+
+parser_scaling.add_argument(
+    '--json', type=str,
+    help='write the results to the specified JSON file'
+)
+
+parser_scaling.add_argument(
+    '--csv', type=str,
+    help='write the results to the specified CSV file'
+)
+
+args = parser.parse_args()
+
+
+def run():
+    if args.command == commands[0]:
+        if min(args.bits) < 2:
+            raise ValueError('The bit length must be at least 2')
+
+        if args.runs < 1:
+            raise ValueError('At least one run is required')
+
+        measurements = []
+        for component in args.components:
+            for bits in args.bits:
+                rand = Random('{0}:{1}:{2}'.format(args.seed, component, bits))
+                result = measure.measure(args.label, component, bits, COMPONENTS[component](bits, rand), args.runs)
+                measurements.append(result)
+
+                print('{0:<20} {1:>6} bits {2:>12.3f} ms {3:>14} B peak'.format(
+                    component, bits, result.time_mean_ms, result.peak_bytes
+                ), flush=True)
+
+        if args.json:
+            measure.write_json(args.json, args.label, measurements)
+
+        if args.csv:
+            measure.append_csv(args.csv, measurements)
+
+    elif args.command == commands[1]:
+        if min(args.bits) < 2:
+            raise ValueError('The bit length must be at least 2')
+
+        points = scaling.sweep(args.strategies, args.bits, args.seed, args.mode, args.time_limit, log=sys.stdout)
+        results = scaling.to_json(points, args.label, args.mode)
+
+        for strategy, exponents in results['exponents'].items():
+            print('{0:<35} {1}'.format(strategy, ' '.join(
+                '{0}=n^{1:.2f}'.format(metric, exponent) for metric, exponent in exponents.items()
+            )))
+
+        if args.json:
+            scaling.store(args.json, results)
+
+        if args.csv:
+            with open(args.csv, 'w', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=scaling.FIELDS)
+                writer.writeheader()
+                writer.writerows(map(dataclasses.asdict, points))
+
+        if args.update_baseline:
+            scaling.store(args.baseline, results)
+        else:
+            regressions = scaling.compare(
+                points, scaling.load(args.baseline), args.tolerance, args.exponent_tolerance, args.metrics
+            )
+
+            for regression in regressions:
+                print('Regression: {0}'.format(regression), file=sys.stderr)
+
+            if regressions:
+                sys.exit(1)
+
+    else:
+        raise ValueError('Invalid command: ' + str(args.command))
+
+
+try:
+    run()
+except Exception as error:
+    parser.error(str(error))
@@ -0,0 +1,127 @@
+"""
+Components
+
+The benchmarked components of the encoding. Each component prepares its
+inputs for a given bit length and returns a function running the measured
+operation. The inputs are generated pseudo-randomly from the given seed, hence
+all versions are measured with the same inputs.
+"""
+from random import Random
+from typing import Any, Callable, Dict, List
+
+from gen_factor_sat.circuit.instances import TseitinFactoringStrategy, TseitinWallaceFactoringStrategy
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.cnf import CNFBuilder
+from gen_factor_sat.number_generator import GeneratorConfig, Number, is_prime, is_prob_prime
+
+Component = Callable[[int, Random], Callable[[], Any]]
+
+PRIME_CANDIDATES = 100
+PROB_PRIME_ERROR = 2 ** -64
+
+
+def tseitin_gates(bits: int, rand: Random) -> Callable[[], CNFBuilder]:
+    strategy = TseitinFactoringStrategy()
+    pairs = [(rand.randint(1, 2 * bits), rand.randint(1, 2 * bits)) for _ in range(bits)]
+
+    def run():
+        cnf_builder = CNFBuilder(2 * bits)
+        for input_1, input_2 in pairs:
+            strategy.wire_and(input_1, input_2, cnf_builder)
+            strategy.wire_or(input_1, -input_2, cnf_builder)
+            strategy.xor(input_1, input_2, cnf_builder)
+
+        return cnf_builder
+
+    return run
+
+
+def n_bit_adder(bits: int, rand: Random) -> Callable[[], CNFBuilder]:
+    strategy = TseitinFactoringStrategy()
+
+    def run():
+        cnf_builder = CNFBuilder()
+        number_1, number_2 = _variables(cnf_builder, bits, bits)
+        strategy.n_bit_adder(number_1, number_2, strategy.zero, cnf_builder)
+        return cnf_builder
+
+    return run
+
+
+def subtract(bits: int, rand: Random) -> Callable[[], CNFBuilder]:
+    strategy = TseitinFactoringStrategy()
+
+    def run():
+        cnf_builder = CNFBuilder()
+        number_1, number_2 = _variables(cnf_builder, bits, bits)
+        strategy.subtract(number_1, number_2, cnf_builder)
+        return cnf_builder
+
+    return run
+
+
+def wallace_multiply(bits: int, rand: Random) -> Callable[[], CNFBuilder]:
+    return _multiply(TseitinWallaceFactoringStrategy(), bits)
+
+
+def karatsuba_multiply(bits: int, rand: Random) -> Callable[[], CNFBuilder]:
+    # Below the threshold of the strategy, the Karatsuba multiplication falls back to a Wallace tree
+    return _multiply(TseitinFactoringStrategy(), bits)
+
+
+def to_dimacs(bits: int, rand: Random) -> Callable[[], str]:
+    factor_sat = FactoringSat.factorize_number(_random_number(bits, rand))
+    return factor_sat.to_dimacs
+
+
+def factorize_number(bits: int, rand: Random) -> Callable[[], FactoringSat]:
+    number = _random_number(bits, rand)
+    return lambda: FactoringSat.factorize_number(number)
+
+
+def prime(bits: int, rand: Random) -> Callable[[], List[bool]]:
+    numbers = [_random_number(bits, rand) for _ in range(PRIME_CANDIDATES)]
+    return lambda: [is_prime(number) for number in numbers]
+
+
+def prob_prime(bits: int, rand: Random) -> Callable[[], List[bool]]:
+    numbers = [_random_number(bits, rand) for _ in range(PRIME_CANDIDATES)]
+    seed = rand.getrandbits(32)
+    return lambda: [is_prob_prime(number, PROB_PRIME_ERROR, seed) for number in numbers]
+
+
+def generate_number(bits: int, rand: Random) -> Callable[[], Number]:
+    generator_config = GeneratorConfig.create(2 ** (bits - 1), 2 ** bits - 1, rand.getrandbits(32))
+    return lambda: Number.generate(generator_config, prime=True, max_tries=100 * bits)
+
+
+COMPONENTS: Dict[str, Component] = {
+    'tseitin_gates': tseitin_gates,
+    'n_bit_adder': n_bit_adder,
+    'subtract': subtract,
+    'wallace_multiply': wallace_multiply,
+    'karatsuba_multiply': karatsuba_multiply,
+    'to_dimacs': to_dimacs,
+    'factorize_number': factorize_number,
+    'is_prime': prime,
+    'is_prob_prime': prob_prime,
+    'generate_number': generate_number
+}
+
+
+def _multiply(strategy, bits: int) -> Callable[[], CNFBuilder]:
+    def run():
+        cnf_builder = CNFBuilder()
+        factor_1, factor_2 = _variables(cnf_builder, bits, bits)
+        strategy.multiply(factor_1, factor_2, cnf_builder)
+        return cnf_builder
+
+    return run
+
+
+def _variables(cnf_builder: CNFBuilder, length_1: int, length_2: int):
+    return cnf_builder.next_variables(length_1), cnf_builder.next_variables(length_2)
+
+
+def _random_number(bits: int, rand: Random) -> int:
+    return rand.getrandbits(bits) | (1 << (bits - 1)) | 1
@@ -0,0 +1,140 @@
+"""
+Measurement
+
+Run a function repeatedly and record its wall time, the memory it allocates
+and its peak memory usage.
+"""
+import csv
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Callable, Dict, List
+
+
+@dataclass()
+class Measurement:
+    """
+    The measurement of a single component for a fixed bit length. The times
+    are measured without tracing the memory. The allocated blocks and bytes
+    refer to the memory that is still allocated after the run, i.e. the memory
+    occupied by its result.
+    """
+    label: str
+    component: str
+    bits: int
+    runs: int
+    time_min_ms: float
+    time_mean_ms: float
+    time_max_ms: float
+    allocated_blocks: int
+    allocated_bytes: int
+    peak_bytes: int
+
+
+FIELDS = [field.name for field in fields(Measurement)]
+
+
+def measure(label: str, component: str, bits: int, run: Callable[[], Any], runs: int) -> Measurement:
+    """
+    Measure the specified function. The function is timed the specified number
+    of times. Afterwards, it is run once more while tracing the memory.
+
+    :param label: the label of the measured version, e.g. a commit
+    :param component: the name of the measured component
+    :param bits: the bit length the component is measured for
+    :param run: the function to be measured
+    :param runs: the number of timed runs
+    :return: the measurement
+    """
+    timings = []
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 10 ** 3)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = run()
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = len(tracemalloc.take_snapshot().traces)
+    finally:
+        tracemalloc.stop()
+
+    del result
+
+    return Measurement(
+        label=label,
+        component=component,
+        bits=bits,
+        runs=runs,
+        time_min_ms=round(min(timings), 6),
+        time_mean_ms=round(sum(timings) / len(timings), 6),
+        time_max_ms=round(max(timings), 6),
+        allocated_blocks=blocks,
+        allocated_bytes=current,
+        peak_bytes=peak
+    )
+
+
+def environment() -> Dict[str, str]:
+    """
+    Describe the environment the benchmarks are run in.
+
+    :return: the python version, implementation and platform
+    """
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'executable': sys.executable
+    }
+
+
+def write_json(filename: str, label: str, measurements: List[Measurement]) -> None:
+    """
+    Write the measurements and the environment to a JSON file.
+    An existing file is replaced.
+
+    :param filename: the output file
+    :param label: the label of the measured version
+    :param measurements: the measurements to be written
+    :return: None
+    """
+    data = {
+        'label': label,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': environment(),
+        'measurements': list(map(asdict, measurements))
+    }
+
+    with open(filename, 'w') as file:
+        json.dump(data, file, indent=2)
+        file.write('\n')
+
+
+def append_csv(filename: str, measurements: List[Measurement]) -> None:
+    """
+    Append the measurements to a CSV file. The header is written if the file
+    does not exist yet. Hence, the measurements of several versions can be
+    collected in the same file.
+
+    :param filename: the output file
+    :param measurements: the measurements to be written
+    :return: None
+    """
+    exists = os.path.isfile(filename)
+
+    with open(filename, mode='a', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+
+        if not exists:
+            writer.writeheader()
+
+        writer.writerows(map(asdict, measurements))
@@ -0,0 +1,295 @@
+"""
+Scaling
+
+Measure how the encoding grows with the length of the number. For each
+strategy, numbers of increasing bit length are encoded and the encoding time,
+the peak memory, the number of variables and the number of clauses are
+recorded. A power law is fitted to each metric, such that superlinear growth
+becomes visible in the exponent. The results can be compared to a baseline to
+detect regressions.
+"""
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, fields
+from random import Random
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from gen_factor_sat.circuit.instances import strategies
+from gen_factor_sat.factoring_sat import FactoringSat
+
+METRICS = ['time_ms', 'peak_rss_kb', 'variables', 'clauses']
+MODES = ['stream', 'compact', 'set']
+DEFAULT_BITS = [16, 32, 64, 128, 256, 512, 1024, 2048, 4096]
+DEFAULT_BASELINE = os.path.join('results', 'scaling_baseline.json')
+
+
+@dataclass()
+class ScalingPoint:
+    """
+    The metrics of encoding a single number. The peak memory is the growth of
+    the maximum resident set size of the encoding process.
+    """
+    strategy: str
+    bits: int
+    number: int
+    time_ms: float
+    peak_rss_kb: int
+    variables: int
+    clauses: int
+
+
+FIELDS = [field.name for field in fields(ScalingPoint)]
+
+
+@dataclass()
+class Regression:
+    """
+    A metric that exceeds its baseline by more than the tolerance.
+    """
+    strategy: str
+    metric: str
+    bits: Optional[int]
+    baseline: float
+    value: float
+
+    def __str__(self) -> str:
+        if self.bits is None:
+            return '{0}: the scaling exponent of {1} increased from {2:.3f} to {3:.3f}'.format(
+                self.strategy, self.metric, self.baseline, self.value
+            )
+        else:
+            return '{0}: {1} at {2} bits increased from {3} to {4}'.format(
+                self.strategy, self.metric, self.bits, self.baseline, self.value
+            )
+
+
+def encode(strategy: str, bits: int, seed: int, mode: str) -> ScalingPoint:
+    """
+    Encode a pseudo-random number of the specified length. Should be called
+    in a fresh process to measure the peak memory of the encoding alone.
+
+    :param strategy: the name of the strategy
+    :param bits: the bit length of the number
+    :param seed: the seed used to generate the number
+    :param mode: how the clauses are stored (see MODES)
+    :return: the metrics of the encoding
+    """
+    rand = Random('{0}:{1}'.format(seed, bits))
+    number = rand.getrandbits(bits) | (1 << (bits - 1))
+
+    with open(os.devnull, 'w') as devnull:
+        options = {
+            'stream': {'file': devnull},
+            'compact': {'compact': True},
+            'set': {}
+        }[mode]
+
+        rss_before = _max_rss_kb()
+        start = time.perf_counter()
+        factor_sat = FactoringSat.factorize_number(number, strategy=strategies()[strategy](), **options)
+        elapsed = time.perf_counter() - start
+
+    return ScalingPoint(
+        strategy=strategy,
+        bits=bits,
+        number=number,
+        time_ms=round(elapsed * 10 ** 3, 3),
+        peak_rss_kb=_max_rss_kb() - rss_before,
+        variables=factor_sat.cnf.number_of_variables,
+        clauses=len(factor_sat.cnf.clauses)
+    )
+
+
+def sweep(
+        strategy_names: List[str],
+        bit_lengths: List[int],
+        seed: int = 0,
+        mode: str = 'stream',
+        time_limit: float = 60.0,
+        log: Optional[TextIO] = None
+) -> List[ScalingPoint]:
+    """
+    Encode numbers of all specified lengths with all specified strategies.
+    Every number is encoded in a new process. If encoding a number takes
+    longer than the time limit, the larger lengths of this strategy are skipped.
+
+    :param strategy_names: the names of the strategies (see strategies)
+    :param bit_lengths: the lengths of the numbers
+    :param seed: the seed used to generate the numbers
+    :param mode: how the clauses are stored (see MODES)
+    :param time_limit: the time in seconds after which larger lengths are skipped
+    :param log: an optional file to report the progress to
+    :return: the metrics of all encodings
+    """
+    points = []
+    with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+        for strategy in strategy_names:
+            for bits in sorted(bit_lengths):
+                point = pool.apply(encode, (strategy, bits, seed, mode))
+                points.append(point)
+
+                if log is not None:
+                    print('{0:<35} {1:>6} bits {2:>12.1f} ms {3:>10} KB {4:>10} vars {5:>10} clauses'.format(
+                        strategy, bits, point.time_ms, point.peak_rss_kb, point.variables, point.clauses
+                    ), file=log, flush=True)
+
+                if point.time_ms > time_limit * 10 ** 3:
+                    break
+
+    return points
+
+
+def fit_exponent(xs: List[float], ys: List[float]) -> Optional[Tuple[float, float]]:
+    """
+    Fit the power law y = c * x^k by least squares in log-log space.
+    Non-positive values are ignored.
+
+    :param xs: the inputs, e.g. the bit lengths
+    :param ys: the measured values
+    :return: the exponent k and the factor c, or None if less than two points remain
+    """
+    points = [(math.log(x), math.log(y)) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if len(points) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return None
+
+    exponent = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+    return exponent, math.exp(mean_y - exponent * mean_x)
+
+
+def exponents(points: List[ScalingPoint]) -> Dict[str, Dict[str, float]]:
+    """
+    Fit the scaling exponent of every metric for every strategy.
+
+    :param points: the measured points
+    :return: the exponents by strategy and metric
+    """
+    result = {}
+    for strategy in sorted({point.strategy for point in points}):
+        strategy_points = [point for point in points if point.strategy == strategy]
+        bits = [point.bits for point in strategy_points]
+
+        result[strategy] = {}
+        for metric in METRICS:
+            fit = fit_exponent(bits, [getattr(point, metric) for point in strategy_points])
+            if fit is not None:
+                result[strategy][metric] = round(fit[0], 4)
+
+    return result
+
+
+def compare(
+        points: List[ScalingPoint],
+        baseline: Dict,
+        tolerance: float,
+        exponent_tolerance: float,
+        metrics: Optional[List[str]] = None
+) -> List[Regression]:
+    """
+    Compare the points to a baseline. A metric regresses if its value exceeds
+    the value of the baseline at the same length by more than the relative
+    tolerance, or if its scaling exponent exceeds the exponent of the baseline
+    by more than the absolute exponent tolerance. Only the lengths measured in
+    both runs are compared.
+
+    :param points: the measured points
+    :param baseline: the baseline (see to_json)
+    :param tolerance: the permitted relative increase of a value
+    :param exponent_tolerance: the permitted absolute increase of an exponent
+    :param metrics: the compared metrics (default: all)
+    :return: all regressions
+    """
+    metrics = METRICS if metrics is None else metrics
+    baseline_points = {
+        (point['strategy'], point['bits']): point
+        for point in baseline['points']
+    }
+
+    regressions = []
+    for point in points:
+        baseline_point = baseline_points.get((point.strategy, point.bits))
+        if baseline_point is None:
+            continue
+
+        for metric in metrics:
+            value, baseline_value = getattr(point, metric), baseline_point[metric]
+            if value > baseline_value * (1 + tolerance):
+                regressions.append(Regression(point.strategy, metric, point.bits, baseline_value, value))
+
+    common_points = [point for point in points if (point.strategy, point.bits) in baseline_points]
+    baseline_exponents = exponents([
+        ScalingPoint(**baseline_points[point.strategy, point.bits]) for point in common_points
+    ])
+
+    for strategy, strategy_exponents in exponents(common_points).items():
+        for metric in metrics:
+            value = strategy_exponents.get(metric)
+            baseline_value = baseline_exponents.get(strategy, {}).get(metric)
+            if value is not None and baseline_value is not None and value > baseline_value + exponent_tolerance:
+                regressions.append(Regression(strategy, metric, None, baseline_value, value))
+
+    return regressions
+
+
+def to_json(points: List[ScalingPoint], label: str, mode: str) -> Dict:
+    """
+    Convert the points and their fitted exponents to a JSON serializable object.
+
+    :param points: the measured points
+    :param label: a label identifying the measured version
+    :param mode: how the clauses were stored
+    :return: the JSON object
+    """
+    return {
+        'label': label,
+        'mode': mode,
+        'python': sys.version.split()[0],
+        'exponents': exponents(points),
+        'points': list(map(asdict, points))
+    }
+
+
+def load(filename: str) -> Dict:
+    """
+    Load a sweep, e.g. a baseline, from a JSON file.
+
+    :param filename: the JSON file
+    :return: the JSON object (see to_json)
+    """
+    with open(filename) as file:
+        return json.load(file)
+
+
+def store(filename: str, data: Dict) -> None:
+    """
+    Store a sweep, e.g. a baseline, in a JSON file. Missing directories are created.
+
+    :param filename: the JSON file
+    :param data: the JSON object (see to_json)
+    :return: None
+    """
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(filename, 'w') as file:
+        json.dump(data, file, indent=2)
+        file.write('\n')
+
+
+def _max_rss_kb() -> int:
+    # The resource module is only available on Unix, hence it is only imported to measure the memory
+    import resource
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return max_rss // 1024 if sys.platform == 'darwin' else max_rss
@@ -0,0 +1,355 @@
+"""
+Binary CNF format
+
+A memory-mappable format to store encoded instances. Reloading an instance
+does not require parsing its DIMACS or encoding it again. The file consists
+of a fixed header, the metadata of the FactoringSat instance as JSON and
+the clauses as flat arrays, similar to a ClauseStore:
+
+- the clause offsets (int64, number of clauses + 1), clause i consists of
+  the literals offsets[i] to offsets[i + 1]
+- the literals of all clauses (int32)
+- the offsets of the XOR constraints (int64, number of XORs + 1)
+- the sorted variables of all XOR constraints (int32)
+- the parities of the XOR constraints (uint8)
+
+All numbers are little-endian and each section starts at a multiple of
+eight bytes. When the file is opened, the arrays are views into the mapped
+file, hence only the accessed pages are read.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.clause_store import ClauseStore
+from gen_factor_sat.formula.cnf import CNF
+from gen_factor_sat.formula.sink import DimacsSink
+from gen_factor_sat.formula.xor import XorConstraint
+from gen_factor_sat.number_generator import DetComposite, DetPrime, GeneratorConfig, Number, ProbComposite, \
+    ProbPrime, Unknown
+
+EXTENSION = 'cnfb'
+MAGIC = b'GFSCNF\x00\x00'
+FORMAT_VERSION = 1
+
+# magic, format version, reserved, variables, clauses, literals, xors, xor variables, metadata bytes
+_HEADER = struct.Struct('<8sII6q')
+_ALIGNMENT = 8
+# metadata, clause offsets, literals, xor offsets, xor variables, parities
+_SECTIONS = 'BqiqiB'
+
+Array = Union[memoryview, array]
+
+
+def binary_name(filename: str) -> str:
+    """
+    Replace the extension of a DIMACS file name by the binary extension.
+
+    :param filename: the name of the DIMACS file
+    :return: the name of the binary file
+    """
+    return '{0}.{1}'.format(os.path.splitext(filename)[0], EXTENSION)
+
+
+def write_binary(result: FactoringSat, file: BinaryIO) -> None:
+    """
+    Write the factoring instance in the binary format in a single pass. The
+    clauses of a ClauseStore are written without copying them. The order of
+    the clauses and literals is kept, hence the converted DIMACS matches the
+    DIMACS of the instance.
+
+    :param result: the instance to be written
+    :param file: the binary file
+    :return: None
+    :raises ValueError if the clauses were written to a DimacsSink
+    """
+    cnf = result.cnf
+    if isinstance(cnf.clauses, DimacsSink):
+        raise ValueError('The clauses were already written and cannot be stored')
+
+    if isinstance(cnf.clauses, ClauseStore):
+        offsets, literals = cnf.clauses.offsets, cnf.clauses.literals
+    else:
+        offsets, literals = _flatten(cnf.clauses)
+
+    xor_offsets, xor_variables = _flatten(sorted(xor.variables) for xor in cnf.xors)
+    parities = array('B', [xor.parity for xor in cnf.xors])
+
+    metadata = json.dumps(_metadata(result), separators=(',', ':')).encode('utf-8')
+    file.write(_HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0,
+        cnf.number_of_variables, len(offsets) - 1, len(literals), len(cnf.xors), len(xor_variables), len(metadata)
+    ))
+
+    position = _HEADER.size
+    for section in [metadata, offsets, literals, xor_offsets, xor_variables, parities]:
+        if isinstance(section, array) and sys.byteorder != 'little':
+            section = array(section.typecode, section)
+            section.byteswap()
+
+        data = memoryview(section).cast('B')
+        file.write(data)
+        position += len(data)
+
+        padding = -position % _ALIGNMENT
+        file.write(bytes(padding))
+        position += padding
+
+
+def open_binary(filename: str) -> BinaryInstance:
+    """
+    Map the specified binary file into memory. See BinaryInstance.
+
+    :param filename: the binary file
+    :return: the mapped instance
+    :raises ValueError if the file is not in the binary format
+    """
+    with open(filename, 'rb') as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # A damaged file must not leak the mapping, e.g. when the cache detects a damaged entry
+    try:
+        return BinaryInstance(mapping)
+    except BaseException:
+        mapping.close()
+        raise
+
+
+class BinaryInstance:
+    """
+    A factoring instance mapped from a file in the binary format. The clause
+    arrays are zero-copy views into the mapping, which remain valid until the
+    instance is closed. On big-endian machines, the arrays are copied.
+    """
+
+    def __init__(self, buffer: mmap.mmap):
+        if len(buffer) < _HEADER.size:
+            raise ValueError('The file is too short to be a binary CNF')
+
+        magic, version, _, variables, clauses, literals, xors, xor_variables, metadata = \
+            _HEADER.unpack_from(buffer, 0)
+
+        if magic != MAGIC:
+            raise ValueError('The file is not a binary CNF')
+
+        if version != FORMAT_VERSION:
+            raise ValueError('Unsupported version {0} of the binary CNF format'.format(version))
+
+        # Validate the counts before any view is created, a truncated file would silently lose clauses
+        counts = [metadata, clauses + 1, literals, xors + 1, xor_variables, xors]
+        if min(variables, clauses, literals, xors, xor_variables, metadata) < 0:
+            raise ValueError('The header of the binary CNF is damaged')
+
+        end = _HEADER.size
+        for typecode, count in zip(_SECTIONS, counts):
+            end += array(typecode).itemsize * count
+            end += -end % _ALIGNMENT
+
+        if len(buffer) < end:
+            raise ValueError('The binary CNF is truncated: expected {0} bytes, found {1}'.format(end, len(buffer)))
+
+        self.number_of_variables: int = variables
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._views: List[memoryview] = []
+
+        # The views must be released before the mapping can be closed
+        try:
+            position = _HEADER.size
+            position, metadata_bytes = self._section(position, 'B', metadata)
+            self.metadata: Dict[str, Any] = json.loads(bytes(metadata_bytes).decode('utf-8'))
+
+            position, self.offsets = self._section(position, 'q', clauses + 1)
+            position, self.literals = self._section(position, 'i', literals)
+            position, self.xor_offsets = self._section(position, 'q', xors + 1)
+            position, self.xor_variables = self._section(position, 'i', xor_variables)
+            position, self.parities = self._section(position, 'B', xors)
+
+            if self.offsets[0] != 0 or self.offsets[-1] != literals \
+                    or self.xor_offsets[0] != 0 or self.xor_offsets[-1] != xor_variables:
+                raise ValueError('The offsets of the binary CNF are damaged')
+        except BaseException:
+            self.close()
+            raise
+
+    def clause(self, index: int) -> Tuple[int, ...]:
+        """
+        Get the clause with the specified index.
+
+        :param index: the index of the clause
+        :return: the literals of the clause
+        """
+        return tuple(self.literals[self.offsets[index]:self.offsets[index + 1]])
+
+    def clauses(self, chunk_size: int = 2 ** 16) -> Iterator[Tuple[int, ...]]:
+        """
+        Iterate over all clauses. The arrays are converted in chunks, which
+        is considerably faster than accessing each clause separately.
+
+        :param chunk_size: the number of clauses converted at once
+        :return: the clauses in the stored order
+        """
+        for start in range(0, len(self), chunk_size):
+            offsets = self.offsets[start:min(start + chunk_size, len(self)) + 1].tolist()
+            literals = self.literals[offsets[0]:offsets[-1]].tolist()
+
+            base = offsets[0]
+            for begin, end in zip(offsets, offsets[1:]):
+                yield tuple(literals[begin - base:end - base])
+
+    def xors(self) -> List[XorConstraint]:
+        """
+        Get all XOR constraints.
+
+        :return: the XOR constraints in the stored order
+        """
+        offsets, variables = self.xor_offsets.tolist(), self.xor_variables.tolist()
+        return [
+            XorConstraint(frozenset(variables[begin:end]), bool(parity))
+            for begin, end, parity in zip(offsets, offsets[1:], self.parities.tolist())
+        ]
+
+    def to_factoring_sat(self) -> FactoringSat:
+        """
+        Copy the instance into a FactoringSat instance. The clauses are stored
+        in a list, which keeps their order.
+
+        :return: the factoring instance
+        """
+        metadata = self.metadata
+        generator = metadata['generator']
+
+        return FactoringSat(
+            number=_number(metadata['number']),
+            factor_1=metadata['factor_1'],
+            factor_2=metadata['factor_2'],
+            cnf=CNF(self.number_of_variables, list(self.clauses()), self.xors()),
+            generator=None if generator is None else GeneratorConfig(**generator),
+            simplified=metadata['simplified'],
+            xor=metadata['xor'],
+            polarity=metadata['polarity'],
+            ordering=metadata['ordering'],
+            parallel_depth=metadata['parallel_depth']
+        )
+
+    def write_dimacs(self, file: TextIO, chunk_size: int = 2 ** 12) -> None:
+        """
+        Convert the instance into DIMACS. The comments of the instance are
+        written upfront, and the clauses are streamed in chunks.
+
+        :param file: the text file to which the DIMACS is written
+        :param chunk_size: the number of lines written at once
+        :return: None
+        """
+        file.writelines('c {0}\n'.format(comment) for comment in self.metadata['comments'])
+        file.write(CNF.problem_line(self.number_of_variables, len(self) + len(self.parities)) + '\n')
+
+        chunk: List[str] = []
+        for clause in self.clauses():
+            chunk.append(CNF.clause_to_dimacs(clause))
+            if len(chunk) >= chunk_size:
+                file.write('\n'.join(chunk) + '\n')
+                chunk.clear()
+
+        chunk.extend(xor.to_dimacs() for xor in self.xors())
+        if chunk:
+            file.write('\n'.join(chunk) + '\n')
+
+    def close(self) -> None:
+        """
+        Release the views and unmap the file.
+
+        :return: None
+        """
+        for view in self._views:
+            view.release()
+
+        self._view.release()
+        self._buffer.close()
+
+    def _section(self, position: int, typecode: str, count: int) -> Tuple[int, Array]:
+        size = array(typecode).itemsize * count
+        data = self._view[position:position + size]
+        self._views.append(data)
+
+        if typecode == 'B' or sys.byteorder == 'little':
+            section: Array = data.cast(typecode)
+            self._views.append(section)
+        else:
+            section = array(typecode, data.tobytes())
+            section.byteswap()
+
+        position += size
+        return position + (-position % _ALIGNMENT), section
+
+    def __enter__(self) -> BinaryInstance:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+def _flatten(clauses: Sequence) -> Tuple[array, array]:
+    offsets, literals = array('q', [0]), array('i')
+    for clause in clauses:
+        literals.extend(clause)
+        offsets.append(len(literals))
+
+    return offsets, literals
+
+
+def _metadata(result: FactoringSat) -> Dict[str, Any]:
+    generator = result.generator
+    return {
+        'version': FactoringSat.VERSION,
+        'number': _number_to_dict(result.number),
+        'factor_1': result.factor_1,
+        'factor_2': result.factor_2,
+        'generator': None if generator is None else {
+            'min_value': generator.min_value, 'max_value': generator.max_value, 'seed': generator.seed
+        },
+        'simplified': result.simplified,
+        'xor': result.xor,
+        'polarity': result.polarity,
+        'ordering': result.ordering,
+        'parallel_depth': result.parallel_depth,
+        'comments': result.comments()
+    }
+
+
+_NUMBER_TYPES = {
+    'det-prime': DetPrime,
+    'prob-prime': ProbPrime,
+    'det-composite': DetComposite,
+    'prob-composite': ProbComposite,
+    'unknown': Unknown
+}
+
+
+def _number_to_dict(number: Number) -> Dict[str, Any]:
+    return number.fold(
+        f_det_prime=lambda value: {'type': 'det-prime', 'value': value},
+        f_prob_prime=lambda value, error: {'type': 'prob-prime', 'value': value, 'error': error},
+        f_det_comp=lambda value: {'type': 'det-composite', 'value': value},
+        f_prob_comp=lambda value, error: {'type': 'prob-composite', 'value': value, 'error': error},
+        f_unknown=lambda unknown: {'type': 'unknown', 'value': unknown.value}
+    )
+
+
+def _number(data: Dict[str, Any]) -> Number:
+    arguments = dict(data)
+    number_type: Optional[type] = _NUMBER_TYPES.get(arguments.pop('type'))
+    if number_type is None:
+        raise ValueError('Unknown number type: {0}'.format(data['type']))
+
+    return number_type(**arguments)
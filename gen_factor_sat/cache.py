@@ -0,0 +1,189 @@
+"""
+Instance cache
+
+The encoding is deterministic, i.e. an instance only depends on the number,
+the strategy, the options and the version. The instance cache stores encoded
+instances on disk, keyed by a hash of these inputs, such that rerunning a
+batch only encodes the instances that changed. The instances are stored in
+the binary format (see gen_factor_sat.binary).
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+from gen_factor_sat.binary import EXTENSION, open_binary, write_binary
+from gen_factor_sat.factoring_sat import EncodingOptions, FactoringSat
+from gen_factor_sat.number_generator import GeneratorConfig, Number
+
+
+class InstanceCache:
+    """
+    A directory of encoded instances. Each instance is stored in its own
+    file, named by its key, in a subdirectory named by the first two
+    characters of the key. Instances are written to a temporary file which
+    is renamed afterwards. As renaming is atomic, several processes can share
+    the cache: a reader either sees the complete instance or none.
+
+    If a maximum size is specified, the least recently used instances are
+    evicted. A hit updates the modification time of the file, which serves
+    as the time of the last use. To avoid scanning the directory after every
+    write, the cache is only scanned after each process wrote a sixteenth of
+    the maximum size. Hence, the size may temporarily exceed the limit.
+    """
+    TEMPORARY_LIFETIME = 24 * 60 * 60
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._written = 0
+
+    @staticmethod
+    def key(
+            number: Number,
+            generator: Optional[GeneratorConfig],
+            strategy: object,
+            options: EncodingOptions
+    ) -> str:
+        """
+        Hash all inputs that determine the encoded instance. The strategy is
+        identified by its class and its configuration.
+
+        :param number: the number to be factorized, including its type
+        :param generator: the configuration of the number generator
+        :param strategy: the strategy used to encode the instance
+        :param options: the options of the encoding
+        :return: the key of the instance
+        """
+        strategy_class = type(strategy)
+        description = repr((
+            FactoringSat.VERSION,
+            number,
+            generator,
+            '{0}.{1}'.format(strategy_class.__module__, strategy_class.__qualname__),
+            tuple(sorted(vars(strategy).items())),
+            options
+        ))
+
+        return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+    def path(self, key: str) -> str:
+        """
+        The file storing the instance with the specified key.
+
+        :param key: the key of the instance
+        :return: the path of the file
+        """
+        return os.path.join(self.directory, key[:2], '{0}.{1}'.format(key, EXTENSION))
+
+    def get(self, key: str) -> Optional[FactoringSat]:
+        """
+        Load the instance with the specified key. A file that cannot be loaded,
+        e.g. because it is truncated or damaged, is removed and treated as a
+        miss. The clauses of the loaded instance are stored in a list.
+
+        :param key: the key of the instance
+        :return: the instance or None if it is not cached
+        """
+        path = self.path(key)
+        try:
+            with open_binary(path) as instance:
+                result = instance.to_factoring_sat()
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Any failure to load the entry means that it is damaged, the instance is encoded again
+            _remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return result
+
+    def put(self, key: str, result: FactoringSat) -> None:
+        """
+        Store the instance with the specified key. Concurrent writers of the
+        same key store the same instance, hence the last rename wins.
+
+        :param key: the key of the instance
+        :param result: the instance to be stored
+        :return: None
+        """
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        temporary_file = '{0}.{1}.tmp'.format(path, uuid.uuid4().hex)
+        try:
+            with open(temporary_file, 'xb') as file:
+                write_binary(result, file)
+                size = file.tell()
+
+            os.replace(temporary_file, path)
+        except BaseException:
+            _remove(temporary_file)
+            raise
+
+        self._written += size
+        if self.max_bytes is not None and self._written * 16 >= self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used instances until the cache does not
+        exceed its maximum size. Temporary files of crashed writers are
+        removed as well.
+
+        :return: None
+        """
+        self._written = 0
+        entries = self.entries()
+
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if self.max_bytes is None or total <= self.max_bytes:
+                break
+
+            _remove(path)
+            total -= size
+
+    def entries(self) -> List[Tuple[str, int, float]]:
+        """
+        List the cached instances.
+
+        :return: the path, the size and the time of the last use of each instance
+        """
+        if not os.path.isdir(self.directory):
+            return []
+
+        entries = []
+        expired = time.time() - InstanceCache.TEMPORARY_LIFETIME
+        for subdirectory in os.scandir(self.directory):
+            if not subdirectory.is_dir():
+                continue
+
+            for entry in os.scandir(subdirectory.path):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+                if entry.name.endswith('.' + EXTENSION):
+                    entries.append((entry.path, stat.st_size, stat.st_mtime))
+                elif entry.name.endswith('.tmp') and stat.st_mtime < expired:
+                    _remove(entry.path)
+
+        return entries
+
+
+def _remove(path: str) -> None:
+    # Another process may have removed the file already
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -37,6 +37,28 @@ class ConstantStrategy(GateStrategy[Constant, None]):
         return constant(bin(value)[2:])
 
 
+class BitParallelStrategy(GateStrategy[int, None]):
+    """
+    Evaluates the circuit for many inputs at once. Each wire is an int whose
+    bits represent the value of the wire for the different inputs (lanes).
+    The one element sets the bits of all lanes.
+    """
+    zero: int = 0
+    one: int = 1
+
+    def __init__(self, lanes: int = 1):
+        self.one = (1 << lanes) - 1
+
+    def wire_and(self, value_1: int, value_2: int, writer: None = None) -> int:
+        return value_1 & value_2
+
+    def wire_or(self, value_1: int, value_2: int, writer: None = None) -> int:
+        return value_1 | value_2
+
+    def wire_not(self, value: int, writer: None = None) -> int:
+        return value ^ self.one
+
+
 class GeneralSimpleCircuitStrategy(GateStrategy[T, W], SimpleCircuitStrategy[T, W], ABC):
 
     def half_adder(self, value_1: T, value_2: T, writer: W) -> Tuple[T, T]:
@@ -84,51 +106,40 @@ class GeneralSimpleCircuitStrategy(GateStrategy[T, W], SimpleCircuitStrategy[T,
         )
 
 
+class BitParallelCircuitStrategy(GeneralSimpleCircuitStrategy[int, None], ABC):
+
+    def xor(self, value_1: int, value_2: int, writer: None = None) -> int:
+        return value_1 ^ value_2
+
+    def equality(self, value_1: int, value_2: int, writer: None = None) -> int:
+        return self.wire_not(value_1 ^ value_2, writer)
+
+
 class GeneralNBitCircuitStrategy(GateStrategy[T, W], SimpleCircuitStrategy[T, W], NBitCircuitStrategy[T, W],
                                  ABC):
 
     def n_bit_adder(self, number_1: List[T], number_2: List[T], carry: T, writer: W) -> List[T]:
-        if not number_1:
-            return self.propagate(number_2, carry, writer)
-        elif not number_2:
-            return self.propagate(number_1, carry, writer)
-        else:
-            *init_1, lsb_1 = number_1
-            *init_2, lsb_2 = number_2
+        common_length = min(len(number_1), len(number_2))
+        init_1 = number_1[:len(number_1) - common_length]
+        init_2 = number_2[:len(number_2) - common_length]
 
-            lsb_sum, lsb_carry = self.full_adder(lsb_1, lsb_2, carry, writer)
-            init_sum = self.n_bit_adder(init_1, init_2, lsb_carry, writer)
+        result = []
+        for lsb_1, lsb_2 in zip(reversed(number_1), reversed(number_2)):
+            lsb_sum, carry = self.full_adder(lsb_1, lsb_2, carry, writer)
+            result.append(lsb_sum)
 
-            return init_sum + [lsb_sum]
+        result.reverse()
+        return self.propagate(init_1 or init_2, carry, writer) + result
 
     def propagate(self, inputs: List[T], carry: T, writer: W) -> List[T]:
-        if not inputs:
-            return [carry]
-        else:
-            *init, lsb = inputs
-
-            lsb_sum, lsb_carry = self.half_adder(lsb, carry, writer)
-            init_sum = self.propagate(init, lsb_carry, writer)
-
-            return init_sum + [lsb_sum]
-
-    # def n_bit_adder(xs: List[T], ys: List[T], c: T, strategy: Strategy[T]) -> List[T]:
-    #     aligned_xs, aligned_ys = align(xs, ys)
-    #
-    #     carry = c
-    #     result = []
-    #     for i in range(len(aligned_xs)):
-    #         x = aligned_xs[-(i+1)]
-    #         y = aligned_ys[-(i+1)]
-    #
-    #         sum_xy, carry_xy = full_adder(x, y, carry, strategy)
-    #
-    #         carry = carry_xy
-    #         result.append(sum_xy)
-    #
-    #     result.append(carry)
-    #     result.reverse()
-    #     return result
+        result = []
+        for lsb in reversed(inputs):
+            lsb_sum, carry = self.half_adder(lsb, carry, writer)
+            result.append(lsb_sum)
+
+        result.append(carry)
+        result.reverse()
+        return result
 
     def subtract(self, number_1: List[T], number_2: List[T], writer: W) -> List[T]:
         if self.all_zero(number_2):
@@ -1,7 +1,8 @@
 import functools
 import itertools
 from abc import ABC
-from typing import List, Tuple, Generic, TypeVar
+from collections import defaultdict
+from typing import Dict, List, Tuple, Generic, TypeVar
 
 from gen_factor_sat import utils
 from gen_factor_sat.circuit.interface.circuit import GateStrategy, SimpleCircuitStrategy, NBitCircuitStrategy
@@ -43,18 +44,168 @@ class KaratsubaStrategy(
             factor_2_sum = self.n_bit_adder(f2_high, f2_low, self.zero, writer) if f2_high else f2_low
 
             result_mid = self.multiply(factor_1_sum, factor_2_sum, writer)
-            result_mid = self.subtract(result_mid, result_high, writer) if result_high else result_mid
-            result_mid = self.subtract(result_mid, result_low, writer) if result_low else result_mid
+            return self.combine_products(result_low, result_high, result_mid, half_factor_length, writer)
+
+    def combine_products(
+            self,
+            result_low: List[T],
+            result_high: List[T],
+            result_mid: List[T],
+            half_factor_length: int,
+            writer: W
+    ) -> List[T]:
+        """
+        Combine the three sub-products of the Karatsuba multiplication.
+
+        :param result_low: the product of the low halves, empty if a low half is empty
+        :param result_high: the product of the high halves, empty if a high half is empty
+        :param result_mid: the product of the sums of the halves
+        :param half_factor_length: the length of the low halves
+        :param writer: the writer of the circuit
+        :return: the product of the factors
+        """
+        result_mid = self.subtract(result_mid, result_high, writer) if result_high else result_mid
+        result_mid = self.subtract(result_mid, result_low, writer) if result_low else result_mid
+
+        # result = result_high * 2^(2 * half_factor_length) + result_mid * 2^(half_factor_length) + result_low
+        shifted_high = self.shift(result_high, half_factor_length, writer)
+        result = self.n_bit_adder(shifted_high, result_mid, self.zero, writer)
+
+        shifted_high = self.shift(result, half_factor_length, writer)
+        result = self.n_bit_adder(shifted_high, result_low, self.zero, writer)
+
+        return result
+
+
+class ToomCookStrategy(
+    Generic[T, W],
+    GateStrategy[T, W],
+    SimpleCircuitStrategy[T, W],
+    NBitCircuitStrategy[T, W],
+    MultiplicationStrategy[T, W],  # Extend a multiplication strategy
+    ABC
+):
+    """
+    Splits the factors into three parts and multiplies them with five instead
+    of nine sub-products (Toom-3). The product polynomial is evaluated at the
+    points 0, 1, 2, 3 and infinity. As all evaluation points are non-negative,
+    every intermediate value of the interpolation is non-negative as well, and
+    only unsigned additions, subtractions and exact divisions by 2 and 3 are
+    required. Falls back to the extended multiplication strategy for factors
+    up to toom_min_len bits.
+    """
+    toom_min_len: int = 200
 
-            # result = result_high * 2^(2 * half_factor_length) + result_mid * 2^(half_factor_length) + result_low
-            shifted_high = self.shift(result_high, half_factor_length, writer)
-            result = self.n_bit_adder(shifted_high, result_mid, self.zero, writer)
+    def multiply(self, factor_1: List[T], factor_2: List[T], writer: W) -> List[T]:
+        normalized_factor_1 = self.normalize(factor_1)
+        normalized_factor_2 = self.normalize(factor_2)
+        max_factor_length = max(len(normalized_factor_1), len(normalized_factor_2))
+        min_factor_length = min(len(normalized_factor_1), len(normalized_factor_2))
+        part_length = (max_factor_length + 2) // 3
 
-            shifted_high = self.shift(result, half_factor_length, writer)
-            result = self.n_bit_adder(shifted_high, result_low, self.zero, writer)
+        if (not normalized_factor_1) or (not normalized_factor_2):
+            return [self.zero]
+        elif max_factor_length <= max(self.toom_min_len, part_length + 4) or min_factor_length <= part_length:
+            # The evaluations have up to four additional bits. Hence, small factors would not shrink.
+            return super(ToomCookStrategy, self).multiply(normalized_factor_1, normalized_factor_2, writer)
+        else:
+            f1_points = self._evaluate(self._split(normalized_factor_1, part_length), writer)
+            f2_points = self._evaluate(self._split(normalized_factor_2, part_length), writer)
+
+            r0, r1, r2, r3, r_inf = [
+                self.multiply(f1_point, f2_point, writer)
+                for f1_point, f2_point in zip(f1_points, f2_points)
+            ]
+
+            # Every coefficient is the sum of at most three products of two parts
+            coefficient_length = 2 * part_length + 2
+            interpolation_length = coefficient_length + 4
+
+            # s1 = w1 + w2 + w3, s2 = w1 + 2 w2 + 4 w3, s3 = w1 + 3 w2 + 9 w3
+            s1 = self._subtract_all(r1, [r0, r_inf], interpolation_length, writer)
+            s2 = self._subtract_all(r2, [r0, self.shift(r_inf, 4, writer)], interpolation_length + 1, writer)
+            s2 = self._divide_by_two(s2)
+            s3 = self._subtract_all(r3, [r0, self._multiply_by_constant(r_inf, 81, writer)],
+                                     interpolation_length + 2, writer)
+            s3 = self._divide_by_three(s3, writer)
+
+            # t1 = w2 + 3 w3, t2 = w2 + 5 w3
+            t1 = self._subtract_all(s2, [s1], interpolation_length, writer)
+            t2 = self._subtract_all(s3, [s2], interpolation_length, writer)
+
+            w3 = self._divide_by_two(self._subtract_all(t2, [t1], interpolation_length, writer))
+            w2 = self._subtract_all(t1, [self._multiply_by_constant(w3, 3, writer)], coefficient_length, writer)
+            w1 = self._subtract_all(s1, [w2, w3], coefficient_length, writer)
+
+            # result = r_inf * 2^(4k) + w3 * 2^(3k) + w2 * 2^(2k) + w1 * 2^k + r0
+            result = r_inf
+            for coefficient in [w3, w2, w1, r0]:
+                shifted_result = self.shift(result, part_length, writer)
+                result = self.n_bit_adder(shifted_result, coefficient, self.zero, writer)
 
             return result
 
+    def _split(self, number: List[T], part_length: int) -> List[List[T]]:
+        high, low = utils.split_at(number, -part_length)
+        high, mid = utils.split_at(high, -part_length)
+
+        return [low, mid, high]
+
+    def _evaluate(self, parts: List[List[T]], writer: W) -> List[List[T]]:
+        low, mid, high = parts
+
+        # p(x) = high * x^2 + mid * x + low
+        point_0 = low
+        point_1 = self.n_bit_adder(self.n_bit_adder(low, mid, self.zero, writer), high, self.zero, writer)
+        point_2 = self.n_bit_adder(
+            self.n_bit_adder(low, self.shift(mid, 1, writer), self.zero, writer),
+            self.shift(high, 2, writer),
+            self.zero,
+            writer
+        )
+        point_3 = self.n_bit_adder(
+            self.n_bit_adder(low, self._multiply_by_constant(mid, 3, writer), self.zero, writer),
+            self._multiply_by_constant(high, 9, writer),
+            self.zero,
+            writer
+        )
+        point_inf = high
+
+        return [point_0, point_1, point_2, point_3, point_inf]
+
+    def _multiply_by_constant(self, number: List[T], constant: int, writer: W) -> List[T]:
+        result = []
+        for shifts, bit in enumerate(reversed(utils.to_bin_string(constant))):
+            if bit == '1':
+                shifted_number = self.shift(number, shifts, writer)
+                result = self.n_bit_adder(result, shifted_number, self.zero, writer) if result else shifted_number
+
+        return result
+
+    def _divide_by_two(self, number: List[T]) -> List[T]:
+        # The number is known to be even
+        return number[:-1]
+
+    def _divide_by_three(self, number: List[T], writer: W) -> List[T]:
+        # The number is known to be a multiple of three. Hence, x = 3y, i.e. y = x - 2y,
+        # which can be computed from the least significant bit as 2y only depends on lower bits.
+        result = []
+        shifted_result = self.zero
+        carry = self.one
+        for lsb in reversed(number):
+            lsb_result, carry = self.full_adder(lsb, self.wire_not(shifted_result, writer), carry, writer)
+            result.append(lsb_result)
+            shifted_result = lsb_result
+
+        result.reverse()
+        return result
+
+    def _subtract_all(self, number: List[T], subtrahends: List[List[T]], length: int, writer: W) -> List[T]:
+        for subtrahend in subtrahends:
+            number = self.subtract(number, subtrahend, writer)
+
+        return number[-length:]
+
 
 class WallaceTreeStrategy(
     Generic[T, W],
@@ -66,17 +217,7 @@ class WallaceTreeStrategy(
 
     def multiply(self, factor_1: List[T], factor_2: List[T], writer: W) -> List[T]:
         products = self._weighted_product(factor_1, factor_2, writer)
-        grouped_products = utils.group(products)
-
-        while any(len(products) > 2 for _, products in grouped_products.items()):
-            products = itertools.chain.from_iterable(
-                itertools.starmap(
-                    functools.partial(self._add_layer, writer=writer),
-                    grouped_products.items()
-                )
-            )
-
-            grouped_products = utils.group(products)
+        grouped_products = self._reduce(utils.group(products), writer)
 
         result = []
         last_carry = self.zero
@@ -97,6 +238,19 @@ class WallaceTreeStrategy(
         result.append(last_carry)
         return result[::-1]
 
+    def _reduce(self, grouped_products: Dict[int, List[T]], writer: W) -> Dict[int, List[T]]:
+        while any(len(products) > 2 for _, products in grouped_products.items()):
+            products = itertools.chain.from_iterable(
+                itertools.starmap(
+                    functools.partial(self._add_layer, writer=writer),
+                    grouped_products.items()
+                )
+            )
+
+            grouped_products = utils.group(products)
+
+        return grouped_products
+
     def _weighted_product(self, factor_1: List[T], factor_2: List[T], writer: W):
         for i, x in enumerate(factor_1):
             w_x = len(factor_1) - i
@@ -127,3 +281,55 @@ class WallaceTreeStrategy(
             sum, carry = self.full_adder(product_1, product_2, product_3, writer)
 
             return [(weight, sum), (weight + 1, carry)] + self._add_layer(weight, products[3:], writer)
+
+
+class DaddaTreeStrategy(
+    WallaceTreeStrategy[T, W],
+    Generic[T, W],
+    ABC
+):
+    """
+    Reduces the partial products like a Wallace tree, but follows the Dadda
+    schedule: in each layer the columns are only reduced to the next smaller
+    height of the sequence 2, 3, 4, 6, 9, ... This requires fewer half and
+    full adders than the greedy reduction of the Wallace tree.
+    """
+
+    def _reduce(self, grouped_products: Dict[int, List[T]], writer: W) -> Dict[int, List[T]]:
+        max_height = max(map(len, grouped_products.values()), default=0)
+
+        for height in reversed(self._dadda_heights(max_height)):
+            reduced_products = defaultdict(list)
+            for weight in sorted(grouped_products):
+                products = grouped_products[weight] + reduced_products[weight]
+                sums = []
+
+                index = 0
+                while len(products) - index + len(sums) > height:
+                    if len(products) - index + len(sums) == height + 1:
+                        product_1, product_2 = products[index:index + 2]
+                        sum, carry = self.half_adder(product_1, product_2, writer)
+                        index += 2
+                    else:
+                        product_1, product_2, product_3 = products[index:index + 3]
+                        sum, carry = self.full_adder(product_1, product_2, product_3, writer)
+                        index += 3
+
+                    sums.append(sum)
+                    reduced_products[weight + 1].append(carry)
+
+                reduced_products[weight] = products[index:] + sums
+
+            grouped_products = reduced_products
+
+        return grouped_products
+
+    @staticmethod
+    def _dadda_heights(max_height: int) -> List[int]:
+        heights = []
+        height = 2
+        while height < max_height:
+            heights.append(height)
+            height = (3 * height) // 2
+
+        return heights
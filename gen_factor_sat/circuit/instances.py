@@ -1,13 +1,17 @@
+import inspect
+import sys
 from abc import ABC
-from typing import TypeVar
+from typing import Dict, Type, TypeVar
 
 from gen_factor_sat.circuit.default.circuit import ConstantStrategy, GeneralSimpleCircuitStrategy, \
-    GeneralNBitCircuitStrategy
+    GeneralNBitCircuitStrategy, BitParallelStrategy, BitParallelCircuitStrategy
 from gen_factor_sat.circuit.default.factoring import GeneralFactoringStrategy
-from gen_factor_sat.circuit.default.multiplication import WallaceTreeStrategy, KaratsubaStrategy
+from gen_factor_sat.circuit.default.multiplication import WallaceTreeStrategy, KaratsubaStrategy, \
+    DaddaTreeStrategy, ToomCookStrategy
 from gen_factor_sat.circuit.interface.circuit import GateStrategy
 from gen_factor_sat.circuit.interface.factoring import FactoringStrategy
-from gen_factor_sat.circuit.tseitin.circuit import TseitinGateStrategy, TseitinCircuitStrategy
+from gen_factor_sat.circuit.tseitin.circuit import TseitinGateStrategy, TseitinCircuitStrategy, \
+    StructuralHashingGateStrategy, StructuralHashingCircuitStrategy
 from gen_factor_sat.formula.cnf import CNFBuilder
 from gen_factor_sat.formula.symbol import Symbol, Constant
 
@@ -51,6 +55,42 @@ class TseitinWallaceFactoringStrategy(
     pass
 
 
+class TseitinToomCookFactoringStrategy(
+    TseitinGateStrategy,
+    TseitinCircuitStrategy,
+    GeneralNBitCircuitStrategy[Symbol, CNFBuilder],
+    ToomCookStrategy[Symbol, CNFBuilder],
+    KaratsubaStrategy[Symbol, CNFBuilder],
+    WallaceTreeStrategy[Symbol, CNFBuilder],
+    GeneralFactoringStrategy[Symbol, CNFBuilder],
+    FactoringAndGateStrategy[Symbol, CNFBuilder]
+):
+    pass
+
+
+class TseitinDaddaFactoringStrategy(
+    TseitinGateStrategy,
+    TseitinCircuitStrategy,
+    GeneralNBitCircuitStrategy[Symbol, CNFBuilder],
+    DaddaTreeStrategy[Symbol, CNFBuilder],
+    GeneralFactoringStrategy[Symbol, CNFBuilder],
+    FactoringAndGateStrategy[Symbol, CNFBuilder]
+):
+    pass
+
+
+class TseitinHashingFactoringStrategy(
+    StructuralHashingGateStrategy,
+    StructuralHashingCircuitStrategy,
+    GeneralNBitCircuitStrategy[Symbol, CNFBuilder],
+    KaratsubaStrategy[Symbol, CNFBuilder],
+    WallaceTreeStrategy[Symbol, CNFBuilder],
+    GeneralFactoringStrategy[Symbol, CNFBuilder],
+    FactoringAndGateStrategy[Symbol, CNFBuilder]
+):
+    pass
+
+
 class ConstantFactoringStrategy(
     ConstantStrategy,
     GeneralSimpleCircuitStrategy[Constant, None],
@@ -72,3 +112,89 @@ class ConstantWallaceFactoringStrategy(
     FactoringAndGateStrategy[Constant, None]
 ):
     pass
+
+
+class ConstantToomCookFactoringStrategy(
+    ConstantStrategy,
+    GeneralSimpleCircuitStrategy[Constant, None],
+    GeneralNBitCircuitStrategy[Constant, None],
+    ToomCookStrategy[Constant, None],
+    KaratsubaStrategy[Constant, None],
+    WallaceTreeStrategy[Constant, None],
+    GeneralFactoringStrategy[Constant, None],
+    FactoringAndGateStrategy[Constant, None]
+):
+    pass
+
+
+class ConstantDaddaFactoringStrategy(
+    ConstantStrategy,
+    GeneralSimpleCircuitStrategy[Constant, None],
+    GeneralNBitCircuitStrategy[Constant, None],
+    DaddaTreeStrategy[Constant, None],
+    GeneralFactoringStrategy[Constant, None],
+    FactoringAndGateStrategy[Constant, None]
+):
+    pass
+
+
+class BitParallelFactoringStrategy(
+    BitParallelStrategy,
+    BitParallelCircuitStrategy,
+    GeneralNBitCircuitStrategy[int, None],
+    KaratsubaStrategy[int, None],
+    WallaceTreeStrategy[int, None],
+    GeneralFactoringStrategy[int, None],
+    FactoringAndGateStrategy[int, None]
+):
+    pass
+
+
+class BitParallelWallaceFactoringStrategy(
+    BitParallelStrategy,
+    BitParallelCircuitStrategy,
+    GeneralNBitCircuitStrategy[int, None],
+    WallaceTreeStrategy[int, None],
+    GeneralFactoringStrategy[int, None],
+    FactoringAndGateStrategy[int, None]
+):
+    pass
+
+
+class BitParallelToomCookFactoringStrategy(
+    BitParallelStrategy,
+    BitParallelCircuitStrategy,
+    GeneralNBitCircuitStrategy[int, None],
+    ToomCookStrategy[int, None],
+    KaratsubaStrategy[int, None],
+    WallaceTreeStrategy[int, None],
+    GeneralFactoringStrategy[int, None],
+    FactoringAndGateStrategy[int, None]
+):
+    pass
+
+
+class BitParallelDaddaFactoringStrategy(
+    BitParallelStrategy,
+    BitParallelCircuitStrategy,
+    GeneralNBitCircuitStrategy[int, None],
+    DaddaTreeStrategy[int, None],
+    GeneralFactoringStrategy[int, None],
+    FactoringAndGateStrategy[int, None]
+):
+    pass
+
+
+def strategies() -> Dict[str, Type[FactoringAndGateStrategy]]:
+    """
+    Collect all strategies of this module that produce a CNF.
+
+    :return: the strategies by their names
+    """
+    return {
+        name: cls
+        for name, cls in inspect.getmembers(sys.modules[__name__], inspect.isclass)
+        if issubclass(cls, FactoringAndGateStrategy)
+        and issubclass(cls, TseitinGateStrategy)
+        and not inspect.isabstract(cls)
+    }
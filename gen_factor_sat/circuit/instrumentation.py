@@ -0,0 +1,129 @@
+"""
+Instrumentation
+
+A strategy mixin that records statistics about the created circuit in the
+EncodingStats of its writer (see gen_factor_sat.formula.stats). Strategies
+are only instrumented on demand (see instrument), such that the encoding
+without statistics is not slowed down.
+"""
+from abc import ABC
+from typing import Callable, Dict, List, TypeVar
+
+from gen_factor_sat.circuit.interface.circuit import GateStrategy, SimpleCircuitStrategy, NBitCircuitStrategy
+from gen_factor_sat.circuit.interface.multiplication import MultiplicationStrategy
+from gen_factor_sat.formula.stats import InstrumentedCNFBuilder
+from gen_factor_sat.formula.symbol import Symbol
+
+S = TypeVar('S')
+
+
+class InstrumentedStrategy(
+    GateStrategy[Symbol, InstrumentedCNFBuilder],
+    SimpleCircuitStrategy[Symbol, InstrumentedCNFBuilder],
+    NBitCircuitStrategy[Symbol, InstrumentedCNFBuilder],
+    MultiplicationStrategy[Symbol, InstrumentedCNFBuilder],
+    ABC
+):
+    """
+    Counts the gates by type and times the n-bit operations. A gate is counted
+    as folded if it did not allocate a new variable, e.g. because an input is
+    constant or an equivalent gate already exists. Hence, negations are always
+    folded. Gates derived from other gates are only counted once. The multiplication is timed
+    per recursion level, e.g. multiply[0] for the outermost multiplication.
+    The 3-input XOR-Gates and Majority-Gates of the Tseitin strategies are
+    counted as gates as well.
+    Must precede the instrumented strategy in the method resolution order.
+    """
+
+    def wire_and(self, value_1: Symbol, value_2: Symbol, writer: InstrumentedCNFBuilder) -> Symbol:
+        return self._gate('and', super(InstrumentedStrategy, self).wire_and, writer, value_1, value_2)
+
+    def wire_or(self, value_1: Symbol, value_2: Symbol, writer: InstrumentedCNFBuilder) -> Symbol:
+        return self._gate('or', super(InstrumentedStrategy, self).wire_or, writer, value_1, value_2)
+
+    def wire_not(self, value: Symbol, writer: InstrumentedCNFBuilder) -> Symbol:
+        return self._gate('not', super(InstrumentedStrategy, self).wire_not, writer, value)
+
+    def xor(self, value_1: Symbol, value_2: Symbol, writer: InstrumentedCNFBuilder) -> Symbol:
+        return self._gate('xor', super(InstrumentedStrategy, self).xor, writer, value_1, value_2)
+
+    def xor3(self, value_1: Symbol, value_2: Symbol, value_3: Symbol, writer: InstrumentedCNFBuilder) -> Symbol:
+        return self._gate('xor3', super(InstrumentedStrategy, self).xor3, writer, value_1, value_2, value_3)
+
+    def majority(self, value_1: Symbol, value_2: Symbol, value_3: Symbol, writer: InstrumentedCNFBuilder) -> Symbol:
+        return self._gate('majority', super(InstrumentedStrategy, self).majority, writer, value_1, value_2, value_3)
+
+    @staticmethod
+    def _gate(kind: str, gate: Callable[..., Symbol], writer: InstrumentedCNFBuilder, *values: Symbol) -> Symbol:
+        # Gates derived from other gates are only counted by the outermost call
+        variables = writer.number_of_variables
+        writer.stats.start_gate()
+        created = False
+        try:
+            result = gate(*values, writer)
+            created = writer.number_of_variables != variables
+            return result
+        finally:
+            writer.stats.stop_gate(kind, created)
+
+    def n_bit_adder(
+            self,
+            number_1: List[Symbol],
+            number_2: List[Symbol],
+            carry: Symbol,
+            writer: InstrumentedCNFBuilder
+    ) -> List[Symbol]:
+        writer.stats.start('n_bit_adder')
+        try:
+            return super(InstrumentedStrategy, self).n_bit_adder(number_1, number_2, carry, writer)
+        finally:
+            writer.stats.stop()
+
+    def subtract(self, number_1: List[Symbol], number_2: List[Symbol], writer: InstrumentedCNFBuilder) -> List[Symbol]:
+        writer.stats.start('subtract')
+        try:
+            return super(InstrumentedStrategy, self).subtract(number_1, number_2, writer)
+        finally:
+            writer.stats.stop()
+
+    def n_bit_equality(self, number_1: List[Symbol], number_2: List[Symbol], writer: InstrumentedCNFBuilder) -> Symbol:
+        writer.stats.start('n_bit_equality')
+        try:
+            return super(InstrumentedStrategy, self).n_bit_equality(number_1, number_2, writer)
+        finally:
+            writer.stats.stop()
+
+    def multiply(self, factor_1: List[Symbol], factor_2: List[Symbol], writer: InstrumentedCNFBuilder) -> List[Symbol]:
+        level = writer.stats.depth('multiply')
+        writer.stats.start('multiply', 'multiply[{0}]'.format(level))
+        try:
+            return super(InstrumentedStrategy, self).multiply(factor_1, factor_2, writer)
+        finally:
+            writer.stats.stop()
+
+
+_instrumented_classes: Dict[type, type] = {}
+
+
+def instrument(strategy: S) -> S:
+    """
+    Create an instrumented copy of the strategy. The copy has the same
+    configuration as the strategy and must be used with an
+    InstrumentedCNFBuilder. The instrumented class is created once per
+    strategy class.
+
+    :param strategy: the strategy to be instrumented
+    :return: the instrumented strategy
+    """
+    cls = type(strategy)
+    if issubclass(cls, InstrumentedStrategy):
+        return strategy
+
+    instrumented_cls = _instrumented_classes.get(cls)
+    if instrumented_cls is None:
+        instrumented_cls = type('Instrumented' + cls.__name__, (InstrumentedStrategy, cls), {'__module__': __name__})
+        _instrumented_classes[cls] = instrumented_cls
+
+    instrumented = instrumented_cls.__new__(instrumented_cls)
+    instrumented.__dict__.update(vars(strategy))
+    return instrumented
@@ -0,0 +1,289 @@
+"""
+Parallel multiplication
+
+The sub-products of the Karatsuba multiplication are independent circuits.
+The parallel multiplication expands the upper levels of the recursion in
+the calling process and builds the remaining sub-products in worker
+processes. Each sub-product is built once by a fresh CNFBuilder, whose
+inputs are replaced by the placeholders 1, ..., n, hence its variables
+start right after its inputs. When merging, the inputs are mapped to the
+actual factor bits and all other variables are offset by the number of
+variables of the writer.
+
+The sub-products are merged in a fixed order, before the circuits combining
+them are built. Hence, the result only depends on the depth of the parallel
+expansion, but not on the number of workers. It encodes the same circuit as
+the sequential multiplication, up to the numbering of the variables.
+"""
+from __future__ import annotations
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from gen_factor_sat import utils
+from gen_factor_sat.circuit.default.multiplication import KaratsubaStrategy
+from gen_factor_sat.formula.clause_store import StoredClause
+from gen_factor_sat.formula.cnf import CNFBuilder, is_no_tautology
+from gen_factor_sat.formula.sink import ClauseRecorder, DimacsSink
+from gen_factor_sat.formula.symbol import Symbol, Variable, variable
+from gen_factor_sat.formula.xor import XorConstraint
+
+
+@dataclass(frozen=True)
+class SubProduct:
+    """
+    A sub-product that is built by a worker. The variables of the factors are
+    replaced by the placeholders 1, ..., n in the order of their occurrence,
+    such that the inputs of the worker do not depend on the writer. Constants
+    and the signs of negated inputs are kept.
+    """
+    factor_1: List[Symbol]
+    factor_2: List[Symbol]
+    number_of_inputs: int
+    xor: bool
+    polarity: bool
+
+
+@dataclass(frozen=True)
+class Circuit:
+    """
+    The sub-circuit built by a worker without tautologies. The literals of
+    all clauses are stored in a flat array, where each clause is terminated
+    by a zero like in DIMACS, and clause i starts at offsets[i]. This is
+    transferred much faster than a list of frozensets and can be renumbered
+    and converted into DIMACS without a loop over the clauses. The clauses
+    of the deferred gates are sorted, as unpickled sets may iterate in a
+    different order. The variables after the inputs were allocated by the
+    worker.
+    """
+    number_of_variables: int
+    literals: array
+    offsets: array
+    xors: Optional[List[XorConstraint]]
+    definitions: Optional[Dict[Variable, List[StoredClause]]]
+    required: List[int]
+    result: List[Symbol]
+
+
+@dataclass(frozen=True)
+class _Node:
+    half_factor_length: int
+    low: Optional[Union[_Node, int]]
+    high: Optional[Union[_Node, int]]
+    mid: Union[_Node, int]
+
+
+def multiply(
+        strategy: KaratsubaStrategy,
+        factor_1: List[Symbol],
+        factor_2: List[Symbol],
+        writer: CNFBuilder,
+        depth: int = 2,
+        workers: Optional[int] = None
+) -> List[Symbol]:
+    """
+    Multiply the factors like strategy.multiply, but build the sub-products
+    below the specified depth of the recursion in parallel. The depth 1
+    builds the three sub-products of the factors in parallel, the depth 2
+    the nine sub-products of these, and so on. The strategy must use the
+    Karatsuba multiplication and must be picklable.
+
+    Gates of different sub-products are not shared, even if the strategy
+    hashes its gates structurally.
+
+    :param strategy: the strategy to be used
+    :param factor_1: the first factor
+    :param factor_2: the second factor
+    :param writer: the writer of the circuit
+    :param depth: the number of levels of the recursion expanded before building the sub-products
+    :param workers: the number of processes (default: number of processors), 1 builds them in this process
+    :return: the product of the factors
+    :raises ValueError if the strategy does not use the Karatsuba multiplication or depth < 0
+    """
+    if type(strategy).multiply is not KaratsubaStrategy.multiply:
+        raise ValueError('The parallel multiplication requires the Karatsuba multiplication')
+
+    if depth < 0:
+        raise ValueError('The depth must not be negative')
+
+    products: List[Tuple[List[Symbol], List[Symbol]]] = []
+    root = _expand(strategy, factor_1, factor_2, writer, depth, products)
+
+    tasks = [_sub_product(product_1, product_2, writer) for product_1, product_2 in products]
+    circuits = _build_all(strategy, [sub_product for sub_product, _ in tasks], workers)
+
+    # The circuits are merged as soon as they are built, in the order of the sub-products
+    results = [_merge(circuit, inputs, writer) for circuit, (_, inputs) in zip(circuits, tasks)]
+    return _combine(strategy, root, results, writer)
+
+
+def build(strategy: KaratsubaStrategy, sub_product: SubProduct) -> Circuit:
+    """
+    Build the specified sub-product with a fresh CNFBuilder.
+
+    :param strategy: the strategy to be used
+    :param sub_product: the sub-product with placeholders as inputs
+    :return: the sub-circuit
+    """
+    writer = CNFBuilder(
+        sub_product.number_of_inputs, ClauseRecorder(), [] if sub_product.xor else None, sub_product.polarity
+    )
+    result = strategy.multiply(sub_product.factor_1, sub_product.factor_2, writer)
+
+    literals, offsets = array('i'), array('q', [0])
+    for clause in filter(is_no_tautology, writer.clauses):
+        literals.extend(clause)
+        literals.append(0)
+        offsets.append(len(literals))
+
+    definitions = None
+    if writer.definitions is not None:
+        definitions = {
+            output: sorted(tuple(sorted(clause)) for clause in definition)
+            for output, definition in writer.definitions.items()
+        }
+
+    return Circuit(
+        number_of_variables=writer.number_of_variables - sub_product.number_of_inputs,
+        literals=literals,
+        offsets=offsets,
+        xors=writer.xors,
+        definitions=definitions,
+        required=sorted(writer.required),
+        result=result
+    )
+
+
+def _expand(
+        strategy: KaratsubaStrategy,
+        factor_1: List[Symbol],
+        factor_2: List[Symbol],
+        writer: CNFBuilder,
+        depth: int,
+        products: List[Tuple[List[Symbol], List[Symbol]]]
+) -> Union[_Node, int]:
+    # Follows KaratsubaStrategy.multiply, but only builds the sums of the halves
+    normalized_factor_1 = strategy.normalize(factor_1)
+    normalized_factor_2 = strategy.normalize(factor_2)
+    max_factor_length = max(len(normalized_factor_1), len(normalized_factor_2))
+
+    if depth == 0 or (not normalized_factor_1) or (not normalized_factor_2) or max_factor_length <= strategy.min_len:
+        products.append((factor_1, factor_2))
+        return len(products) - 1
+
+    half_factor_length = (max_factor_length + 1) // 2
+    f1_high, f1_low = utils.split_at(normalized_factor_1, -half_factor_length)
+    f2_high, f2_low = utils.split_at(normalized_factor_2, -half_factor_length)
+
+    low = _expand(strategy, f1_low, f2_low, writer, depth - 1, products) if f1_low and f2_low else None
+    high = _expand(strategy, f1_high, f2_high, writer, depth - 1, products) if f1_high and f2_high else None
+
+    factor_1_sum = strategy.n_bit_adder(f1_high, f1_low, strategy.zero, writer) if f1_high else f1_low
+    factor_2_sum = strategy.n_bit_adder(f2_high, f2_low, strategy.zero, writer) if f2_high else f2_low
+    mid = _expand(strategy, factor_1_sum, factor_2_sum, writer, depth - 1, products)
+
+    return _Node(half_factor_length, low, high, mid)
+
+
+def _combine(
+        strategy: KaratsubaStrategy,
+        node: Optional[Union[_Node, int]],
+        results: List[List[Symbol]],
+        writer: CNFBuilder
+) -> List[Symbol]:
+    if node is None:
+        return []
+    elif isinstance(node, int):
+        return results[node]
+
+    result_low = _combine(strategy, node.low, results, writer)
+    result_high = _combine(strategy, node.high, results, writer)
+    result_mid = _combine(strategy, node.mid, results, writer)
+    return strategy.combine_products(result_low, result_high, result_mid, node.half_factor_length, writer)
+
+
+def _sub_product(
+        factor_1: List[Symbol],
+        factor_2: List[Symbol],
+        writer: CNFBuilder
+) -> Tuple[SubProduct, List[Variable]]:
+    placeholders: Dict[Variable, Variable] = {}
+    for symbol in factor_1 + factor_2:
+        if isinstance(symbol, int):
+            placeholders.setdefault(abs(symbol), variable(len(placeholders) + 1))
+
+    def replace(symbol: Symbol) -> Symbol:
+        if not isinstance(symbol, int):
+            return symbol
+
+        placeholder = placeholders[abs(symbol)]
+        return placeholder if symbol > 0 else -placeholder
+
+    sub_product = SubProduct(
+        factor_1=list(map(replace, factor_1)),
+        factor_2=list(map(replace, factor_2)),
+        number_of_inputs=len(placeholders),
+        xor=writer.xors is not None,
+        polarity=writer.definitions is not None
+    )
+
+    return sub_product, list(placeholders)
+
+
+def _build_all(
+        strategy: KaratsubaStrategy,
+        sub_products: List[SubProduct],
+        workers: Optional[int]
+) -> Iterator[Circuit]:
+    if workers == 1 or len(sub_products) <= 1:
+        yield from (build(strategy, sub_product) for sub_product in sub_products)
+        return
+
+    # Start the largest sub-products first, the circuits are yielded in the original order
+    order = sorted(
+        range(len(sub_products)),
+        key=lambda index: -max(len(sub_products[index].factor_1), len(sub_products[index].factor_2))
+    )
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {index: executor.submit(build, strategy, sub_products[index]) for index in order}
+        for index in range(len(sub_products)):
+            yield futures.pop(index).result()
+
+
+def _merge(circuit: Circuit, inputs: List[Variable], writer: CNFBuilder) -> List[Symbol]:
+    # The placeholders map to the inputs, the allocated variables follow the variables of the writer
+    first = writer.number_of_variables + 1
+    variables = inputs + list(range(first, first + circuit.number_of_variables))
+    writer.number_of_variables += circuit.number_of_variables
+
+    # Negative indices address the negated literals, hence each literal is mapped by a single lookup
+    table = [0] + variables + [-x for x in reversed(variables)]
+
+    if isinstance(writer.clauses, DimacsSink):
+        names = [str(literal) + ' ' for literal in table]
+        names[0] = '0\n'
+        writer.clauses.write_block(''.join(map(names.__getitem__, circuit.literals)), len(circuit.offsets) - 1)
+    else:
+        literals, offsets = list(map(table.__getitem__, circuit.literals)), circuit.offsets.tolist()
+        writer.write_clauses(frozenset(literals[start:end - 1]) for start, end in zip(offsets, offsets[1:]))
+
+    if circuit.xors is not None:
+        writer.xors.extend(
+            XorConstraint(frozenset(map(table.__getitem__, sorted(xor.variables))), xor.parity) for xor in circuit.xors
+        )
+
+    if circuit.definitions is not None:
+        writer.definitions.update(
+            (table[output], {frozenset(map(table.__getitem__, clause)) for clause in clauses})
+            for output, clauses in circuit.definitions.items()
+        )
+
+        # The worker already wrote the implications of its own gates, the inputs are defined by the writer
+        number_of_inputs = len(inputs)
+        writer.required.update(table[literal] for literal in circuit.required if abs(literal) > number_of_inputs)
+        writer.require([table[literal] for literal in circuit.required if abs(literal) <= number_of_inputs])
+
+    return [table[symbol] if isinstance(symbol, int) else symbol for symbol in circuit.result]
@@ -0,0 +1,101 @@
+"""
+Bit-parallel simulation
+
+Evaluate circuits for many inputs at once with the BitParallelStrategy. The
+inputs are packed into wires, such that bit j of wire i is bit i of input j.
+A single evaluation of a multiplier thereby computes thousands of products,
+which allows cross-checking the multipliers at large widths.
+"""
+import random
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from gen_factor_sat.circuit.interface.multiplication import MultiplicationStrategy
+
+BitParallelFactory = Callable[[int], MultiplicationStrategy[int, None]]
+
+
+def pack(values: Sequence[int], width: int) -> List[int]:
+    """
+    Pack the values into wires, one lane per value.
+
+    :param values: the values, each having at most width bits
+    :param width: the number of wires
+    :return: the wires encoding the values with [msb, ..., lsb]
+    """
+    if not values:
+        return [0] * width
+
+    # The last lane is the most significant bit of a wire
+    bits = [format(value, '0{0}b'.format(width)) for value in reversed(values)]
+    return [int(''.join(column), 2) for column in zip(*bits)]
+
+
+def unpack(wires: Sequence[int], lanes: int) -> List[int]:
+    """
+    Unpack the wires into one value per lane.
+
+    :param wires: the wires with [msb, ..., lsb]
+    :param lanes: the number of lanes
+    :return: the values of all lanes
+    """
+    if not lanes:
+        return []
+    elif not wires:
+        return [0] * lanes
+
+    columns = [format(wire, '0{0}b'.format(lanes)) for wire in wires]
+    return [int(''.join(row), 2) for row in reversed(list(zip(*columns)))]
+
+
+def multiply(
+        strategy: BitParallelFactory,
+        factors_1: Sequence[int],
+        factors_2: Sequence[int],
+        width_1: int,
+        width_2: Optional[int] = None
+) -> List[int]:
+    """
+    Multiply all pairs of factors with a single evaluation of the multiplier.
+
+    :param strategy: creates the strategy for the specified number of lanes
+    :param factors_1: the first factors
+    :param factors_2: the second factors, one for each first factor
+    :param width_1: the bit length of the first factors
+    :param width_2: the bit length of the second factors (default: width_1)
+    :return: the products of the pairs
+    """
+    if len(factors_1) != len(factors_2):
+        raise ValueError('Both factors must have the same number of values')
+
+    lanes = len(factors_1)
+    width_2 = width_1 if width_2 is None else width_2
+
+    result = strategy(lanes).multiply(pack(factors_1, width_1), pack(factors_2, width_2), None)
+    return unpack(result, lanes)
+
+
+def random_factors(seed: int, lanes: int, width_1: int, width_2: Optional[int] = None) -> Tuple[List[int], List[int]]:
+    """
+    Draw pseudo-random pairs of factors. To cover the extreme cases, a factor
+    is zero or the maximum with a small probability. Otherwise, it is drawn
+    uniformly from the numbers of a random bit length.
+
+    :param seed: the seed of the generator
+    :param lanes: the number of pairs
+    :param width_1: the bit length of the first factors
+    :param width_2: the bit length of the second factors (default: width_1)
+    :return: the first and second factors
+    """
+    rand = random.Random(seed)
+    width_2 = width_1 if width_2 is None else width_2
+
+    def draw(width):
+        kind = rand.randrange(16)
+        if kind == 0:
+            return 0
+        elif kind == 1:
+            return (1 << width) - 1
+        else:
+            return rand.getrandbits(rand.randint(1, width))
+
+    return [draw(width_1) for _ in range(lanes)], [draw(width_2) for _ in range(lanes)]
@@ -1,5 +1,5 @@
 from abc import ABC
-from typing import TypeVar, cast
+from typing import Tuple, TypeVar, cast
 
 import gen_factor_sat.circuit.tseitin.encoding as te
 from gen_factor_sat.circuit.default.circuit import GeneralSimpleCircuitStrategy
@@ -92,23 +92,60 @@ class TseitinGateStrategy(GateStrategy[Symbol, CNFBuilder]):
 
 
 class TseitinCircuitStrategy(GeneralSimpleCircuitStrategy[Symbol, CNFBuilder], ABC):
+    """
+    Encodes the full adder as two direct cells: The sum is a 3-input XOR-Gate
+    and the carry a Majority-Gate. This requires two variables instead of the
+    five of two half adders and an OR-Gate. An Equality-Gate is a negated
+    XOR-Gate and hence requires no additional variable. If an input of the
+    full adder is constant, it is composed of half adders to fold the constant.
+    """
+
+    def full_adder(self, value_1: Symbol, value_2: Symbol, carry: Symbol, writer: CNFBuilder) -> Tuple[Symbol, Symbol]:
+        if self.is_constant(value_1) or self.is_constant(value_2) or self.is_constant(carry):
+            return super(TseitinCircuitStrategy, self).full_adder(value_1, value_2, carry, writer)
+        else:
+            return self.xor3(value_1, value_2, carry, writer), self.majority(value_1, value_2, carry, writer)
+
+    def xor3(self, value_1: Symbol, value_2: Symbol, value_3: Symbol, writer: CNFBuilder) -> Symbol:
+        """
+        Encode a 3-input XOR-Gate as a single cell. The inputs must not be
+        constant.
+
+        :param value_1: the first input
+        :param value_2: the second input
+        :param value_3: the third input
+        :param writer: the object collecting the written clauses
+        :return: the output of the gate
+        """
+        if writer.xors is not None:
+            return writer.from_xor(value_1, value_2, value_3)
+        else:
+            return writer.from_tseitin(te.xor3_equality, value_1, value_2, value_3)
+
+    def majority(self, value_1: Symbol, value_2: Symbol, value_3: Symbol, writer: CNFBuilder) -> Symbol:
+        """
+        Encode a Majority-Gate as a single cell. The inputs must not be
+        constant.
+
+        :param value_1: the first input
+        :param value_2: the second input
+        :param value_3: the third input
+        :param writer: the object collecting the written clauses
+        :return: the output of the gate
+        """
+        return writer.from_tseitin(te.majority_equality, value_1, value_2, value_3)
+
+    def equality(self, value_1: Symbol, value_2: Symbol, writer: CNFBuilder) -> Symbol:
+        return self.wire_not(self.xor(value_1, value_2, writer), writer)
 
     def xor(self, value_1: Symbol, value_2: Symbol, writer: CNFBuilder) -> Symbol:
         if self.is_constant(value_1) or self.is_constant(value_2):
             return self._constant_xor(value_1, value_2, writer)
+        elif writer.xors is not None:
+            return writer.from_xor(value_1, value_2)
         else:
             return writer.from_tseitin(te.xor_equality, value_1, value_2)
 
-    # def equality(self, x: Symbol, y: Symbol) -> Symbol:
-    #     if _is_constant(x):
-    #         return self.assume(y, x)
-    #     elif _is_constant(y):
-    #         return self.assume(x, y)
-    #     else:
-    #         z = self.gate_builder.cnf_builder.next_variable()
-    #         self.gate_builder.cnf_builder.append_clauses(tseitin.equal_equality(x, y, z))
-    #         return z
-
     def _constant_xor(self, input_1, input_2, writer: CNFBuilder):
         if input_1 == self.one:
             return self.wire_not(input_2, writer)
@@ -120,3 +157,92 @@ class TseitinCircuitStrategy(GeneralSimpleCircuitStrategy[Symbol, CNFBuilder], A
             return input_1
         else:
             raise ValueError('Neither {0} nor {1} is a constant'.format(input_1, input_2))
+
+
+class StructuralHashingGateStrategy(TseitinGateStrategy):
+    """
+    Reuses the output of structurally equal gates (hash-consing). The inputs
+    are normalized before the lookup: the operands are ordered and an OR-Gate
+    is expressed as a negated AND-Gate of the negated inputs. Additionally,
+    the trivial identities x AND x = x and x AND NOT x = 0 are applied.
+    The cache is stored in the CNFBuilder.
+    """
+
+    def wire_and(self, value_1: Symbol, value_2: Symbol, writer: CNFBuilder) -> Symbol:
+        if self.is_constant(value_1) or self.is_constant(value_2):
+            return self._constant_and(value_1, value_2)
+        elif value_1 == value_2:
+            return value_1
+        elif value_1 == -value_2:
+            return self.zero
+        else:
+            input_1, input_2 = sorted((value_1, value_2))
+            return writer.from_cached_tseitin(('and', input_1, input_2), te.and_equality, input_1, input_2)
+
+    def wire_or(self, value_1: Symbol, value_2: Symbol, writer: CNFBuilder) -> Symbol:
+        if self.is_constant(value_1) or self.is_constant(value_2):
+            return self._constant_or(value_1, value_2)
+        else:
+            # De Morgan: The encoding of the AND-Gate equals the encoding of the OR-Gate
+            negated_and = self.wire_and(self.wire_not(value_1, writer), self.wire_not(value_2, writer), writer)
+            return self.wire_not(negated_and, writer)
+
+
+class StructuralHashingCircuitStrategy(TseitinCircuitStrategy, ABC):
+    """
+    Reuses the output of structurally equal XOR-Gates and full adders. As
+    negating an input of an XOR-Gate negates the output, the inputs are
+    normalized to positive variables. The same holds for negating all inputs
+    of a Majority-Gate. Additionally, the trivial identities x XOR x = 0 and
+    x XOR NOT x = 1 are applied. A full adder with a repeated input is
+    composed of half adders to apply them.
+    """
+
+    def full_adder(self, value_1: Symbol, value_2: Symbol, carry: Symbol, writer: CNFBuilder) -> Tuple[Symbol, Symbol]:
+        if any(map(self.is_constant, (value_1, value_2, carry))) or len({abs(value_1), abs(value_2), abs(carry)}) < 3:
+            return GeneralSimpleCircuitStrategy.full_adder(self, value_1, value_2, carry, writer)
+        else:
+            return self.xor3(value_1, value_2, carry, writer), self.majority(value_1, value_2, carry, writer)
+
+    def xor3(self, value_1: Symbol, value_2: Symbol, value_3: Symbol, writer: CNFBuilder) -> Symbol:
+        inputs = (value_1, value_2, value_3)
+        negated = sum(value < 0 for value in inputs) % 2 == 1
+        input_1, input_2, input_3 = sorted(map(abs, inputs))
+
+        key = ('xor', input_1, input_2, input_3)
+        if writer.xors is not None:
+            output = writer.from_cached_xor(key, input_1, input_2, input_3)
+        else:
+            output = writer.from_cached_tseitin(key, te.xor3_equality, input_1, input_2, input_3)
+
+        return self.wire_not(output, writer) if negated else output
+
+    def majority(self, value_1: Symbol, value_2: Symbol, value_3: Symbol, writer: CNFBuilder) -> Symbol:
+        # The majority is self-dual, i.e. negating all inputs negates the output
+        inputs = (value_1, value_2, value_3)
+        negated = sum(value < 0 for value in inputs) >= 2
+        input_1, input_2, input_3 = sorted(-value if negated else value for value in inputs)
+
+        key = ('majority', input_1, input_2, input_3)
+        output = writer.from_cached_tseitin(key, te.majority_equality, input_1, input_2, input_3)
+
+        return self.wire_not(output, writer) if negated else output
+
+    def xor(self, value_1: Symbol, value_2: Symbol, writer: CNFBuilder) -> Symbol:
+        if self.is_constant(value_1) or self.is_constant(value_2):
+            return self._constant_xor(value_1, value_2, writer)
+        elif value_1 == value_2:
+            return self.zero
+        elif value_1 == -value_2:
+            return self.one
+        else:
+            negated = (value_1 < 0) != (value_2 < 0)
+            input_1, input_2 = sorted((abs(value_1), abs(value_2)))
+
+            key = ('xor', input_1, input_2)
+            if writer.xors is not None:
+                output = writer.from_cached_xor(key, input_1, input_2)
+            else:
+                output = writer.from_cached_tseitin(key, te.xor_equality, input_1, input_2)
+
+            return self.wire_not(output, writer) if negated else output
@@ -53,6 +53,48 @@ def xor_equality(input_1: Variable, input_2: Variable, output: Variable) -> Set[
     }
 
 
+def xor3_equality(input_1: Variable, input_2: Variable, input_3: Variable, output: Variable) -> Set[Clause]:
+    """
+    Encode a 3-input XOR-Gate into a CNF. This is the sum of a full adder.
+
+    :param input_1: variable representing the first input of the XOR-Gate
+    :param input_2: variable representing the second input of the XOR-Gate
+    :param input_3: variable representing the third input of the XOR-Gate
+    :param output: variable representing the output of the XOR-Gate
+    :return: A set of clauses encoding the XOR-Gate
+    """
+    return {
+        frozenset([-input_1, -input_2, -input_3, output]),
+        frozenset([-input_1, -input_2, input_3, -output]),
+        frozenset([-input_1, input_2, -input_3, -output]),
+        frozenset([-input_1, input_2, input_3, output]),
+        frozenset([input_1, -input_2, -input_3, -output]),
+        frozenset([input_1, -input_2, input_3, output]),
+        frozenset([input_1, input_2, -input_3, output]),
+        frozenset([input_1, input_2, input_3, -output])
+    }
+
+
+def majority_equality(input_1: Variable, input_2: Variable, input_3: Variable, output: Variable) -> Set[Clause]:
+    """
+    Encode a Majority-Gate into a CNF. This is the carry of a full adder.
+
+    :param input_1: variable representing the first input of the Majority-Gate
+    :param input_2: variable representing the second input of the Majority-Gate
+    :param input_3: variable representing the third input of the Majority-Gate
+    :param output: variable representing the output of the Majority-Gate
+    :return: A set of clauses encoding the Majority-Gate
+    """
+    return {
+        frozenset([-input_1, -input_2, output]),
+        frozenset([-input_1, -input_3, output]),
+        frozenset([-input_2, -input_3, output]),
+        frozenset([input_1, input_2, -output]),
+        frozenset([input_1, input_3, -output]),
+        frozenset([input_2, input_3, -output])
+    }
+
+
 def equal_equality(input_1: Variable, input_2: Variable, output: Variable) -> Set[Clause]:
     """
     Encode an Equality-Gate into a CNF.
@@ -0,0 +1,93 @@
+"""
+Size estimation
+
+Determine the size of an instance before it is generated. The circuit is
+constructed as usual, but the clauses are only counted (see CountingSink).
+Hence, the number of variables and clauses, the size of the DIMACS and the
+memory of a ClauseStore are exact, while the memory of the encoding does not
+grow with the number of clauses.
+"""
+import time
+from dataclasses import dataclass
+from random import Random
+from typing import Dict
+
+from gen_factor_sat.circuit.instances import strategies
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.clause_store import ClauseStore
+from gen_factor_sat.formula.sink import CountingSink
+
+HEADER = '{0:<35} {1:>6} {2:>12} {3:>12} {4:>12} {5:>12}'.format(
+    'Strategy', 'Bits', 'Variables', 'Clauses', 'DIMACS MB', 'Compact MB'
+)
+
+
+@dataclass()
+class Estimate:
+    """
+    The size of the instance of a single number. The compact size refers to
+    the buffers of a ClauseStore, i.e. the clauses when encoded compactly.
+    """
+    strategy: str
+    bits: int
+    number: int
+    variables: int
+    clauses: int
+    literals: int
+    clause_lengths: Dict[int, int]
+    dimacs_bytes: int
+    compact_bytes: int
+    time_ms: float
+
+
+def estimate(strategy: str, bits: int, seed: int = 0) -> Estimate:
+    """
+    Count the instance of a pseudo-random number of the specified length.
+    The multiplication circuit only depends on the length, hence all numbers
+    of the same length result in almost the same size.
+
+    :param strategy: the name of the strategy (see gen_factor_sat.circuit.instances.strategies)
+    :param bits: the bit length of the number
+    :param seed: the seed used to generate the number
+    :return: the size of the instance
+    :raises ValueError if the strategy is unknown or bits < 2
+    """
+    if strategy not in strategies():
+        raise ValueError('Unknown strategy {0}'.format(strategy))
+
+    if bits < 2:
+        raise ValueError('The number must have at least 2 bits')
+
+    rand = Random('{0}:{1}'.format(seed, bits))
+    number = rand.getrandbits(bits) | (1 << (bits - 1))
+
+    start = time.perf_counter()
+    factor_sat = FactoringSat.factorize_number(number, strategy=strategies()[strategy](), count=True)
+    elapsed = time.perf_counter() - start
+
+    sink: CountingSink = factor_sat.cnf.clauses
+    return Estimate(
+        strategy=strategy,
+        bits=bits,
+        number=number,
+        variables=factor_sat.cnf.number_of_variables,
+        clauses=len(sink),
+        literals=sink.number_of_literals,
+        clause_lengths=dict(sorted(sink.lengths.items())),
+        dimacs_bytes=sink.dimacs_bytes,
+        compact_bytes=ClauseStore.estimate_nbytes(len(sink), sink.number_of_literals),
+        time_ms=round(elapsed * 10 ** 3, 3)
+    )
+
+
+def format_estimate(entry: Estimate) -> str:
+    """
+    Format the estimate as row of a table (see HEADER).
+
+    :param entry: the estimate to be formatted
+    :return: the row
+    """
+    return '{0:<35} {1:>6} {2:>12} {3:>12} {4:>12.1f} {5:>12.1f}'.format(
+        entry.strategy, entry.bits, entry.variables, entry.clauses,
+        entry.dimacs_bytes / 2 ** 20, entry.compact_bytes / 2 ** 20
+    )
@@ -3,18 +3,84 @@ from __future__ import annotations
 import math
 import random
 import sys
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, cast
+from functools import partial
+from typing import TYPE_CHECKING, Callable, ContextManager, Hashable, List, Optional, Tuple, TextIO, cast
 
 from gen_factor_sat import utils
+from gen_factor_sat.circuit import parallel
 from gen_factor_sat.circuit.instances import FactoringAndGateStrategy, TseitinFactoringStrategy
+from gen_factor_sat.circuit.instrumentation import instrument
+from gen_factor_sat.formula.clause_store import ClauseStore
 from gen_factor_sat.formula.cnf import CNF, CNFBuilder
+from gen_factor_sat.formula.ordering import BFS, ORDERS, TOPOLOGICAL, order as order_cnf
+from gen_factor_sat.formula.simplify import simplify as simplify_cnf
+from gen_factor_sat.formula.sink import ClauseRecorder, CountingSink, DimacsSink, ICNFSink
+from gen_factor_sat.formula.stats import EncodingStats, InstrumentedCNFBuilder
+from gen_factor_sat.formula.xor import merge_chains
 from gen_factor_sat.formula.symbol import Symbol, Variable
 from gen_factor_sat.number_generator import Number, GeneratorConfig
+from gen_factor_sat.template import CircuitTemplate, TemplateCache
+
+if TYPE_CHECKING:
+    from gen_factor_sat.cache import InstanceCache
 
 SymFacStrategy = FactoringAndGateStrategy[Symbol, CNFBuilder]
 
 
+@dataclass(frozen=True)
+class EncodingOptions:
+    """
+    The options that determine the encoded instance besides the number and
+    the strategy (see FactoringSat.factorize_number). The keys of the
+    template cache and the instance cache as well as the command to
+    reproduce an instance are derived from the options.
+    """
+    simplify: bool = False
+    xor: bool = False
+    polarity: bool = False
+    ordering: Optional[str] = None
+    parallel_depth: Optional[int] = None
+
+    def __post_init__(self):
+        if self.ordering is not None and self.ordering not in ORDERS:
+            raise ValueError('Unknown ordering {0}, expected one of {1}'.format(self.ordering, ', '.join(ORDERS)))
+
+    def circuit_options(self) -> Tuple[bool, bool, Optional[int]]:
+        """
+        The options that change the circuit of the multiplication, i.e. the
+        options a template depends on.
+
+        :return: the xor, polarity and parallel_depth options
+        """
+        return self.xor, self.polarity, self.parallel_depth
+
+    def arguments(self) -> List[str]:
+        """
+        Convert the options into the arguments of the command line interface.
+
+        :return: the arguments of all set options
+        """
+        arguments = []
+        if self.simplify:
+            arguments.append('--simplify')
+
+        if self.xor:
+            arguments.append('--xor')
+
+        if self.polarity:
+            arguments.append('--polarity')
+
+        if self.ordering:
+            arguments.append('--order {0}'.format(self.ordering))
+
+        if self.parallel_depth is not None:
+            arguments.append('--parallel-depth {0}'.format(self.parallel_depth))
+
+        return arguments
+
+
 @dataclass
 class FactoringSat:
     """
@@ -23,12 +89,17 @@ class FactoringSat:
     variables encoding the factors and all necessary configurations to reproduce
     the results.
     """
-    VERSION = '0.3'
+    VERSION = '0.4'
     number: Number
     factor_1: List[Variable]
     factor_2: List[Variable]
     cnf: CNF
     generator: Optional[GeneratorConfig] = None
+    simplified: bool = False
+    xor: bool = False
+    polarity: bool = False
+    ordering: Optional[str] = None
+    parallel_depth: Optional[int] = None
 
     @staticmethod
     def __default_strategy() -> SymFacStrategy:
@@ -42,7 +113,18 @@ class FactoringSat:
             prime: Optional[bool] = None,
             error: float = 0.0,
             max_tries: int = 1000,
-            strategy: Optional[SymFacStrategy] = None
+            strategy: Optional[SymFacStrategy] = None,
+            compact: bool = False,
+            file: Optional[TextIO] = None,
+            templates: Optional[TemplateCache] = None,
+            simplify: bool = False,
+            xor: bool = False,
+            polarity: bool = False,
+            ordering: Optional[str] = None,
+            stats: Optional[EncodingStats] = None,
+            cache: Optional[InstanceCache] = None,
+            parallel_depth: Optional[int] = None,
+            workers: Optional[int] = None
     ) -> FactoringSat:
         """
         Encode the factoring of a pseudo-randomly generated number into a CNF.
@@ -62,6 +144,17 @@ class FactoringSat:
         :param error: the permitted error probability
         :param max_tries: the number of tries to generate a number
         :param strategy: the strategy to be used
+        :param compact: whether the clauses should be stored in a ClauseStore
+        :param file: a file to which the DIMACS should be streamed (see factorize_number)
+        :param templates: a cache of multiplication circuits (see factorize_number)
+        :param simplify: whether the CNF should be simplified (see factorize_number)
+        :param xor: whether XOR-Gates should be encoded as XOR constraints (see factorize_number)
+        :param polarity: whether the Plaisted-Greenbaum encoding should be used (see factorize_number)
+        :param ordering: the order of the clauses and variables (see factorize_number)
+        :param stats: collects statistics about the encoding (see factorize_number)
+        :param cache: a cache of encoded instances (see factorize_number)
+        :param parallel_depth: the depth of the parallel multiplication (see factorize_number)
+        :param workers: the number of processes of the parallel multiplication (see factorize_number)
         :return: the encoded factoring instance (see FactoringSat)
         """
         if seed is None:
@@ -75,56 +168,403 @@ class FactoringSat:
             max_tries=max_tries
         )
 
-        factor_sat = FactoringSat.__factorize_number(number, strategy)
-        factor_sat.generator = generator_config
-
-        return factor_sat
+        return FactoringSat.__factorize_number(
+            number=number,
+            options=EncodingOptions(
+                simplify=simplify, xor=xor, polarity=polarity, ordering=ordering, parallel_depth=parallel_depth
+            ),
+            strategy=strategy,
+            compact=compact,
+            file=file,
+            templates=templates,
+            stats=stats,
+            cache=cache,
+            generator=generator_config,
+            workers=workers
+        )
 
     @staticmethod
     def factorize_number(
             number: int,
-            strategy: Optional[SymFacStrategy] = None
+            strategy: Optional[SymFacStrategy] = None,
+            compact: bool = False,
+            file: Optional[TextIO] = None,
+            templates: Optional[TemplateCache] = None,
+            simplify: bool = False,
+            xor: bool = False,
+            polarity: bool = False,
+            ordering: Optional[str] = None,
+            stats: Optional[EncodingStats] = None,
+            cache: Optional[InstanceCache] = None,
+            count: bool = False,
+            parallel_depth: Optional[int] = None,
+            workers: Optional[int] = None
     ) -> FactoringSat:
         """
         Encode the factoring of the specified number into a CNF.
         The encoding is deterministic. Therefore, calling this method with the
         same number produces the same result.
 
+        If the compact flag is set, the clauses are stored in a ClauseStore
+        instead of a set of frozensets. This reduces the memory required for
+        large numbers considerably.
+
+        If a file is specified, the clauses are not stored at all. Instead, the
+        DIMACS (see to_dimacs) is written to the file while the circuit is built.
+        The clauses of the resulting CNF are then represented by the DimacsSink.
+
+        If a template cache is specified, the multiplication circuit is only
+        encoded once for all numbers of the same bit length and strategy. The
+        result is the same as without the cache. Hence, the strategy must be
+        stateless and its factorization must be the equality of the product
+        and the number.
+
+        If the simplify flag is set, the CNF is simplified by unit propagation
+        (see simplify). In combination with a file, the clauses are collected
+        in a ClauseStore and the simplified DIMACS is written at the end.
+
+        If the xor flag is set, XOR-Gates are encoded as native XOR constraints
+        instead of four clauses each (see gen_factor_sat.formula.xor). Chains of
+        XOR-Gates whose intermediate outputs are not used elsewhere are merged
+        into single constraints. The eliminated variables remain unused unless
+        the CNF is simplified. The DIMACS contains the constraints as x lines,
+        which are only supported by some solvers, e.g. CryptoMiniSat. In
+        combination with a file, the DIMACS is written at the end.
+
+        If the polarity flag is set, only the implications of the gates required
+        by the polarity in which their outputs are used are encoded (see
+        CNFBuilder). The CNF is equisatisfiable and the factors are decoded
+        as usual, but it contains fewer clauses.
+
+        If an ordering is specified, the clauses are sorted topologically, i.e.
+        grouped by gate in the order in which the circuit was built (see
+        gen_factor_sat.formula.ordering). The DIMACS is then the same byte by
+        byte, regardless of the container of the clauses. The ordering 'bfs'
+        additionally renumbers the variables by a breadth-first search from
+        the factors, which keep the first variables. In combination with a
+        file, the DIMACS is written at the end.
+
+        If statistics are specified, the strategy is instrumented to count the
+        gates and clauses and to time the phases of the encoding (see
+        gen_factor_sat.formula.stats). Otherwise, the encoding is not slowed
+        down. In combination with a template cache, the multiplication circuit
+        is only counted when its template is created.
+
+        If an instance cache is specified, the instance is loaded from the
+        cache if it was encoded before with the same strategy and options.
+        Otherwise, it is encoded and stored in the cache. A loaded instance
+        stores its clauses in a list (see gen_factor_sat.cache). In
+        combination with a file, the DIMACS is written at the end.
+
+        If the count flag is set, the clauses are neither stored nor written.
+        Instead, the clauses of the resulting CNF are represented by a
+        CountingSink, which counts them by length and determines the size of
+        the DIMACS. It cannot be combined with a file, the simplification, XOR
+        constraints, an ordering or an instance cache.
+
+        If a parallel depth is specified, the sub-products of the Karatsuba
+        multiplication below this depth of the recursion are built by a pool
+        of processes (see gen_factor_sat.circuit.parallel). The resulting CNF
+        encodes the same circuit, but its variables are numbered differently.
+        It only depends on the depth, not on the number of workers. The
+        strategy must use the Karatsuba multiplication, and the encoding
+        cannot be combined with statistics.
+
         :param number: the number to be factorized
         :param strategy: the strategy to be used
+        :param compact: whether the clauses should be stored in a ClauseStore
+        :param file: a file to which the DIMACS should be streamed
+        :param templates: a cache of multiplication circuits
+        :param simplify: whether the CNF should be simplified
+        :param xor: whether XOR-Gates should be encoded as XOR constraints
+        :param polarity: whether the Plaisted-Greenbaum encoding should be used
+        :param ordering: the order of the clauses and variables, 'topological' or 'bfs'
+        :param stats: collects statistics about the encoding
+        :param cache: a cache of encoded instances
+        :param count: whether the clauses should only be counted
+        :param parallel_depth: the depth of the recursion below which the sub-products are built in parallel
+        :param workers: the number of processes (default: number of processors)
         :return: the encoded factoring instance (see FactoringSat)
+        :raises ValueError if the ordering is unknown or an option is combined with an incompatible option
         """
-        return FactoringSat.__factorize_number(Number.unchecked(number), strategy)
+        return FactoringSat.__factorize_number(
+            number=Number.unchecked(number),
+            options=EncodingOptions(
+                simplify=simplify, xor=xor, polarity=polarity, ordering=ordering, parallel_depth=parallel_depth
+            ),
+            strategy=strategy,
+            compact=compact,
+            file=file,
+            templates=templates,
+            stats=stats,
+            cache=cache,
+            count=count,
+            workers=workers
+        )
 
     @staticmethod
-    def __factorize_number(number: Number, strategy: Optional[SymFacStrategy] = None) -> FactoringSat:
+    def factorize_numbers(
+            numbers: List[int],
+            strategy: Optional[SymFacStrategy] = None,
+            compact: bool = False,
+            file: Optional[TextIO] = None
+    ) -> IncrementalFactoringSat:
+        """
+        Encode the factoring of several numbers of the same bit length into a
+        single incremental CNF. The multiplication circuit is encoded once and
+        compared with free variables representing the number. Each number is
+        represented by an assumption block fixing these variables, such that an
+        incremental solver can reuse its learned clauses between the numbers.
+
+        If a file is specified, the iCNF (see to_icnf) is written to the file
+        while the circuit is built.
+
+        :param numbers: the numbers to be factorized
+        :param strategy: the strategy to be used
+        :param compact: whether the clauses should be stored in a ClauseStore
+        :param file: a file to which the iCNF should be streamed
+        :return: the encoded factoring instances (see IncrementalFactoringSat)
+        :raises ValueError if no number is specified or the numbers differ in length
+        """
+        if not numbers:
+            raise ValueError('At least one number must be specified')
+
+        number_length = numbers[0].bit_length()
+        if any(number.bit_length() != number_length for number in numbers):
+            # The length of the factors excludes the trivial factorization only for numbers of the same length
+            raise ValueError('All numbers must have the same bit length')
+
         if strategy is None:
             strategy = FactoringSat.__default_strategy()
 
-        cnf_builder = CNFBuilder()
+        if file is not None:
+            clauses = ICNFSink(file)
+        elif compact:
+            clauses = ClauseStore()
+        else:
+            clauses = None
 
-        bin_number = utils.to_bin_list(number.value)
-        factor_length_1, factor_length_2 = FactoringSat.__factor_lengths(len(bin_number))
+        cnf_builder = CNFBuilder(clauses=clauses)
+        factor_1, factor_2 = FactoringSat.__allocate_factors(number_length, cnf_builder)
+        number_variables = cnf_builder.next_variables(number_length)
 
-        factor_1 = cnf_builder.next_variables(factor_length_1)
-        factor_2 = cnf_builder.next_variables(factor_length_2)
+        result = IncrementalFactoringSat(
+            numbers=list(map(Number.unchecked, numbers)),
+            factor_1=factor_1,
+            factor_2=factor_2,
+            number_variables=number_variables,
+            cnf=CNF(0, cnf_builder.clauses)
+        )
+
+        if isinstance(clauses, ICNFSink):
+            clauses.write_comments(result.comments())
 
         fact_result = strategy.is_factorization(
             cast(List[Symbol], factor_1),
             cast(List[Symbol], factor_2),
-            cast(List[Symbol], bin_number),
+            cast(List[Symbol], number_variables),
             cnf_builder
         )
 
         strategy.expect_one(fact_result, cnf_builder)
 
-        return FactoringSat(
-            number=number,
-            factor_1=factor_1,
-            factor_2=factor_2,
-            cnf=cnf_builder.build()
+        if isinstance(clauses, ICNFSink):
+            clauses.close(cnf_builder.number_of_variables)
+            for number in result.numbers:
+                clauses.assume(result.assumptions(number.value))
+
+        result.cnf = cnf_builder.build()
+        return result
+
+    @staticmethod
+    def __factorize_number(
+            *,
+            number: Number,
+            options: EncodingOptions,
+            strategy: Optional[SymFacStrategy] = None,
+            compact: bool = False,
+            file: Optional[TextIO] = None,
+            templates: Optional[TemplateCache] = None,
+            stats: Optional[EncodingStats] = None,
+            cache: Optional[InstanceCache] = None,
+            generator: Optional[GeneratorConfig] = None,
+            count: bool = False,
+            workers: Optional[int] = None
+    ) -> FactoringSat:
+        # The clauses are only written while the circuit is built if no option requires all clauses
+        postprocess = options.simplify or options.xor or options.ordering is not None
+
+        if count and (file is not None or postprocess or cache is not None):
+            raise ValueError('Counting the clauses cannot be combined with a file, simplify, xor, order or a cache')
+
+        if options.parallel_depth is not None and stats is not None:
+            raise ValueError('The parallel multiplication cannot be combined with statistics')
+
+        if strategy is None:
+            strategy = FactoringSat.__default_strategy()
+
+        bin_number = utils.to_bin_list(number.value)
+
+        # Instrumented and plain strategies share their templates and cached instances
+        key = FactoringSat.__template_key(len(bin_number), strategy, options)
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.key(number, generator, strategy, options)
+
+        multiply: Callable[[List[Symbol], List[Symbol], CNFBuilder], List[Symbol]] = strategy.multiply
+        if options.parallel_depth is not None:
+            multiply = partial(parallel.multiply, strategy, depth=options.parallel_depth, workers=workers)
+
+        builder: Callable[..., CNFBuilder] = CNFBuilder
+        phase: Callable[[str], ContextManager] = lambda name: nullcontext()
+        if stats is not None:
+            strategy = instrument(strategy)
+            builder = partial(InstrumentedCNFBuilder, stats)
+            phase = stats.phase
+
+        if options.polarity:
+            builder = partial(builder, polarity=True)
+
+        if cache is not None:
+            with phase('cache'):
+                cached = cache.get(cache_key)
+
+            if cached is not None:
+                if file is not None:
+                    with phase('write'):
+                        FactoringSat.__write_dimacs(cached, file)
+
+                if stats is not None:
+                    stats.result(cached.cnf.number_of_variables, len(cached.cnf.clauses))
+
+                return cached
+
+        if count:
+            clauses = CountingSink()
+        elif file is not None and not (postprocess or cache is not None):
+            clauses = DimacsSink(file)
+        elif compact or file is not None:
+            clauses = ClauseStore()
+        else:
+            clauses = None
+
+        if templates is None:
+            with phase('allocate'):
+                cnf_builder = builder(clauses=clauses, xors=[] if options.xor else None)
+                factor_1, factor_2 = FactoringSat.__allocate_factors(len(bin_number), cnf_builder)
+        else:
+            with phase('template'):
+                template = templates.get(
+                    key, lambda: FactoringSat.__create_template(len(bin_number), multiply, options.xor, builder)
+                )
+                factor_1, factor_2 = list(template.factor_1), list(template.factor_2)
+
+        if isinstance(clauses, (DimacsSink, CountingSink)):
+            # The comments only depend on the factors, hence they can be written upfront
+            header = FactoringSat(
+                number, factor_1, factor_2, CNF(0, clauses), generator,
+                polarity=options.polarity, parallel_depth=options.parallel_depth
+            )
+            clauses.write_comments(header.comments())
+
+        with phase('circuit'):
+            if templates is None and options.parallel_depth is None:
+                fact_result = strategy.is_factorization(
+                    cast(List[Symbol], factor_1),
+                    cast(List[Symbol], factor_2),
+                    cast(List[Symbol], bin_number),
+                    cnf_builder
+                )
+            elif templates is None:
+                product = multiply(cast(List[Symbol], factor_1), cast(List[Symbol], factor_2), cnf_builder)
+                fact_result = strategy.n_bit_equality(product, cast(List[Symbol], bin_number), cnf_builder)
+            else:
+                cnf_builder = template.instantiate(clauses, builder)
+                fact_result = strategy.n_bit_equality(template.result, cast(List[Symbol], bin_number), cnf_builder)
+
+            strategy.expect_one(fact_result, cnf_builder)
+
+        with phase('build'):
+            if isinstance(clauses, (DimacsSink, CountingSink)):
+                clauses.close(cnf_builder.number_of_variables)
+
+            cnf = cnf_builder.build()
+            if options.xor:
+                cnf.xors = merge_chains(cnf.xors, cnf.clauses, keep=factor_1 + factor_2)
+
+            result = FactoringSat(
+                number=number,
+                factor_1=factor_1,
+                factor_2=factor_2,
+                cnf=cnf,
+                generator=generator,
+                xor=options.xor,
+                polarity=options.polarity,
+                parallel_depth=options.parallel_depth
+            )
+
+        if options.simplify:
+            with phase('simplify'):
+                result = result.simplify()
+
+        if options.ordering is not None:
+            with phase('order'):
+                result = result.order(renumber=options.ordering == BFS)
+
+        if cache is not None:
+            with phase('cache'):
+                cache.put(cache_key, result)
+
+        if file is not None and not isinstance(clauses, DimacsSink):
+            with phase('write'):
+                FactoringSat.__write_dimacs(result, file)
+
+        if stats is not None:
+            stats.result(result.cnf.number_of_variables, len(result.cnf.clauses))
+
+        return result
+
+    @staticmethod
+    def __write_dimacs(result: FactoringSat, file: TextIO) -> None:
+        sink = DimacsSink(file, result.comments())
+        sink.update(result.cnf.clauses)
+        sink.update_xors(result.cnf.xors)
+        sink.close(result.cnf.number_of_variables)
+
+    @staticmethod
+    def __allocate_factors(number_length: int, cnf_builder: CNFBuilder) -> Tuple[List[Variable], List[Variable]]:
+        factor_length_1, factor_length_2 = FactoringSat.__factor_lengths(number_length)
+
+        factor_1 = cnf_builder.next_variables(factor_length_1)
+        factor_2 = cnf_builder.next_variables(factor_length_2)
+
+        return factor_1, factor_2
+
+    @staticmethod
+    def __template_key(number_length: int, strategy: SymFacStrategy, options: EncodingOptions) -> Hashable:
+        # Strategies are configured by class attributes, which may be overwritten per instance
+        configuration = tuple(sorted(vars(strategy).items()))
+        return number_length, type(strategy), configuration, options.circuit_options(), FactoringSat.VERSION
+
+    @staticmethod
+    def __create_template(
+            number_length: int,
+            multiply: Callable[[List[Symbol], List[Symbol], CNFBuilder], List[Symbol]],
+            xor: bool = False,
+            builder: Callable[..., CNFBuilder] = CNFBuilder
+    ) -> CircuitTemplate:
+        recorder = ClauseRecorder()
+        cnf_builder = builder(clauses=recorder, xors=[] if xor else None)
+        factor_1, factor_2 = FactoringSat.__allocate_factors(number_length, cnf_builder)
+
+        result = multiply(
+            cast(List[Symbol], factor_1),
+            cast(List[Symbol], factor_2),
+            cnf_builder
         )
 
+        return CircuitTemplate.create(cnf_builder, recorder, factor_1, factor_2, result)
+
     @staticmethod
     def __factor_lengths(number_length: int) -> Tuple[int, int]:
         factor_length_1 = math.ceil(number_length / 2)
@@ -132,6 +572,53 @@ class FactoringSat:
 
         return factor_length_1, factor_length_2
 
+    def simplify(self) -> FactoringSat:
+        """
+        Simplify the CNF by unit propagation and renumber the variables densely
+        (see gen_factor_sat.formula.simplify). The variables of the factors are
+        kept and renumbered first.
+
+        :return: the simplified factoring instance
+        """
+        simplification = simplify_cnf(self.cnf, keep=self.factor_1 + self.factor_2)
+
+        return FactoringSat(
+            number=self.number,
+            factor_1=cast(List[Variable], simplification.map_variables(self.factor_1)),
+            factor_2=cast(List[Variable], simplification.map_variables(self.factor_2)),
+            cnf=simplification.cnf,
+            generator=self.generator,
+            simplified=True,
+            xor=self.xor,
+            polarity=self.polarity,
+            ordering=self.ordering,
+            parallel_depth=self.parallel_depth
+        )
+
+    def order(self, renumber: bool = False) -> FactoringSat:
+        """
+        Order the clauses topologically and optionally renumber the variables
+        by a breadth-first search from the factors (see
+        gen_factor_sat.formula.ordering). The factors keep the first variables.
+
+        :param renumber: whether the variables should be renumbered
+        :return: the ordered factoring instance
+        """
+        ordering = order_cnf(self.cnf, inputs=self.factor_1 + self.factor_2, renumber=renumber)
+
+        return FactoringSat(
+            number=self.number,
+            factor_1=ordering.map_variables(self.factor_1),
+            factor_2=ordering.map_variables(self.factor_2),
+            cnf=ordering.cnf,
+            generator=self.generator,
+            simplified=self.simplified,
+            xor=self.xor,
+            polarity=self.polarity,
+            ordering=BFS if renumber else TOPOLOGICAL,
+            parallel_depth=self.parallel_depth
+        )
+
     def to_dimacs(self) -> str:
         """
         Encode this factoring instance into DIMACS. The comments includes
@@ -140,6 +627,15 @@ class FactoringSat:
 
         :return: the resulting DIMACS
         """
+        return self.cnf.to_dimacs(comments=self.comments())
+
+    def comments(self) -> List[str]:
+        """
+        Describe this factoring instance. This includes instructions to
+        reproduce these results and the variables encoding the factors.
+
+        :return: the comment lines
+        """
         comments = []
         comments.append('GenFactorSat v{0}'.format(FactoringSat.VERSION))
 
@@ -168,7 +664,22 @@ class FactoringSat:
         encoding = 'All numbers are encoded with [msb, ..., lsb]'
         comments.extend([number, factor_1, factor_2, encoding])
 
-        return self.cnf.to_dimacs(comments=comments)
+        return comments
+
+    @property
+    def options(self) -> EncodingOptions:
+        """
+        The options this instance was encoded with.
+
+        :return: the encoding options
+        """
+        return EncodingOptions(
+            simplify=self.simplified,
+            xor=self.xor,
+            polarity=self.polarity,
+            ordering=self.ordering,
+            parallel_depth=self.parallel_depth
+        )
 
     def reproduce_command(self) -> str:
         """
@@ -176,6 +687,8 @@ class FactoringSat:
 
         :return: the command
         """
+        options = self.options.arguments()
+
         if self.generator:
             command = 'gen_factor_sat random'
             seed_opt = '--seed {0}'.format(self.generator.seed)
@@ -189,6 +702,78 @@ class FactoringSat:
                 v_unknown=None
             )
 
-            return ' '.join(filter(bool, [command, number_type_opt, seed_opt, min_value_opt, max_value_arg]))
+            return ' '.join(filter(bool, [command, number_type_opt, seed_opt, min_value_opt, *options, max_value_arg]))
         else:
-            return 'gen_factor_sat number {0}'.format(self.number.value)
+            return ' '.join(['gen_factor_sat number', *options, str(self.number.value)])
+
+
+@dataclass
+class IncrementalFactoringSat:
+    """
+    The factoring of several numbers of the same length encoded into a single
+    incremental CNF. The CNF encodes that the product of the factors equals
+    the number variables. Each number is queried by assuming the values of
+    its bits for the number variables.
+    """
+    numbers: List[Number]
+    factor_1: List[Variable]
+    factor_2: List[Variable]
+    number_variables: List[Variable]
+    cnf: CNF
+
+    def assumptions(self, number: int) -> List[int]:
+        """
+        Create the assumptions that fix the number variables to the number.
+
+        :param number: the number to be queried
+        :return: the assumed literals
+        """
+        bits = utils.to_bin_list(number)
+        if len(bits) != len(self.number_variables):
+            raise ValueError('The number must have {0} bits'.format(len(self.number_variables)))
+
+        return [x if bit == '1' else -x for x, bit in zip(self.number_variables, bits)]
+
+    def to_icnf(self) -> str:
+        """
+        Encode these factoring instances into the iCNF format. The clauses are
+        followed by one assumption block per number, in the order of the numbers.
+
+        :return: the resulting iCNF
+        """
+        lines = ['c {0}'.format(comment) for comment in self.comments()]
+        lines.append('p inccnf')
+        lines.extend(map(CNF.clause_to_dimacs, self.cnf.clauses))
+        lines.extend(
+            ' '.join(['a'] + list(map(str, self.assumptions(number.value))) + ['0'])
+            for number in self.numbers
+        )
+
+        return '\n'.join(lines)
+
+    def comments(self) -> List[str]:
+        """
+        Describe these factoring instances. This includes instructions to
+        reproduce these results, the variables encoding the factors and
+        the numbers in the order of their assumption blocks.
+
+        :return: the comment lines
+        """
+        reproduce = ' '.join(['gen_factor_sat numbers'] + [str(number.value) for number in self.numbers])
+
+        comments = [
+            'GenFactorSat v{0}'.format(FactoringSat.VERSION),
+            'To reproduce this results call: ' + reproduce,
+            '',
+            'Factorization of {0} numbers with {1} bits, one assumption block per number:'.format(
+                len(self.numbers), len(self.number_variables)
+            )
+        ]
+
+        comments.extend('{0}: {1}'.format(index, number.value) for index, number in enumerate(self.numbers, 1))
+        comments.append('Factor 1 is encoded in the variables: {0}'.format(self.factor_1))
+        comments.append('Factor 2 is encoded in the variables: {0}'.format(self.factor_2))
+        comments.append('The number is encoded in the variables: {0}'.format(self.number_variables))
+        comments.append('All numbers are encoded with [msb, ..., lsb]')
+
+        return comments
@@ -0,0 +1,164 @@
+"""
+Clause store
+
+A memory efficient representation of a set of clauses.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, Iterator, Tuple
+
+StoredClause = Tuple[int, ...]
+
+
+class ClauseStore:
+    """
+    Stores clauses in flat typed buffers instead of a set of frozensets. The
+    literals of all clauses are kept in a single literal buffer, and an offset
+    buffer marks where each clause starts. Duplicates are detected with an
+    open addressing table of clause indices that is probed with a hash of the
+    packed literals. Tautologies are filtered as clauses are added. Hence, the
+    store already contains the final clauses and never has to be copied.
+
+    The literals of every clause are sorted, i.e. clauses are returned as sorted
+    tuples. Clauses are kept in insertion order.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.literals = array('i')
+        self.offsets = array('q', [0])
+
+        self._bits = max(1, (2 * capacity - 1).bit_length())
+        self._table = array('i', bytes(4 << self._bits))
+        self._mask = (1 << self._bits) - 1
+
+    def add(self, clause: Iterable[int]) -> bool:
+        """
+        Add the clause unless it is a tautology or already contained in the store.
+
+        :param clause: the clause to be added
+        :return: true if the clause was added, otherwise false
+        """
+        literals = sorted(set(clause))
+        if any(-literal in literals for literal in literals if literal < 0):
+            return False
+
+        slot = self._find(literals)
+        if self._table[slot] != 0:
+            return False
+
+        self.literals.extend(literals)
+        self.offsets.append(len(self.literals))
+        self._table[slot] = len(self)
+
+        if 2 * len(self) > self._mask:
+            self._grow()
+
+        return True
+
+    def update(self, clauses: Iterable[Iterable[int]]) -> None:
+        """
+        Add all specified clauses. See add.
+
+        :param clauses: the clauses to be added
+        :return: None
+        """
+        for clause in clauses:
+            self.add(clause)
+
+    def clause(self, index: int) -> StoredClause:
+        """
+        Get the clause with the specified index.
+
+        :param index: the index of the clause
+        :return: the literals of the clause
+        """
+        return tuple(self.literals[self.offsets[index]:self.offsets[index + 1]])
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The number of bytes occupied by the buffers of this store.
+
+        :return: the size of the buffers in bytes
+        """
+        return sum(buffer.itemsize * len(buffer) for buffer in (self.literals, self.offsets, self._table))
+
+    @staticmethod
+    def estimate_nbytes(number_of_clauses: int, number_of_literals: int, capacity: int = 1024) -> int:
+        """
+        Determine the number of bytes occupied by the buffers of a store
+        containing the specified number of clauses and literals.
+
+        :param number_of_clauses: the number of clauses
+        :param number_of_literals: the total length of the clauses
+        :param capacity: the initial capacity of the store
+        :return: the size of the buffers in bytes
+        """
+        bits = max(1, (2 * capacity - 1).bit_length())
+        while 2 * number_of_clauses > (1 << bits) - 1:
+            bits += 1
+
+        return 4 * number_of_literals + 8 * (number_of_clauses + 1) + (4 << bits)
+
+    def _find(self, literals: list) -> int:
+        table, offsets, stored = self._table, self.offsets, self.literals
+        size, first = len(literals), literals[0] if literals else 0
+
+        slot = _slot(literals, self._bits)
+        while True:
+            index = table[slot]
+            if index == 0:
+                return slot
+
+            start, end = offsets[index - 1], offsets[index]
+            if end - start == size and (size == 0 or stored[start] == first) \
+                    and stored[start:end].tolist() == literals:
+                return slot
+
+            slot = (slot + 1) & self._mask
+
+    def _grow(self) -> None:
+        self._bits += 1
+        self._table = array('i', bytes(4 << self._bits))
+        self._mask = (1 << self._bits) - 1
+
+        for index in range(len(self)):
+            slot = _slot(self.clause(index), self._bits)
+            while self._table[slot] != 0:
+                slot = (slot + 1) & self._mask
+
+            self._table[slot] = index + 1
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[StoredClause]:
+        return map(self.clause, range(len(self)))
+
+    def __contains__(self, clause) -> bool:
+        literals = sorted(set(clause))
+        return self._table[self._find(literals)] != 0
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ClauseStore, set, frozenset)):
+            return len(self) == len(other) and all(clause in self for clause in other)
+        else:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return 'ClauseStore({0} clauses, {1} literals)'.format(len(self), len(self.literals))
+
+
+def _pack(literals: Iterable[int]) -> int:
+    # Each literal occupies 32 bits. As no literal is zero, the packing is injective.
+    key = 0
+    for literal in literals:
+        key = (key << 32) | (literal & 0xFFFFFFFF)
+
+    return key
+
+
+def _slot(literals: Iterable[int], bits: int) -> int:
+    # Fibonacci hashing spreads the clustered keys of neighbouring gates over the table
+    return ((hash(_pack(literals)) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - bits)
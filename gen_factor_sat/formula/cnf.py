@@ -5,19 +5,30 @@ Representations of a CNF.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Set, FrozenSet
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set, FrozenSet, Tuple, Union, Optional, TYPE_CHECKING
 
+from gen_factor_sat.formula.clause_store import ClauseStore
 from gen_factor_sat.formula.symbol import Variable, variable
+from gen_factor_sat.formula.xor import XorConstraint
+
+if TYPE_CHECKING:
+    from gen_factor_sat.formula.sink import CountingSink, DimacsSink
 
 Clause = FrozenSet[int]
+Clauses = Union[Set[Clause], List[Tuple[int, ...]], ClauseStore, 'DimacsSink', 'CountingSink']
 
 
 @dataclass()
 class CNF:
-    """Represents a CNF formula"""
+    """
+    Represents a CNF formula. Optionally, the formula contains XOR
+    constraints, which are written in the extended DIMACS format. A list of
+    clauses is used for ordered formulas (see gen_factor_sat.formula.ordering).
+    """
     number_of_variables: int
-    clauses: Set[Clause]
+    clauses: Clauses
+    xors: List[XorConstraint] = field(default_factory=list)
 
     def to_dimacs(self: CNF, comments: List[str] = None) -> str:
         """
@@ -34,12 +45,24 @@ class CNF:
             prefixed_comments = list(map('c {0}'.format, comments))
             comment_lines = '\n'.join(prefixed_comments) + '\n'
 
-        problem = 'p cnf {0} {1}'.format(self.number_of_variables, len(self.clauses))
+        problem = CNF.problem_line(self.number_of_variables, len(self.clauses) + len(self.xors))
         dimacs_clauses = list(map(CNF.clause_to_dimacs, self.clauses))
-        cnf_lines = '\n'.join([problem] + dimacs_clauses)
+        dimacs_xors = [xor.to_dimacs() for xor in self.xors]
+        cnf_lines = '\n'.join([problem] + dimacs_clauses + dimacs_xors)
 
         return comment_lines + cnf_lines
 
+    @staticmethod
+    def problem_line(number_of_variables: int, number_of_clauses: int) -> str:
+        """
+        Create the DIMACS problem line.
+
+        :param number_of_variables: the number of variables of the CNF
+        :param number_of_clauses: the number of clauses of the CNF
+        :return: the problem line
+        """
+        return 'p cnf {0} {1}'.format(number_of_variables, number_of_clauses)
+
     @staticmethod
     def clause_to_dimacs(clause: Clause) -> str:
         """
@@ -55,33 +78,122 @@ class CNF:
 
 
 class CNFBuilder:
-    """Helper class to construct a CNF formula"""
+    """
+    Helper class to construct a CNF formula. By default, the clauses are
+    collected in a set. Alternatively, a ClauseStore can be provided to
+    reduce the memory footprint of large formulas, or a DimacsSink to write
+    the clauses directly to a file.
+
+    If a list of XOR constraints is provided, XOR-Gates can be encoded as
+    native XOR constraints (see from_xor) instead of clauses.
 
-    def __init__(self, number_of_variables=0):
+    If the polarity flag is set, the Plaisted-Greenbaum encoding is used:
+    The clauses of a gate are deferred until its output occurs in an added
+    clause. Then, only the implications required by the polarity of the
+    occurrence are added, i.e. the clauses containing the negated literal of
+    the occurrence. Their inputs are required recursively. Gates that are
+    never used do not add any clauses. The result is equisatisfiable and each
+    model assigns the inputs of the circuit consistently, but the outputs of
+    the gates may deviate from their actual value.
+    """
+
+    def __init__(
+            self,
+            number_of_variables=0,
+            clauses: Optional[Clauses] = None,
+            xors: Optional[List[XorConstraint]] = None,
+            polarity: bool = False
+    ):
         self.number_of_variables = number_of_variables
-        self.clauses = set()
+        self.clauses = set() if clauses is None else clauses
+        self.xors = xors
+        self.gates = {}
+        self.definitions: Optional[Dict[Variable, Set[Clause]]] = {} if polarity else None
+        self.required: Set[int] = set()
 
     def build(self) -> CNF:
         """
         Convert the aggregated clauses into a CNF formula.
-        This removes duplicate clauses and clauses that are tautologies.
+        The formula contains neither duplicates nor tautologies.
 
         :return: the CNF formula
         """
-        return CNF(self.number_of_variables, self.build_clauses())
+        xors = [] if self.xors is None else list(self.xors)
+        return CNF(self.number_of_variables, self.build_clauses(), xors)
 
-    def build_clauses(self) -> Set[Clause]:
+    def build_clauses(self) -> Clauses:
         """
-        Remove duplicate clauses and tautologies.
+        Get the clauses without duplicates and tautologies. All containers
+        filter the clauses on insertion. A set of clauses is copied, while
+        alternative containers like the ClauseStore are returned without
+        copying them.
 
         :return: the filtered clauses
         """
-        return set(filter(is_no_tautology, self.clauses))
+        if isinstance(self.clauses, set):
+            return set(self.clauses)
+        else:
+            return self.clauses
 
     def from_tseitin(self, tseitin_transformation, *args) -> Variable:
         output = self.next_variable()
         clauses = tseitin_transformation(*args, output)
-        self.add_clauses(clauses)
+
+        if self.definitions is None:
+            self.add_clauses(clauses)
+        else:
+            self.definitions[output] = clauses
+
+        return output
+
+    def from_cached_tseitin(self, key, tseitin_transformation, *args) -> Variable:
+        """
+        Encode the gate like from_tseitin unless a gate with the same key was
+        already encoded. In this case, the output of the existing gate is reused
+        and no variables or clauses are added.
+
+        :param key: a hashable description of the gate and its inputs
+        :param tseitin_transformation: the encoding of the gate
+        :param args: the inputs of the gate
+        :return: the output of the gate
+        """
+        output = self.gates.get(key)
+        if output is None:
+            output = self.from_tseitin(tseitin_transformation, *args)
+            self.gates[key] = output
+
+        return output
+
+    def from_xor(self, *inputs: Variable) -> Variable:
+        """
+        Encode an XOR-Gate with any number of inputs as XOR constraint.
+        Requires that the builder collects XOR constraints.
+
+        :param inputs: the inputs of the XOR-Gate
+        :return: the output of the gate
+        """
+        if self.definitions is not None:
+            # XOR constraints are always added, hence they use their inputs with both polarities
+            self.require([literal for x in inputs for literal in (x, -x)])
+
+        output = self.next_variable()
+        self.xors.append(XorConstraint.of(list(inputs) + [output], parity=False))
+        return output
+
+    def from_cached_xor(self, key, *inputs: Variable) -> Variable:
+        """
+        Encode the XOR-Gate like from_xor unless a gate with the same key
+        was already encoded (see from_cached_tseitin).
+
+        :param key: a hashable description of the gate and its inputs
+        :param inputs: the inputs of the XOR-Gate
+        :return: the output of the gate
+        """
+        output = self.gates.get(key)
+        if output is None:
+            output = self.from_xor(*inputs)
+            self.gates[key] = output
+
         return output
 
     def next_variables(self, amount: int) -> List[Variable]:
@@ -106,15 +218,64 @@ class CNFBuilder:
         self.number_of_variables += 1
         return variable(self.number_of_variables)
 
-    def add_clauses(self, clauses: Set[Clause]) -> None:
+    def add_clauses(self, clauses: Iterable[Clause]) -> None:
         """
         Add the specified clauses to the set of clauses that will be considered when
-        building a CNF.
+        building a CNF. Tautologies are discarded. In the Plaisted-Greenbaum
+        encoding, the gates whose outputs occur in the clauses are added as well
+        (see require).
 
         :param clauses: the clauses to be added
         :return: None
         """
-        self.clauses.update(clauses)
+        if self.definitions is not None:
+            clauses = tuple(clauses)
+            self.require([literal for clause in clauses for literal in clause])
+
+        self.write_clauses(clauses)
+
+    def require(self, literals: Iterable[int]) -> None:
+        """
+        Add the deferred clauses of the gates whose outputs are used with the
+        polarity of the specified literals. A positive literal requires that
+        the output implies the gate, while a negative literal requires the
+        converse implication. The inputs of the gates are required recursively.
+        Each polarity of a gate is added at most once.
+
+        :param literals: the literals whose polarity is required
+        :return: None
+        """
+        required = self.required
+        implications = []
+
+        pending = [literal for literal in literals if literal not in required]
+        while pending:
+            literal = pending.pop()
+            if literal in required:
+                continue
+
+            required.add(literal)
+            definition = self.definitions.get(abs(literal))
+            if definition is not None:
+                for clause in definition:
+                    if -literal in clause:
+                        implications.append(clause)
+                        pending.extend(x for x in clause if x != -literal and x not in required)
+
+        self.write_clauses(implications)
+
+    def write_clauses(self, clauses: Iterable[Clause]) -> None:
+        """
+        Write the specified clauses to the container without considering the
+        deferred gates. Tautologies are discarded.
+
+        :param clauses: the clauses to be written
+        :return: None
+        """
+        if isinstance(self.clauses, set):
+            self.clauses.update(filter(is_no_tautology, clauses))
+        else:
+            self.clauses.update(clauses)
 
 
 def is_no_tautology(clause: Clause) -> bool:
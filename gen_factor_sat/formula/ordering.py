@@ -0,0 +1,143 @@
+"""
+Ordering
+
+Deterministic orders of the clauses and variables of a CNF. By default, the
+order of the clauses depends on the container, e.g. the hash order of a set.
+Ordering the clauses groups them by gate and makes the DIMACS reproducible
+byte by byte, which improves its compression and allows diffing instances.
+"""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from gen_factor_sat.formula.clause_store import ClauseStore
+from gen_factor_sat.formula.cnf import CNF, Clauses
+from gen_factor_sat.formula.sink import DimacsSink
+from gen_factor_sat.formula.symbol import Variable, variable
+from gen_factor_sat.formula.xor import XorConstraint
+
+TOPOLOGICAL = 'topological'
+BFS = 'bfs'
+ORDERS = [TOPOLOGICAL, BFS]
+
+
+@dataclass()
+class Ordering:
+    """
+    The result of ordering a CNF. The mapping assigns each variable of the
+    original CNF its new variable.
+    """
+    cnf: CNF
+    mapping: Dict[Variable, Variable]
+
+    def map_variables(self, variables: Iterable[Variable]) -> List[Variable]:
+        """
+        Translate the specified variables of the original CNF.
+
+        :param variables: the variables of the original CNF
+        :return: the corresponding variables of the ordered CNF
+        """
+        return [self.mapping[x] for x in variables]
+
+
+def order(cnf: CNF, inputs: Sequence[Variable] = (), renumber: bool = False) -> Ordering:
+    """
+    Order the clauses of the CNF topologically. As the output of a gate is
+    allocated after its inputs, it is the largest variable of the clauses
+    encoding the gate. Hence, sorting the clauses by their largest variable
+    groups them by gate in the order in which the circuit was built. Ties
+    are broken by the sorted literals, such that the order does not depend
+    on the container of the clauses. XOR constraints are ordered likewise.
+
+    If the renumber flag is set, the variables are renumbered in the order
+    of a breadth-first search from the inputs, such that neighbouring gates
+    get nearby variables. The inputs are numbered first, in the specified
+    order. Variables that are not reachable from the inputs are numbered
+    last, in their original order. The order of the clauses is kept.
+
+    The ordered clauses are stored in a list of sorted tuples, or in a
+    ClauseStore if the CNF is compact. Both keep the clauses in order.
+
+    :param cnf: the CNF to be ordered
+    :param inputs: the variables from which the search starts
+    :param renumber: whether the variables should be renumbered
+    :return: the ordered CNF and the mapping of the variables
+    :raises ValueError if the clauses were written to a DimacsSink
+    """
+    if isinstance(cnf.clauses, DimacsSink):
+        raise ValueError('The clauses were already written and cannot be ordered')
+
+    clauses = _topological(cnf.number_of_variables, (tuple(sorted(clause)) for clause in cnf.clauses))
+    xor_variables = _topological(cnf.number_of_variables, (tuple(sorted(xor.variables)) for xor in cnf.xors))
+    parities = {xor.variables: xor.parity for xor in cnf.xors}
+    xors = [XorConstraint(frozenset(variables), parities[frozenset(variables)]) for variables in xor_variables]
+
+    if renumber:
+        mapping = _breadth_first(cnf.number_of_variables, inputs, clauses, xors)
+    else:
+        mapping = {x: variable(x) for x in range(1, cnf.number_of_variables + 1)}
+
+    if renumber:
+        clauses = [tuple(sorted(_map_literal(mapping, literal) for literal in clause)) for clause in clauses]
+
+    ordered_clauses: Clauses = clauses
+    if isinstance(cnf.clauses, ClauseStore):
+        # The clauses are already unique, but the ClauseStore requires less memory
+        ordered_clauses = ClauseStore(len(clauses))
+        ordered_clauses.update(clauses)
+
+    ordered_xors = [
+        XorConstraint(frozenset(mapping[x] for x in xor.variables), xor.parity)
+        for xor in xors
+    ]
+
+    return Ordering(CNF(cnf.number_of_variables, ordered_clauses, ordered_xors), mapping)
+
+
+def _topological(number_of_variables: int, clauses: Iterable[Tuple[int, ...]]) -> List[Tuple[int, ...]]:
+    # Bucket sort by the largest variable, only the clauses of a gate have to be compared
+    buckets: List[List[Tuple[int, ...]]] = [[] for _ in range(number_of_variables + 1)]
+    for clause in clauses:
+        buckets[max(abs(clause[0]), abs(clause[-1])) if clause else 0].append(clause)
+
+    return [clause for bucket in buckets for clause in sorted(bucket)]
+
+
+def _breadth_first(
+        number_of_variables: int,
+        inputs: Sequence[Variable],
+        clauses: List[Tuple[int, ...]],
+        xors: List[XorConstraint]
+) -> Dict[Variable, Variable]:
+    # Variables are adjacent if they share a clause or an XOR constraint
+    constraints = clauses + [tuple(sorted(xor.variables)) for xor in xors]
+    occurrences: List[List[int]] = [[] for _ in range(number_of_variables + 1)]
+    for index, literals in enumerate(constraints):
+        for literal in literals:
+            occurrences[abs(literal)].append(index)
+
+    visited = [False] * len(constraints)
+    numbering = list(dict.fromkeys(inputs))
+    numbered = set(numbering)
+
+    queue = deque(numbering)
+    while queue:
+        x = queue.popleft()
+        for index in occurrences[x]:
+            if not visited[index]:
+                visited[index] = True
+                for literal in constraints[index]:
+                    y = abs(literal)
+                    if y not in numbered:
+                        numbered.add(y)
+                        numbering.append(y)
+                        queue.append(y)
+
+    numbering.extend(x for x in range(1, number_of_variables + 1) if x not in numbered)
+    return {x: variable(index) for index, x in enumerate(numbering, start=1)}
+
+
+def _map_literal(mapping: Dict[Variable, Variable], literal: int) -> int:
+    return mapping[literal] if literal > 0 else -mapping[-literal]
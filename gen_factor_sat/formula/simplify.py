@@ -0,0 +1,166 @@
+"""
+Simplification
+
+Unit propagation and compaction of the variables of a CNF.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from gen_factor_sat.formula.clause_store import ClauseStore
+from gen_factor_sat.formula.cnf import CNF, Clauses
+from gen_factor_sat.formula.sink import DimacsSink
+from gen_factor_sat.formula.symbol import Symbol, Variable, constant, variable
+from gen_factor_sat.formula.xor import XorConstraint
+
+Assignment = Dict[int, bool]
+
+
+@dataclass()
+class Simplification:
+    """
+    The result of simplifying a CNF. The mapping assigns each variable of the
+    original CNF that still matters either its new variable or the constant
+    it was fixed to. Variables that no longer occur are not mapped.
+    """
+    cnf: CNF
+    mapping: Dict[Variable, Symbol]
+
+    def map_variables(self, variables: Iterable[Variable]) -> List[Symbol]:
+        """
+        Translate the specified variables of the original CNF.
+
+        :param variables: the variables of the original CNF
+        :return: the corresponding variables or constants of the simplified CNF
+        """
+        return [self.mapping[x] for x in variables]
+
+
+def simplify(cnf: CNF, keep: Sequence[Variable] = ()) -> Simplification:
+    """
+    Simplify the CNF by unit propagation. Units are propagated until a fixpoint
+    is reached. Afterwards, satisfied clauses are removed, false literals are
+    removed from the remaining clauses and the remaining variables are densely
+    renumbered. The resulting CNF is satisfiable iff the original one is.
+
+    The variables to keep are never eliminated and are numbered first, in the
+    specified order. If such a variable is fixed by the propagation, its value
+    is kept as a unit clause. If the propagation leads to a conflict, the
+    result only contains the empty clause.
+
+    XOR constraints do not take part in the propagation, but the fixed
+    variables are removed from them and they are renumbered accordingly.
+
+    :param cnf: the CNF to be simplified
+    :param keep: the variables that must remain in the CNF
+    :return: the simplified CNF and the mapping of the variables
+    :raises ValueError if the clauses were written to a DimacsSink
+    """
+    if isinstance(cnf.clauses, DimacsSink):
+        raise ValueError('Clauses written to a sink cannot be simplified')
+
+    clauses = [tuple(clause) for clause in cnf.clauses]
+    assignment = propagate_units(clauses)
+
+    xors = [] if assignment is None else [xor.assign(assignment) for xor in cnf.xors]
+    if assignment is None or any(not xor.variables and xor.parity for xor in xors):
+        remaining = [()]
+        assignment = {}
+        xors = []
+    else:
+        remaining = [
+            tuple(literal for literal in clause if abs(literal) not in assignment)
+            for clause in clauses
+            if not any(assignment.get(abs(literal)) == (literal > 0) for literal in clause)
+        ]
+        xors = [xor for xor in xors if xor.variables]
+
+    mapping: Dict[Variable, Symbol] = {}
+    for x in keep:
+        mapping[x] = variable(len(mapping) + 1)
+
+    occurring = {abs(literal) for clause in remaining for literal in clause}
+    occurring.update(x for xor in xors for x in xor.variables)
+    for x in sorted(occurring):
+        if x not in mapping:
+            mapping[variable(x)] = variable(len(mapping) + 1)
+
+    number_of_variables = len(mapping)
+
+    units = [(x if assignment[x] else -x,) for x in keep if x in assignment]
+    simplified = [
+        tuple(mapping[abs(literal)] if literal > 0 else -mapping[abs(literal)] for literal in clause)
+        for clause in units + remaining
+    ]
+
+    simplified_xors = [
+        XorConstraint(frozenset(mapping[x] for x in xor.variables), xor.parity)
+        for xor in xors
+    ]
+
+    for x, value in assignment.items():
+        if x not in mapping:
+            mapping[variable(x)] = constant('1' if value else '0')
+
+    return Simplification(
+        CNF(number_of_variables, _container(cnf.clauses, simplified), simplified_xors),
+        mapping
+    )
+
+
+def propagate_units(clauses: List[Tuple[int, ...]]) -> Optional[Assignment]:
+    """
+    Propagate all unit clauses until a fixpoint is reached.
+
+    :param clauses: the clauses
+    :return: the value of all fixed variables or None if a conflict occurs
+    """
+    if any(not clause for clause in clauses):
+        return None
+
+    occurrences = defaultdict(list)
+    for index, clause in enumerate(clauses):
+        for literal in clause:
+            occurrences[literal].append(index)
+
+    unassigned = [len(clause) for clause in clauses]
+    satisfied = bytearray(len(clauses))
+    assignment: Assignment = {}
+
+    units = [clause[0] for clause in clauses if len(clause) == 1]
+    while units:
+        literal = units.pop()
+        value = literal > 0
+        if abs(literal) in assignment:
+            if assignment[abs(literal)] != value:
+                return None
+
+            continue
+
+        assignment[abs(literal)] = value
+        for index in occurrences.get(literal, ()):
+            satisfied[index] = 1
+
+        for index in occurrences.get(-literal, ()):
+            if satisfied[index]:
+                continue
+
+            unassigned[index] -= 1
+            if unassigned[index] == 0:
+                return None
+            elif unassigned[index] == 1:
+                units.extend(x for x in clauses[index] if abs(x) not in assignment)
+
+    return assignment
+
+
+def _container(original: Clauses, clauses: List[Tuple[int, ...]]) -> Clauses:
+    # Use the same kind of container as the original CNF
+    if isinstance(original, ClauseStore):
+        store = ClauseStore()
+        store.update(clauses)
+        return store
+    else:
+        return set(map(frozenset, clauses))
@@ -0,0 +1,357 @@
+"""
+Clause sinks
+
+Consumers that process clauses as they are created instead of storing them.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from gen_factor_sat.formula.cnf import CNF, Clause, is_no_tautology
+from gen_factor_sat.formula.xor import XorConstraint
+
+
+class DimacsSink:
+    """
+    Writes clauses in the DIMACS format directly to a file while the CNF is
+    built. The clauses are buffered and written in chunks. As the number of
+    variables and clauses is only known at the end, the clauses are spooled
+    and appended behind the problem line when the sink is closed (see Spool).
+    Overwriting a reserved problem line in place would leave padding in the
+    file and fail for files opened in append mode. A file may provide its own
+    spool by a method spool(), otherwise a TemporarySpool is used.
+
+    Tautologies are removed. Duplicates are only removed within a single
+    update, i.e. within the clauses of a gate.
+    """
+    COPY_SIZE = 2 ** 20
+
+    def __init__(self, file: TextIO, comments: Optional[List[str]] = None, chunk_size: int = 2 ** 12):
+        self.file = file
+        self.comments = [] if comments is None else comments
+        self.chunk_size = chunk_size
+        self.number_of_clauses = 0
+
+        self._chunk: List[str] = []
+        self._output: Optional[Spool] = None
+
+    def write_comments(self, comments: List[str]) -> None:
+        """
+        Add comments that are written at the beginning of the file.
+        Comments must be added before the first clause.
+
+        :param comments: the comment lines without line breaks
+        :return: None
+        :raises ValueError if clauses were already written
+        """
+        if self._output is not None:
+            raise ValueError('Comments must be written before the first clause')
+
+        self.comments.extend(comments)
+
+    def add(self, clause: Clause) -> None:
+        """
+        Write the clause unless it is a tautology.
+
+        :param clause: the clause to be written
+        :return: None
+        """
+        if is_no_tautology(clause):
+            self._chunk.append(CNF.clause_to_dimacs(clause))
+            self.number_of_clauses += 1
+
+            if len(self._chunk) >= self.chunk_size:
+                self._flush()
+
+    def update(self, clauses: Iterable[Clause]) -> None:
+        """
+        Write all specified clauses. See add.
+
+        :param clauses: the clauses to be written
+        :return: None
+        """
+        for clause in clauses:
+            self.add(clause)
+
+    def write_block(self, text: str, number_of_clauses: int) -> None:
+        """
+        Write clauses that were already converted into DIMACS, e.g. by another
+        process. The clauses must not contain tautologies.
+
+        :param text: the clauses in the DIMACS format, each followed by a line break
+        :param number_of_clauses: the number of clauses in the text
+        :return: None
+        """
+        self._flush()
+        self._output.write(text)
+        self.number_of_clauses += number_of_clauses
+
+    def update_xors(self, xors: Iterable[XorConstraint]) -> None:
+        """
+        Write the XOR constraints in the extended DIMACS format. They are
+        counted as clauses in the problem line.
+
+        :param xors: the XOR constraints to be written
+        :return: None
+        """
+        for xor in xors:
+            self._chunk.append(xor.to_dimacs())
+            self.number_of_clauses += 1
+
+            if len(self._chunk) >= self.chunk_size:
+                self._flush()
+
+    def close(self, number_of_variables: int) -> None:
+        """
+        Write all remaining clauses and the final problem line.
+        The underlying file is not closed.
+
+        :param number_of_variables: the number of variables of the CNF
+        :return: None
+        """
+        self._flush()
+
+        self.file.write(CNF.problem_line(number_of_variables, self.number_of_clauses) + '\n')
+        self._output.append()
+        self.file.flush()
+
+    def _flush(self) -> None:
+        if self._output is None:
+            self._open()
+
+        if self._chunk:
+            self._output.write('\n'.join(self._chunk) + '\n')
+            self._chunk.clear()
+
+    def _open(self) -> None:
+        self.file.writelines('c {0}\n'.format(comment) for comment in self.comments)
+
+        spool = getattr(self.file, 'spool', None)
+        self._output = TemporarySpool(self.file) if spool is None else spool()
+
+    def __len__(self) -> int:
+        return self.number_of_clauses
+
+
+class Spool(ABC):
+    """
+    Stores the clauses of a DimacsSink until the problem line is written.
+    """
+
+    @abstractmethod
+    def write(self, text: str) -> None:
+        """
+        Store the specified text.
+
+        :param text: the clauses in the DIMACS format
+        :return: None
+        """
+        pass
+
+    @abstractmethod
+    def append(self) -> None:
+        """
+        Append the stored text to the file behind everything written so far
+        and release the spool.
+
+        :return: None
+        """
+        pass
+
+
+class TemporarySpool(Spool):
+    """
+    Spools the text to a temporary file, which is copied into the file. If
+    the file has a name, the temporary file is created in the same directory,
+    which usually has more space than the default temporary directory.
+    """
+
+    def __init__(self, file: TextIO):
+        self.file = file
+        self._temporary = tempfile.TemporaryFile(mode='w+', dir=spool_directory(file))
+
+    def write(self, text: str) -> None:
+        self._temporary.write(text)
+
+    def append(self) -> None:
+        self._temporary.seek(0)
+        shutil.copyfileobj(self._temporary, self.file, DimacsSink.COPY_SIZE)
+        self._temporary.close()
+
+
+def spool_directory(file) -> Optional[str]:
+    """
+    Determine the directory for temporary files accompanying the specified
+    file.
+
+    :param file: the file to be accompanied
+    :return: the directory of the file or None if the file has no name, e.g. stdout
+    """
+    name = getattr(file, 'name', None)
+    if isinstance(name, str) and os.path.isfile(name):
+        return os.path.dirname(os.path.abspath(name))
+
+    return None
+
+
+class CountingSink:
+    """
+    Counts clauses instead of storing or writing them. Besides the number of
+    clauses, their lengths and the size of the DIMACS are recorded. Hence,
+    the size of a CNF can be determined in constant memory. As a DimacsSink,
+    the sink removes tautologies, but no duplicates. The size refers to the
+    DIMACS with an unpadded problem line.
+    """
+
+    def __init__(self, comments: Optional[List[str]] = None):
+        self.comments = [] if comments is None else comments
+        self.number_of_variables = 0
+        self.number_of_clauses = 0
+        self.number_of_literals = 0
+        self.number_of_xors = 0
+        self.lengths: Counter = Counter()
+        self.clause_bytes = 0
+
+    def write_comments(self, comments: List[str]) -> None:
+        """
+        Add comments that are counted in the size of the DIMACS.
+
+        :param comments: the comment lines without line breaks
+        :return: None
+        """
+        self.comments.extend(comments)
+
+    def add(self, clause: Clause) -> None:
+        """
+        Count the clause unless it is a tautology.
+
+        :param clause: the clause to be counted
+        :return: None
+        """
+        if is_no_tautology(clause):
+            self.number_of_clauses += 1
+            self.number_of_literals += len(clause)
+            self.lengths[len(clause)] += 1
+            # Each literal is followed by a space, the clause by '0\n'
+            self.clause_bytes += sum(len(str(literal)) for literal in clause) + len(clause) + 2
+
+    def update(self, clauses: Iterable[Clause]) -> None:
+        """
+        Count all specified clauses. See add.
+
+        :param clauses: the clauses to be counted
+        :return: None
+        """
+        for clause in clauses:
+            self.add(clause)
+
+    def update_xors(self, xors: Iterable[XorConstraint]) -> None:
+        """
+        Count the XOR constraints. They are counted as clauses in the problem
+        line, but not by length.
+
+        :param xors: the XOR constraints to be counted
+        :return: None
+        """
+        for xor in xors:
+            self.number_of_clauses += 1
+            self.number_of_xors += 1
+            self.clause_bytes += len(xor.to_dimacs()) + 1
+
+    def close(self, number_of_variables: int) -> None:
+        """
+        Record the final number of variables.
+
+        :param number_of_variables: the number of variables of the CNF
+        :return: None
+        """
+        self.number_of_variables = number_of_variables
+
+    @property
+    def dimacs_bytes(self) -> int:
+        """
+        The size of the DIMACS including the comments and the problem line.
+
+        :return: the number of bytes
+        """
+        problem = CNF.problem_line(self.number_of_variables, self.number_of_clauses)
+        comments = sum(len('c {0}\n'.format(comment)) for comment in self.comments)
+        return comments + len(problem) + 1 + self.clause_bytes
+
+    def __len__(self) -> int:
+        return self.number_of_clauses
+
+
+class ClauseRecorder:
+    """
+    Records clauses in the order in which they are added, including duplicates
+    and tautologies. Replaying the recorded clauses into another container is
+    equivalent to adding the clauses to it directly.
+    """
+
+    def __init__(self):
+        self.clauses: List[Clause] = []
+
+    def add(self, clause: Clause) -> None:
+        """
+        Record the clause.
+
+        :param clause: the clause to be recorded
+        :return: None
+        """
+        self.clauses.append(clause)
+
+    def update(self, clauses: Iterable[Clause]) -> None:
+        """
+        Record all specified clauses.
+
+        :param clauses: the clauses to be recorded
+        :return: None
+        """
+        self.clauses.extend(clauses)
+
+    def __len__(self) -> int:
+        return len(self.clauses)
+
+    def __iter__(self) -> Iterator[Clause]:
+        return iter(self.clauses)
+
+
+class ICNFSink(DimacsSink):
+    """
+    Writes clauses in the incremental iCNF format directly to a file. As the
+    problem line of the format does not contain any counts, the clauses are
+    written without fixing up the header. After the clauses, any number of
+    assumption blocks can be appended, each of which is solved as separate
+    query by an incremental solver.
+    """
+
+    def assume(self, literals: Iterable[int]) -> None:
+        """
+        Write an assumption block. Must be called after all clauses were written.
+
+        :param literals: the assumed literals
+        :return: None
+        """
+        self._flush()
+        self.file.write(' '.join(['a'] + list(map(str, literals)) + ['0']) + '\n')
+
+    def close(self, number_of_variables: int) -> None:
+        """
+        Write all remaining clauses. The underlying file is not closed.
+
+        :param number_of_variables: the number of variables of the CNF (unused)
+        :return: None
+        """
+        self._flush()
+        self.file.flush()
+
+    def _open(self) -> None:
+        self.file.writelines('c {0}\n'.format(comment) for comment in self.comments)
+        self.file.write('p inccnf\n')
+        self._output = self.file
@@ -0,0 +1,177 @@
+"""
+Statistics
+
+Collect statistics about the encoding while it is created, e.g. the number of
+gates by type, the clauses by length and the time spent in each phase.
+"""
+from __future__ import annotations
+
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from gen_factor_sat.formula.cnf import CNFBuilder, Clause, Clauses
+from gen_factor_sat.formula.xor import XorConstraint
+
+
+class EncodingStats:
+    """
+    Statistics of a single encoding. Gates are counted as created if they
+    allocated a new variable and as folded otherwise, e.g. if an input was
+    constant. Gates derived from other gates, e.g. an OR-Gate built from an
+    AND-Gate and negations, are counted once as the outermost gate. The time
+    of nested operations is measured exclusively, i.e. the
+    time of an operation does not include the time of the operations it calls.
+    The phases are measured inclusively.
+    """
+
+    def __init__(self):
+        self.gates: Dict[str, Dict[str, int]] = defaultdict(lambda: {'created': 0, 'folded': 0})
+        self.clauses: Counter = Counter()
+        self.phases: Dict[str, float] = {}
+        self.operations: Dict[str, Dict[str, float]] = defaultdict(lambda: {'calls': 0, 'time_ms': 0.0})
+        self.number_of_variables: Optional[int] = None
+        self.number_of_clauses: Optional[int] = None
+        self._stack: List[list] = []
+        self._gate_depth = 0
+
+    def gate(self, kind: str, created: bool) -> None:
+        """
+        Count a gate of the specified type.
+
+        :param kind: the type of the gate, e.g. 'and'
+        :param created: whether the gate allocated a new variable
+        :return: None
+        """
+        self.gates[kind]['created' if created else 'folded'] += 1
+
+    def start_gate(self) -> None:
+        """
+        Start a gate. Each start must be followed by a stop_gate. Gates that
+        are started while another gate is running are not counted.
+
+        :return: None
+        """
+        self._gate_depth += 1
+
+    def stop_gate(self, kind: str, created: bool) -> None:
+        """
+        Stop the most recently started gate and count it if it is not nested.
+
+        :param kind: the type of the gate, e.g. 'and'
+        :param created: whether the gate allocated a new variable
+        :return: None
+        """
+        self._gate_depth -= 1
+        if self._gate_depth == 0:
+            self.gate(kind, created)
+
+    def add_clauses(self, clauses: Iterable[Clause]) -> None:
+        """
+        Count the specified clauses by their length.
+
+        :param clauses: the emitted clauses
+        :return: None
+        """
+        self.clauses.update(map(len, clauses))
+
+    def depth(self, operation: str) -> int:
+        """
+        Determine how often the specified operation is currently nested.
+
+        :param operation: the name of the operation
+        :return: the number of running calls of the operation
+        """
+        return sum(1 for entry in self._stack if entry[0] == operation)
+
+    def start(self, operation: str, key: Optional[str] = None) -> None:
+        """
+        Start timing an operation. Each start must be followed by a stop.
+
+        :param operation: the name of the operation
+        :param key: the name the time is recorded under (default: operation)
+        :return: None
+        """
+        self._stack.append([operation, operation if key is None else key, time.perf_counter(), 0.0])
+
+    def stop(self) -> None:
+        """
+        Stop timing the most recently started operation.
+
+        :return: None
+        """
+        operation, key, start, nested = self._stack.pop()
+        elapsed = time.perf_counter() - start
+
+        self.operations[key]['calls'] += 1
+        self.operations[key]['time_ms'] += (elapsed - nested) * 10 ** 3
+
+        if self._stack:
+            self._stack[-1][3] += elapsed
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Measure the time of a phase of the encoding.
+
+        :param name: the name of the phase
+        :return: a context manager measuring the enclosed code
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - start) * 10 ** 3
+
+    def result(self, number_of_variables: int, number_of_clauses: int) -> None:
+        """
+        Record the size of the resulting CNF.
+
+        :param number_of_variables: the number of variables of the CNF
+        :param number_of_clauses: the number of clauses of the CNF
+        :return: None
+        """
+        self.number_of_variables = number_of_variables
+        self.number_of_clauses = number_of_clauses
+
+    def to_dict(self) -> Dict:
+        """
+        Convert the statistics into a JSON serializable object.
+
+        :return: the statistics
+        """
+        return {
+            'variables': self.number_of_variables,
+            'clauses': self.number_of_clauses,
+            'gates': dict(sorted(self.gates.items())),
+            'clause_lengths': {str(length): count for length, count in sorted(self.clauses.items())},
+            'phases_ms': {name: round(value, 3) for name, value in self.phases.items()},
+            'operations': {
+                key: {'calls': value['calls'], 'time_ms': round(value['time_ms'], 3)}
+                for key, value in sorted(self.operations.items())
+            }
+        }
+
+
+class InstrumentedCNFBuilder(CNFBuilder):
+    """
+    A CNFBuilder that counts all emitted clauses by their length. The counts
+    include duplicates and tautologies, which are removed later.
+    """
+
+    def __init__(
+            self,
+            stats: EncodingStats,
+            number_of_variables=0,
+            clauses: Optional[Clauses] = None,
+            xors: Optional[List[XorConstraint]] = None,
+            polarity: bool = False
+    ):
+        super().__init__(number_of_variables, clauses, xors, polarity)
+        self.stats = stats
+
+    def write_clauses(self, clauses: Iterable[Clause]) -> None:
+        clauses = tuple(clauses)
+        self.stats.add_clauses(clauses)
+        super().write_clauses(clauses)
@@ -0,0 +1,146 @@
+"""
+XOR constraints
+
+Parity constraints for solvers that support XOR clauses natively, e.g.
+CryptoMiniSat. In the extended DIMACS format, they are written as lines
+starting with an x.
+"""
+from __future__ import annotations
+
+import itertools
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Set
+
+from gen_factor_sat.formula.symbol import Variable
+
+
+@dataclass(frozen=True)
+class XorConstraint:
+    """
+    The XOR of all variables equals the parity. An empty constraint with
+    parity true is unsatisfiable.
+    """
+    variables: FrozenSet[Variable]
+    parity: bool
+
+    @staticmethod
+    def of(literals: Iterable[int], parity: bool = True) -> XorConstraint:
+        """
+        Create the constraint that the XOR of the literals equals the parity.
+        A negative literal flips the parity and a variable occurring twice
+        cancels itself out.
+
+        :param literals: the literals of the constraint
+        :param parity: the value of the XOR
+        :return: the normalized constraint
+        """
+        variables: Set[Variable] = set()
+        for literal in literals:
+            variables ^= {abs(literal)}
+            parity ^= literal < 0
+
+        return XorConstraint(frozenset(variables), parity)
+
+    def __xor__(self, other: XorConstraint) -> XorConstraint:
+        return XorConstraint(self.variables ^ other.variables, self.parity != other.parity)
+
+    def assign(self, assignment: Mapping[int, bool]) -> XorConstraint:
+        """
+        Remove the assigned variables and adjust the parity accordingly.
+
+        :param assignment: the values of the assigned variables
+        :return: the constraint over the unassigned variables
+        """
+        parity = self.parity
+        for x in self.variables:
+            parity ^= assignment.get(x, False)
+
+        return XorConstraint(frozenset(x for x in self.variables if x not in assignment), parity)
+
+    def to_clauses(self) -> List[FrozenSet[int]]:
+        """
+        Encode the constraint into clauses. Each clause excludes one assignment
+        with the wrong parity, hence the number of clauses grows exponentially.
+
+        :return: the equivalent clauses
+        """
+        variables = sorted(self.variables)
+        clauses = []
+        for signs in itertools.product([False, True], repeat=len(variables)):
+            # The clause is false iff each variable equals its sign
+            if (sum(signs) % 2 == 1) != self.parity:
+                clauses.append(frozenset(-x if sign else x for x, sign in zip(variables, signs)))
+
+        return clauses
+
+    def to_dimacs(self) -> str:
+        """
+        Convert the constraint into the extended DIMACS format. The parity is
+        encoded by negating the first variable. An empty constraint is written
+        as empty clause, hence it must be unsatisfiable.
+
+        :return: the DIMACS representation of the constraint
+        """
+        literals = sorted(self.variables)
+        if not literals:
+            return '0'
+        elif not self.parity:
+            literals[0] = -literals[0]
+
+        return 'x' + ' '.join(map(str, literals)) + ' 0'
+
+
+def merge_chains(
+        xors: Iterable[XorConstraint],
+        clauses: Iterable[Iterable[int]],
+        keep: Iterable[Variable] = ()
+) -> List[XorConstraint]:
+    """
+    Eliminate variables that only occur in XOR constraints. A variable that
+    occurs in exactly two constraints is eliminated by replacing both with
+    their XOR, which merges chains of XOR-Gates into a single long constraint.
+    A variable that occurs in a single constraint can always satisfy it, hence
+    the constraint is removed. Variables occurring in a clause and the variables
+    to keep are never eliminated. The result is satisfiable iff the original
+    constraints and clauses are.
+
+    :param xors: the XOR constraints
+    :param clauses: the remaining clauses
+    :param keep: the variables that must not be eliminated
+    :return: the merged constraints in a deterministic order
+    """
+    blocked = set(keep)
+    blocked.update(abs(literal) for clause in clauses for literal in clause)
+
+    constraints: Dict[int, XorConstraint] = dict(enumerate(xors))
+    occurrences: Dict[Variable, Set[int]] = defaultdict(set)
+    for index, constraint in constraints.items():
+        for x in constraint.variables:
+            occurrences[x].add(index)
+
+    next_index = len(constraints)
+    candidates = sorted((x for x in occurrences if x not in blocked), reverse=True)
+    while candidates:
+        x = candidates.pop()
+        indices = sorted(occurrences.get(x, ()))
+        if not 0 < len(indices) <= 2:
+            continue
+
+        removed = [constraints.pop(index) for index in indices]
+        for constraint, index in zip(removed, indices):
+            for y in constraint.variables:
+                occurrences[y].discard(index)
+                if y != x and y not in blocked and len(occurrences[y]) <= 2:
+                    candidates.append(y)
+
+        if len(removed) == 2:
+            merged = removed[0] ^ removed[1]
+            if merged.variables or merged.parity:
+                constraints[next_index] = merged
+                for y in merged.variables:
+                    occurrences[y].add(next_index)
+
+                next_index += 1
+
+    return [constraints[index] for index in sorted(constraints)]
@@ -6,7 +6,7 @@ import math
 from abc import ABC
 from dataclasses import dataclass
 from random import Random
-from typing import Optional, Generator
+from typing import Generator, List, Optional
 
 
 @dataclass()
@@ -225,15 +225,23 @@ class Unknown(Number):
 
 def is_prime(value: int) -> bool:
     """
-    Check whether the specified number is a prime number.
+    Check whether the specified number is a prime number. Small numbers are
+    checked by trial division. Numbers below 3.3 * 10^24 are checked by the
+    Miller-Rabin test with a fixed set of bases, which is exact in this range.
+    Larger numbers are checked by the Baillie-PSW test. No composite number
+    passing the Baillie-PSW test is known.
 
     :param value: the value to be checked
     :return: true if the number is a prime, false otherwise
     """
-    if value == 2:
-        return True
+    small_prime = _trial_division(value)
+    if small_prime is not None:
+        return small_prime
+
+    if value < _MILLER_RABIN_LIMIT:
+        return all(_miller_rabin(value, a) for a in _MILLER_RABIN_BASES)
     else:
-        return all(value % x != 0 for x in range(2, math.ceil(math.sqrt(value)) + 1))
+        return _miller_rabin(value, 2) and _strong_lucas(value)
 
 
 def is_prob_prime(value: int, error: float, seed: int):
@@ -253,24 +261,139 @@ def is_prob_prime(value: int, error: float, seed: int):
     iterations = math.ceil(-math.log(error) / math.log(4))
     for iteration in range(0, iterations):
         a = rand.randrange(1, value)
-        if not _miller_rabin(value, a):
+        # For an even number, number - 1 is odd and the test reduces to the Fermat test
+        if not (_miller_rabin(value, a) if value % 2 else pow(a, value - 1, value) == 1):
             return False
 
     return True
 
 
-def _miller_rabin(number: int, a: int):
-    d = 1
-    dd = 1
+def _small_primes(limit: int) -> List[int]:
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b'\x00\x00'
+    for x in range(2, limit):
+        if x * x >= limit:
+            break
+
+        if sieve[x]:
+            sieve[x * x::x] = bytearray(len(range(x * x, limit, x)))
+
+    return [x for x in range(limit) if sieve[x]]
+
+
+_SMALL_PRIMES = _small_primes(1000)
+
+# The first 13 primes are sufficient bases for all numbers below 3317044064679887385961981
+_MILLER_RABIN_BASES = _SMALL_PRIMES[:13]
+_MILLER_RABIN_LIMIT = 3317044064679887385961981
+
+
+def _trial_division(value: int) -> Optional[bool]:
+    # Decides the primality if the number is small or has a small prime factor
+    for prime in _SMALL_PRIMES:
+        if value % prime == 0:
+            return value == prime
+
+    if value < _SMALL_PRIMES[-1] ** 2:
+        return value >= 2
+
+    return None
+
+
+def _miller_rabin(number: int, a: int) -> bool:
+    # Strong probable prime test of an odd number to the base a
+    d, s = number - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+
+    x = pow(a, d, number)
+    if x == 1 or x == number - 1:
+        return True
+
+    for _ in range(s - 1):
+        x = x * x % number
+        if x == number - 1:
+            return True
+
+    return False
+
+
+def _strong_lucas(number: int) -> bool:
+    # Strong Lucas probable prime test of an odd number with Selfridge's parameters
+    if _isqrt(number) ** 2 == number:
+        return False
 
-    for b in bin(number - 1)[2:]:
-        d = d * d % number
-        if d == 1 and dd != 1 and dd != number - 1:
+    D = 5
+    while _jacobi(D, number) != -1:
+        if _jacobi(D, number) == 0 and abs(D) != number:
             return False
 
-        if b == '1':
-            d = d * a % number
+        D = -D - 2 if D > 0 else -D + 2
+
+    P, Q = 1, (1 - D) // 4
+
+    d, s = number + 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+
+    U, V, Qk = 1, P, Q % number
+    for i in range(d.bit_length() - 2, -1, -1):
+        U, V = U * V % number, (V * V - 2 * Qk) % number
+        Qk = Qk * Qk % number
+
+        if (d >> i) & 1:
+            U, V = _halve(P * U + V, number), _halve(D * U + P * V, number)
+            Qk = Qk * Q % number
+
+    if U == 0 or V == 0:
+        return True
+
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % number
+        if V == 0:
+            return True
+
+        Qk = Qk * Qk % number
+
+    return False
+
+
+def _halve(value: int, number: int) -> int:
+    # Division by two modulo an odd number
+    value %= number
+    if value % 2 == 1:
+        value += number
+
+    return value // 2
+
+
+def _jacobi(a: int, n: int) -> int:
+    a %= n
+    result = 1
+    while a != 0:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+
+        a %= n
+
+    return result if n == 1 else 0
+
+
+def _isqrt(value: int) -> int:
+    # Integer square root by Newton's method (math.isqrt requires Python 3.8)
+    if value < 2:
+        return value
 
-        dd = d
+    x = 1 << ((value.bit_length() + 1) // 2)
+    while True:
+        y = (x + value // x) // 2
+        if y >= x:
+            return x
 
-    return d == 1
+        x = y
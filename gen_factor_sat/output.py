@@ -0,0 +1,305 @@
+"""
+Output files
+
+Functions to write encoded instances to files using the default file names.
+The files can be compressed with gzip, xz or bz2 while they are written.
+"""
+import bz2
+import gzip
+import io
+import lzma
+import os
+import shutil
+import sys
+import tempfile
+import uuid
+from typing import BinaryIO, Callable, Optional, TextIO, TypeVar
+
+from gen_factor_sat.binary import binary_name, write_binary
+from gen_factor_sat.factoring_sat import FactoringSat, IncrementalFactoringSat
+from gen_factor_sat.formula.sink import DimacsSink, Spool, spool_directory
+
+Encoder = Callable[..., FactoringSat]
+T = TypeVar('T')
+
+COMPRESSIONS = ['gz', 'xz', 'bz2']
+
+
+def default_number_file(result: FactoringSat) -> str:
+    """
+    The default file name of an instance created from a given number.
+
+    :param result: the encoded instance
+    :return: the file name
+    """
+    return 'factor_number{0}.cnf'.format(result.number.value)
+
+
+def default_random_file(result: FactoringSat) -> str:
+    """
+    The default file name of an instance created from a random number.
+
+    :param result: the encoded instance
+    :return: the file name
+    """
+    number_type = result.number.fold_type(
+        v_det_prime='prime',
+        v_prob_prime='prob-prime',
+        v_det_comp='composite',
+        v_prob_comp='composite',
+        v_unknown='random'
+    )
+
+    return 'factor_seed{0}_minn{1}_maxn{2}_{3}.cnf'.format(
+        result.generator.seed,
+        result.generator.min_value,
+        result.generator.max_value,
+        number_type
+    )
+
+
+def default_numbers_file(result: IncrementalFactoringSat) -> str:
+    """
+    The default file name of an incremental instance of several numbers.
+
+    :param result: the encoded instances
+    :return: the file name
+    """
+    return 'factor_{0}bit_{1}numbers_first{2}.icnf'.format(
+        len(result.number_variables),
+        len(result.numbers),
+        result.numbers[0].value
+    )
+
+
+def compression_of(filename: str) -> Optional[str]:
+    """
+    Detect the compression of a file by its extension.
+
+    :param filename: the name of the file
+    :return: gz, xz, bz2 or None if the file is not compressed
+    """
+    extension = os.path.splitext(filename)[1][1:]
+    return extension if extension in COMPRESSIONS else None
+
+
+def compressed_name(filename: str, compression: Optional[str]) -> str:
+    """
+    Append the extension of the compression to a file name.
+
+    :param filename: the name of the uncompressed file
+    :param compression: gz, xz, bz2 or None
+    :return: the name of the compressed file
+    """
+    return filename if compression is None else '{0}.{1}'.format(filename, compression)
+
+
+def open_compressed(file: BinaryIO, compression: str) -> TextIO:
+    """
+    Wrap a binary file such that text written to the wrapper is compressed.
+    Closing the wrapper finishes the compressed stream, but does not close
+    the wrapped file. The gzip header contains neither a file name nor a
+    timestamp, such that the output is deterministic.
+
+    The clauses of a DimacsSink are compressed into a temporary file next to
+    the wrapped file while they are created and appended as a separate
+    member behind the problem line. The decompressors of gzip, xz and bz2
+    concatenate the members, hence the file is never stored uncompressed.
+
+    :param file: the binary file receiving the compressed data
+    :param compression: gz, xz or bz2
+    :return: the text stream to be written
+    :raises ValueError if the compression is unknown
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError('Unknown compression {0}, expected one of {1}'.format(compression, ', '.join(COMPRESSIONS)))
+
+    return _CompressedText(_Members(file, compression))
+
+
+def write_cnf(
+        encode: Encoder,
+        filename: str,
+        default_file: Callable[[FactoringSat], str],
+        compression: Optional[str] = None
+) -> FactoringSat:
+    """
+    Stream the DIMACS of the encoded instance into the specified file. As the
+    default file name depends on the result, the DIMACS is written to a
+    temporary file in the target directory which is renamed afterwards.
+
+    The DIMACS is compressed as it is written if a compression is specified
+    or the file name ends with .gz, .xz or .bz2. The default file name gets
+    the extension of the compression.
+
+    :param encode: a function encoding the instance into the given file
+    :param filename: the output file, a directory, '' or '-' for stdout
+    :param default_file: a function creating the default file name from the result
+    :param compression: gz, xz, bz2 or None to detect the compression by the file name
+    :return: the encoded instance
+    """
+    if compression is None and filename not in ('', '-'):
+        compression = compression_of(filename)
+
+    if filename == '-':
+        if compression is None:
+            return encode(file=sys.stdout)
+
+        with open_compressed(sys.stdout.buffer, compression) as file:
+            return encode(file=file)
+
+    def write(path: str) -> FactoringSat:
+        if compression is None:
+            with open(path, 'x') as file:
+                return encode(file=file)
+        else:
+            with open(path, 'xb') as binary_file, open_compressed(binary_file, compression) as file:
+                return encode(file=file)
+
+    return _write_file(write, filename, lambda result: compressed_name(default_file(result), compression))
+
+
+def write_binary_cnf(encode: Encoder, filename: str, default_file: Callable[[FactoringSat], str]) -> FactoringSat:
+    """
+    Encode the instance and write it in the binary format (see
+    gen_factor_sat.binary) into the specified file. The clauses are stored
+    in a ClauseStore, which is written without copying it. The default file
+    name gets the binary extension instead of .cnf.
+
+    :param encode: a function encoding the instance
+    :param filename: the output file, a directory, '' or '-' for stdout
+    :param default_file: a function creating the default DIMACS file name from the result
+    :return: the encoded instance
+    """
+    result = encode(compact=True)
+
+    if filename == '-':
+        write_binary(result, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+        return result
+
+    def write(path: str) -> FactoringSat:
+        with open(path, 'xb') as file:
+            write_binary(result, file)
+
+        return result
+
+    return _write_file(write, filename, lambda written: binary_name(default_file(written)))
+
+
+def _write_file(write: Callable[[str], T], filename: str, default_file: Callable[[T], str]) -> T:
+    # As the default file name depends on the result, a temporary file is renamed afterwards
+    if not filename:
+        directory = os.getcwd()
+    else:
+        name, extension = os.path.splitext(filename)
+        if (os.path.exists(filename) and os.path.isdir(filename)) or (not extension):
+            directory = filename
+            filename = ''
+        else:
+            directory = os.path.dirname(os.path.realpath(filename))
+
+    os.makedirs(directory, exist_ok=True)
+
+    temporary_file = os.path.join(directory, '.gen_factor_sat-{0}.tmp'.format(uuid.uuid4().hex))
+    try:
+        result = write(temporary_file)
+
+        if not filename:
+            filename = os.path.join(directory, default_file(result))
+
+        os.replace(temporary_file, filename)
+    except BaseException:
+        # The temporary file does not exist if it could not be created
+        try:
+            os.remove(temporary_file)
+        except FileNotFoundError:
+            pass
+
+        raise
+
+    return result
+
+
+def _compressor(file: BinaryIO, compression: str) -> BinaryIO:
+    if compression == 'gz':
+        return gzip.GzipFile(filename='', mode='wb', fileobj=file, mtime=0)
+    elif compression == 'xz':
+        return lzma.LZMAFile(file, mode='wb')
+    else:
+        return bz2.BZ2File(file, mode='wb')
+
+
+class _Members(io.BufferedIOBase):
+    # Writes the data as a sequence of compressed members, a member is finished before compressed data is appended
+
+    def __init__(self, file: BinaryIO, compression: str):
+        super().__init__()
+        self.file = file
+        self.compression = compression
+        self._member: Optional[BinaryIO] = None
+        self._empty = True
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self._member is None:
+            self._member = _compressor(self.file, self.compression)
+            self._empty = False
+
+        return self._member.write(data)
+
+    def append(self, member: BinaryIO) -> None:
+        self.finish()
+        shutil.copyfileobj(member, self.file, DimacsSink.COPY_SIZE)
+        self._empty = False
+
+    def finish(self) -> None:
+        if self._member is not None:
+            self._member.close()
+            self._member = None
+
+    def flush(self) -> None:
+        # A flush of the compressor would degrade the compression, the data is written when the member is finished
+        self.file.flush()
+
+    def close(self) -> None:
+        if not self.closed:
+            # Even an empty stream consists of a member
+            if self._empty:
+                self.write(b'')
+
+            self.finish()
+
+        super().close()
+
+
+class _CompressedText(io.TextIOWrapper):
+
+    def __init__(self, members: _Members):
+        super().__init__(members, encoding='ascii')
+        self.members = members
+
+    def spool(self) -> Spool:
+        return _CompressedSpool(self)
+
+
+class _CompressedSpool(Spool):
+
+    def __init__(self, file: _CompressedText):
+        self.file = file
+        self._temporary = tempfile.TemporaryFile(dir=spool_directory(file.members.file))
+        self._text = io.TextIOWrapper(_compressor(self._temporary, file.members.compression), encoding='ascii')
+
+    def write(self, text: str) -> None:
+        self._text.write(text)
+
+    def append(self) -> None:
+        # Closing the wrapper finishes the member, but keeps the temporary file open
+        self._text.close()
+        self._temporary.seek(0)
+
+        self.file.flush()
+        self.file.members.append(self._temporary)
+        self._temporary.close()
@@ -0,0 +1,199 @@
+"""
+Solving
+
+Solve encoded factoring instances in-process with the solvers of pysat.
+Several solvers can be raced in separate processes, in which case the first
+answer is used.
+"""
+import csv
+import multiprocessing
+import os
+import queue
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence
+
+from pysat.solvers import Solver
+
+from gen_factor_sat import utils
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.symbol import Variable
+
+RESULTS_HEADER = ['Number', 'Length', 'Type', 'Result', 'Time [ms]']
+SATISFIABLE = 'SATISFIABLE'
+UNSATISFIABLE = 'UNSATISFIABLE'
+UNKNOWN = 'UNKNOWN'
+
+
+@dataclass()
+class SolveResult:
+    """
+    The answer of a solver for a factoring instance. The factors are only
+    known if the instance is satisfiable. The time only includes solving,
+    not encoding.
+    """
+    number: int
+    type: str
+    result: str
+    time_ms: int
+    solver: Optional[str] = None
+    factor_1: Optional[int] = None
+    factor_2: Optional[int] = None
+
+    def to_row(self) -> List[str]:
+        """
+        Convert the result into a row of the results file (see RESULTS_HEADER).
+
+        :return: the row
+        """
+        return [str(self.number), str(self.number.bit_length()), self.type, self.result, str(self.time_ms)]
+
+
+def solve(factor_sat: FactoringSat, solver: str = 'cadical') -> SolveResult:
+    """
+    Solve the instance with the specified solver and decode the factors from
+    the model. XOR constraints are converted into clauses, as pysat does not
+    support them.
+
+    :param factor_sat: the encoded instance
+    :param solver: the name of a pysat solver
+    :return: the answer of the solver
+    """
+    xor_clauses = [clause for xor in factor_sat.cnf.xors for clause in xor.to_clauses()]
+
+    with Solver(name=solver, bootstrap_with=factor_sat.cnf.clauses) as sat_solver:
+        sat_solver.append_formula(xor_clauses)
+
+        start = time.perf_counter()
+        satisfiable = sat_solver.solve()
+        time_ms = round((time.perf_counter() - start) * 10 ** 3)
+
+        answer = SATISFIABLE if satisfiable else UNSATISFIABLE
+        result = SolveResult(
+            number=factor_sat.number.value,
+            type=number_type(factor_sat, answer),
+            result=answer,
+            time_ms=time_ms,
+            solver=solver
+        )
+
+        if satisfiable:
+            model = sat_solver.get_model()
+            result.factor_1 = decode(factor_sat.factor_1, model)
+            result.factor_2 = decode(factor_sat.factor_2, model)
+
+    return result
+
+
+def solve_portfolio(
+        factor_sat: FactoringSat,
+        solvers: Sequence[str],
+        timeout: Optional[float] = None
+) -> SolveResult:
+    """
+    Race the specified solvers in separate processes and return the first
+    answer. The remaining solvers are terminated. Where possible, the
+    processes are forked, such that the clauses are not serialized.
+
+    :param factor_sat: the encoded instance
+    :param solvers: the names of the pysat solvers
+    :param timeout: the time in seconds after which the result is unknown
+    :return: the first answer or an unknown result after the timeout
+    :raises ValueError if all solvers fail
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+    answers = context.Queue()
+    processes = [
+        context.Process(target=_solve_process, args=(answers, factor_sat, solver), daemon=True)
+        for solver in solvers
+    ]
+
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+
+    try:
+        errors = []
+        while len(errors) < len(processes):
+            remaining = None if timeout is None else max(0.0, timeout - (time.perf_counter() - start))
+
+            try:
+                answer = answers.get(timeout=remaining)
+            except queue.Empty:
+                return SolveResult(
+                    number=factor_sat.number.value,
+                    type=number_type(factor_sat, UNKNOWN),
+                    result=UNKNOWN,
+                    time_ms=round((time.perf_counter() - start) * 10 ** 3)
+                )
+
+            if isinstance(answer, SolveResult):
+                return answer
+            else:
+                errors.append(answer)
+
+        raise ValueError('All solvers failed: ' + '; '.join(errors))
+    finally:
+        for process in processes:
+            process.terminate()
+
+        for process in processes:
+            process.join()
+
+
+def decode(factor: List[Variable], model: Iterable[int]) -> int:
+    """
+    Decode the value of a factor from a model.
+
+    :param factor: the variables encoding the factor
+    :param model: the true literals of the model
+    :return: the value of the factor
+    """
+    model = set(model)
+    return utils.to_int(['1' if x in model else '0' for x in factor])
+
+
+def number_type(factor_sat: FactoringSat, result: str) -> str:
+    """
+    Describe the type of the number like the results file. If the type of
+    the number is unknown, it is derived from the answer of the solver.
+
+    :param factor_sat: the encoded instance
+    :param result: the answer of the solver
+    :return: prime, prob-prime, composite or random
+    """
+    return factor_sat.number.fold_type(
+        v_det_prime='prime',
+        v_prob_prime='prob-prime',
+        v_det_comp='composite',
+        v_prob_comp='composite',
+        v_unknown={SATISFIABLE: 'composite', UNSATISFIABLE: 'prime'}.get(result, 'random')
+    )
+
+
+def append_results(filename: str, results: Iterable[SolveResult]) -> None:
+    """
+    Append the results to a CSV file in the format of results/results.csv.
+    The header is written if the file is new.
+
+    :param filename: the CSV file
+    :param results: the results to be appended
+    :return: None
+    """
+    exists = os.path.exists(filename) and os.path.getsize(filename) > 0
+
+    with open(filename, 'a', newline='') as file:
+        writer = csv.writer(file)
+        if not exists:
+            writer.writerow(RESULTS_HEADER)
+
+        writer.writerows(result.to_row() for result in results)
+
+
+def _solve_process(answers, factor_sat: FactoringSat, solver: str) -> None:
+    try:
+        answers.put(solve(factor_sat, solver))
+    except Exception as error:
+        answers.put('{0}: {1}'.format(solver, error))
@@ -0,0 +1,150 @@
+"""
+Encoding templates
+
+For a fixed bit length, the multiplication circuit of the factoring problem
+is the same for every number. Only the comparison with the number differs.
+Templates store the encoded multiplication circuit once, such that encoding
+another number of the same length only requires the comparison.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+
+from gen_factor_sat.formula.cnf import CNFBuilder, Clause, Clauses, is_no_tautology
+from gen_factor_sat.formula.symbol import Symbol, Variable
+from gen_factor_sat.formula.xor import XorConstraint
+
+
+@dataclass(frozen=True)
+class CircuitTemplate:
+    """
+    The encoded multiplication circuit of two factors. The clauses are stored
+    in the order in which they were created, without tautologies. If the
+    circuit was encoded with XOR constraints, they are stored as well. In the
+    Plaisted-Greenbaum encoding, the deferred gates and the already required
+    literals are stored instead of the clauses of the gates.
+    """
+    number_of_variables: int
+    clauses: Tuple[Clause, ...]
+    clause_set: FrozenSet[Clause]
+    gates: Dict[Hashable, Variable]
+    factor_1: List[Variable]
+    factor_2: List[Variable]
+    result: List[Symbol]
+    xors: Optional[Tuple[XorConstraint, ...]] = None
+    definitions: Optional[Dict[Variable, Set[Clause]]] = None
+    required: FrozenSet[int] = frozenset()
+
+    def instantiate(
+            self,
+            clauses: Optional[Clauses] = None,
+            builder: Callable[[int, Clauses, Optional[List[XorConstraint]]], CNFBuilder] = CNFBuilder
+    ) -> CNFBuilder:
+        """
+        Create a CNFBuilder that contains the variables, clauses and gates of
+        this template. Adding the clauses of the template to the specified
+        container is equivalent to encoding the circuit with it. The clauses
+        are added to the container directly, i.e. not via the builder.
+
+        :param clauses: the container for the clauses (see CNFBuilder)
+        :param builder: creates the builder from the variables, the clauses and the XOR constraints
+        :return: the builder containing the circuit
+        :raises ValueError if the builder and the template differ in the use of the Plaisted-Greenbaum encoding
+        """
+        xors = None if self.xors is None else list(self.xors)
+
+        if clauses is None:
+            # Copying the filtered set is much faster than adding the clauses again
+            cnf_builder = builder(self.number_of_variables, set(self.clause_set), xors)
+        else:
+            cnf_builder = builder(self.number_of_variables, clauses, xors)
+            cnf_builder.clauses.update(self.clauses)
+
+        if (cnf_builder.definitions is None) != (self.definitions is None):
+            raise ValueError('The builder and the template must both use the Plaisted-Greenbaum encoding or neither')
+        elif self.definitions is not None:
+            cnf_builder.definitions.update(self.definitions)
+            cnf_builder.required.update(self.required)
+
+        cnf_builder.gates.update(self.gates)
+        return cnf_builder
+
+    @staticmethod
+    def create(
+            cnf_builder: CNFBuilder,
+            clauses: Iterable[Clause],
+            factor_1: List[Variable],
+            factor_2: List[Variable],
+            result: List[Symbol]
+    ) -> 'CircuitTemplate':
+        """
+        Store the circuit encoded with the specified builder as a template.
+
+        :param cnf_builder: the builder used to encode the circuit
+        :param clauses: all clauses of the circuit in the order of creation
+        :param factor_1: the variables of the first factor
+        :param factor_2: the variables of the second factor
+        :param result: the result of the multiplication
+        :return: the template
+        """
+        filtered_clauses = tuple(filter(is_no_tautology, clauses))
+
+        return CircuitTemplate(
+            number_of_variables=cnf_builder.number_of_variables,
+            clauses=filtered_clauses,
+            clause_set=frozenset(filtered_clauses),
+            gates=dict(cnf_builder.gates),
+            factor_1=factor_1,
+            factor_2=factor_2,
+            result=result,
+            xors=None if cnf_builder.xors is None else tuple(cnf_builder.xors),
+            definitions=None if cnf_builder.definitions is None else dict(cnf_builder.definitions),
+            required=frozenset(cnf_builder.required)
+        )
+
+
+class TemplateCache:
+    """
+    A least recently used cache of templates. The keys must identify
+    everything the encoding of the template depends on.
+    """
+
+    def __init__(self, max_size: int = 16):
+        self.max_size = max_size
+        self._templates: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, create: Callable[[], CircuitTemplate]) -> CircuitTemplate:
+        """
+        Get the template with the specified key. If the cache does not contain
+        the template, it is created and the least recently used template is
+        evicted if the cache is full.
+
+        :param key: the key identifying the template
+        :param create: a function creating the template
+        :return: the template
+        """
+        template = self._templates.get(key)
+        if template is None:
+            template = create()
+            self._templates[key] = template
+
+            if len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+        else:
+            self._templates.move_to_end(key)
+
+        return template
+
+    def clear(self) -> None:
+        """
+        Remove all templates.
+
+        :return: None
+        """
+        self._templates.clear()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._templates
@@ -0,0 +1,56 @@
+import csv
+import io
+import os
+
+import pytest
+
+from gen_factor_sat import batch
+from gen_factor_sat.factoring_sat import FactoringSat
+
+
+def test_intervals():
+    assert list(batch.intervals(10, 1000, 10)) == [(10, 100), (100, 1000)]
+    assert list(batch.intervals(10, 1001, 10)) == [(10, 100), (100, 1000), (1000, 10000)]
+    assert list(batch.intervals(10, 10, 10)) == []
+
+    with pytest.raises(ValueError):
+        list(batch.intervals(10, 100, 1))
+
+
+def test_instances_are_deterministic(tmp_path):
+    instances = batch.create_instances(str(tmp_path), 100, 10000, 10, 1, 2, 3, seed=42)
+    same_instances = batch.create_instances(str(tmp_path), 100, 10000, 10, 1, 2, 3, seed=42)
+    other_instances = batch.create_instances(str(tmp_path), 100, 10000, 10, 1, 2, 3, seed=43)
+
+    assert len(instances) == 12
+    assert instances == same_instances, 'The same seed should produce the same instances'
+    assert instances != other_instances, 'Different seeds should produce different instances'
+    assert len({instance.seed for instance in instances}) == len(instances), 'All seeds should be distinct'
+    assert [instance.prime for instance in instances[:6]] == [None, True, True, False, False, False]
+    assert {instance.directory for instance in instances} == {
+        os.path.join(str(tmp_path), 'factor_100-1000'),
+        os.path.join(str(tmp_path), 'factor_1000-10000')
+    }
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_generate_batch(tmp_path, workers):
+    instances = batch.create_instances(str(tmp_path), 100, 10000, 10, 1, 1, 1, seed=7)
+    rows = batch.generate_batch(instances, str(tmp_path), workers=workers)
+
+    with open(os.path.join(str(tmp_path), batch.MANIFEST_FILE), newline='') as manifest:
+        assert list(csv.reader(manifest)) == [batch.MANIFEST_HEADER] + rows
+
+    for instance, row in zip(instances, rows):
+        expected_dimacs = io.StringIO()
+        expected = FactoringSat.factorize_random_number(
+            max_value=instance.max_value,
+            min_value=instance.min_value,
+            seed=instance.seed,
+            prime=instance.prime,
+            file=expected_dimacs
+        )
+
+        assert row[1] == str(expected.number.value)
+        with open(os.path.join(str(tmp_path), row[0])) as file:
+            assert file.read() == expected_dimacs.getvalue(), 'The files should match the single instance encoding'
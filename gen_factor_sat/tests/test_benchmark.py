@@ -0,0 +1,56 @@
+import csv
+import json
+import os
+from random import Random
+
+import pytest
+
+from gen_factor_sat.benchmark import measure
+from gen_factor_sat.benchmark.components import COMPONENTS
+
+
+@pytest.mark.parametrize('component', list(COMPONENTS))
+def test_components(component):
+    run = COMPONENTS[component](8, Random(0))
+    result = measure.measure('test', component, 8, run, runs=2)
+
+    assert result.component == component and result.bits == 8 and result.runs == 2
+    assert 0 <= result.time_min_ms <= result.time_mean_ms <= result.time_max_ms
+    assert result.peak_bytes >= result.allocated_bytes >= 0
+
+
+def test_components_are_deterministic():
+    for component in ['tseitin_gates', 'n_bit_adder', 'karatsuba_multiply', 'to_dimacs']:
+        result_1 = COMPONENTS[component](24, Random(1))()
+        result_2 = COMPONENTS[component](24, Random(1))()
+
+        if isinstance(result_1, str):
+            assert result_1 == result_2
+        else:
+            assert result_1.clauses == result_2.clauses, 'The same seed should produce the same inputs'
+
+
+def test_output(tmp_path):
+    measurements = [
+        measure.measure('v1', 'sum', bits, lambda: sum(range(bits)), runs=1)
+        for bits in [2, 4]
+    ]
+
+    json_file = os.path.join(str(tmp_path), 'results.json')
+    csv_file = os.path.join(str(tmp_path), 'results.csv')
+
+    measure.write_json(json_file, 'v1', measurements)
+    measure.append_csv(csv_file, measurements)
+    measure.append_csv(csv_file, measurements)
+
+    with open(json_file) as file:
+        data = json.load(file)
+
+    assert data['label'] == 'v1'
+    assert [result['bits'] for result in data['measurements']] == [2, 4]
+
+    with open(csv_file, newline='') as file:
+        rows = list(csv.DictReader(file))
+
+    assert len(rows) == 4, 'Measurements should be appended'
+    assert set(rows[0]) == set(measure.FIELDS)
@@ -0,0 +1,119 @@
+import io
+import os
+import tempfile
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import booleans, integers, sampled_from
+
+from gen_factor_sat import binary
+from gen_factor_sat.factoring_sat import FactoringSat
+
+
+def reload(result):
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'instance.cnfb')
+        with open(filename, 'wb') as file:
+            binary.write_binary(result, file)
+
+        instance = binary.open_binary(filename)
+        try:
+            dimacs = io.StringIO()
+            instance.write_dimacs(dimacs)
+            return instance.to_factoring_sat(), dimacs.getvalue()
+        finally:
+            instance.close()
+
+
+@settings(deadline=None)
+@given(integers(min_value=2, max_value=2 ** 64), booleans(), booleans(), booleans())
+def test_round_trip(number, compact, simplify, xor):
+    result = FactoringSat.factorize_number(number, compact=compact, simplify=simplify, xor=xor)
+    loaded, dimacs = reload(result)
+
+    assert loaded.number == result.number
+    assert loaded.factor_1 == result.factor_1 and loaded.factor_2 == result.factor_2
+    assert (loaded.simplified, loaded.xor) == (simplify, xor)
+    assert list(loaded.cnf.clauses) == list(map(tuple, result.cnf.clauses)), 'The order should be kept'
+    assert loaded.cnf.xors == result.cnf.xors
+    assert dimacs == result.to_dimacs() + '\n', 'The converted DIMACS should match the instance'
+
+
+@settings(deadline=None, max_examples=20)
+@given(integers(min_value=0, max_value=2 ** 32), sampled_from([None, True, False]), sampled_from([0.0, 0.01]))
+def test_generator(seed, prime, error):
+    result = FactoringSat.factorize_random_number(
+        max_value=2 ** 20, min_value=2 ** 10, seed=seed, prime=prime, error=error, ordering='bfs'
+    )
+    loaded, dimacs = reload(result)
+
+    assert loaded.number == result.number
+    assert loaded.generator == result.generator
+    assert loaded.ordering == 'bfs'
+    assert loaded.comments() == result.comments()
+
+
+def test_mapped_arrays(tmp_path):
+    result = FactoringSat.factorize_number(1000003, compact=True)
+    filename = str(tmp_path / 'instance.cnfb')
+    with open(filename, 'wb') as file:
+        binary.write_binary(result, file)
+
+    with binary.open_binary(filename) as instance:
+        assert isinstance(instance.literals, memoryview) and isinstance(instance.offsets, memoryview)
+        assert instance.literals.tolist() == result.cnf.clauses.literals.tolist()
+        assert instance.offsets.tolist() == result.cnf.clauses.offsets.tolist()
+        assert instance.clause(3) == result.cnf.clauses.clause(3)
+
+
+def test_invalid_file(tmp_path):
+    filename = str(tmp_path / 'instance.cnfb')
+    with open(filename, 'w') as file:
+        file.write(FactoringSat.factorize_number(35).to_dimacs())
+
+    with pytest.raises(ValueError):
+        binary.open_binary(filename)
+
+    with pytest.raises(ValueError):
+        binary.write_binary(FactoringSat.factorize_number(35, file=io.StringIO()), io.BytesIO())
+
+
+@pytest.mark.parametrize('cut', [0.5, 0.99, 3])
+def test_truncated_file(tmp_path, cut):
+    filename = str(tmp_path / 'instance.cnfb')
+    with open(filename, 'wb') as file:
+        binary.write_binary(FactoringSat.factorize_number(1000003, compact=True), file)
+
+    size = os.path.getsize(filename)
+    with open(filename, 'r+b') as file:
+        file.truncate(int(size * cut) if cut < 1 else size - cut)
+
+    with pytest.raises(ValueError, match='truncated'):
+        binary.open_binary(filename)
+
+
+@pytest.mark.parametrize('damage', ['magic', 'truncated', 'metadata'])
+def test_damaged_file_is_unmapped(tmp_path, monkeypatch, damage):
+    filename = str(tmp_path / 'instance.cnfb')
+    with open(filename, 'wb') as file:
+        binary.write_binary(FactoringSat.factorize_number(1000003, compact=True), file)
+
+    with open(filename, 'r+b') as file:
+        if damage == 'truncated':
+            file.truncate(os.path.getsize(filename) // 2)
+        else:
+            file.seek(0 if damage == 'magic' else binary._HEADER.size)
+            file.write(b'\xff')
+
+    mappings = []
+
+    class RecordingMap(binary.mmap.mmap):
+        def __init__(self, *args, **kwargs):
+            super().__init__()
+            mappings.append(self)
+
+    monkeypatch.setattr(binary.mmap, 'mmap', RecordingMap)
+    with pytest.raises(ValueError):
+        binary.open_binary(filename)
+
+    assert len(mappings) == 1 and mappings[0].closed, 'The mapping of a damaged file should be closed'
@@ -0,0 +1,112 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from gen_factor_sat import batch
+from gen_factor_sat.cache import InstanceCache
+from gen_factor_sat.circuit.instances import TseitinFactoringStrategy, TseitinWallaceFactoringStrategy
+from gen_factor_sat.factoring_sat import FactoringSat
+
+
+def encode_cached(directory, number):
+    return FactoringSat.factorize_number(number, cache=InstanceCache(directory)).to_dimacs()
+
+
+def test_hit(tmp_path):
+    cache = InstanceCache(str(tmp_path))
+    result = FactoringSat.factorize_number(1000003, cache=cache)
+    cached = FactoringSat.factorize_number(1000003, cache=cache)
+
+    assert len(cache.entries()) == 1
+    assert cached.number == result.number
+    assert (cached.factor_1, cached.factor_2) == (result.factor_1, result.factor_2)
+    assert set(cached.cnf.clauses) == set(map(tuple, result.cnf.clauses))
+
+    file = io.StringIO()
+    FactoringSat.factorize_number(1000003, file=file, cache=cache)
+    assert file.getvalue() == cached.to_dimacs() + '\n'
+
+
+def test_key(tmp_path):
+    cache = InstanceCache(str(tmp_path))
+    FactoringSat.factorize_number(1000003, cache=cache)
+    FactoringSat.factorize_number(1000003, cache=cache, simplify=True)
+    FactoringSat.factorize_number(1000003, cache=cache, strategy=TseitinWallaceFactoringStrategy())
+    FactoringSat.factorize_random_number(2 ** 20, 2 ** 10, seed=1, cache=cache)
+    FactoringSat.factorize_random_number(2 ** 20, 2 ** 10, seed=1, cache=cache)
+    assert len(cache.entries()) == 4, 'Instances should only share an entry if all inputs agree'
+
+    cached = FactoringSat.factorize_random_number(2 ** 20, 2 ** 10, seed=1, cache=cache)
+    expected = FactoringSat.factorize_random_number(2 ** 20, 2 ** 10, seed=1)
+    assert cached.comments() == expected.comments()
+
+    result = FactoringSat.factorize_number(1000003, cache=cache, xor=True, ordering='bfs')
+    key = InstanceCache.key(result.number, None, TseitinFactoringStrategy(), result.options)
+    assert os.path.exists(cache.path(key)), 'The key should be derived from the options of the instance'
+
+
+def test_eviction(tmp_path):
+    cache = InstanceCache(str(tmp_path))
+    for number in [1000003, 1000033, 1000037]:
+        FactoringSat.factorize_number(number, cache=cache)
+
+    entries = cache.entries()
+    oldest, _, _ = entries[1]
+    os.utime(oldest, (0, 0))
+
+    cache.max_bytes = sum(size for _, size, _ in entries) - 1
+    cache.evict()
+
+    remaining = [path for path, _, _ in cache.entries()]
+    assert len(remaining) == 2
+    assert oldest not in remaining, 'The least recently used instance should be evicted'
+
+
+def test_damaged_entry(tmp_path):
+    cache = InstanceCache(str(tmp_path))
+    FactoringSat.factorize_number(35, cache=cache)
+
+    path, _, _ = cache.entries()[0]
+    with open(path, 'wb') as file:
+        file.write(b'damaged')
+
+    assert FactoringSat.factorize_number(35, cache=cache).to_dimacs() == FactoringSat.factorize_number(35).to_dimacs()
+
+
+@pytest.mark.parametrize('truncate', [lambda size: size // 2, lambda size: size - 3])
+def test_truncated_entry(tmp_path, truncate):
+    cache = InstanceCache(str(tmp_path))
+    expected = FactoringSat.factorize_number(1000003, cache=cache)
+
+    path, size, _ = cache.entries()[0]
+    with open(path, 'r+b') as file:
+        file.truncate(truncate(size))
+
+    key = os.path.splitext(os.path.basename(path))[0]
+    assert cache.get(key) is None, 'A truncated entry should be a miss'
+    assert not cache.entries(), 'The truncated entry should be removed'
+
+    result = FactoringSat.factorize_number(1000003, cache=cache)
+    assert set(map(tuple, map(sorted, result.cnf.clauses))) == set(map(tuple, map(sorted, expected.cnf.clauses)))
+    assert os.path.getsize(cache.entries()[0][0]) == size, 'The instance should be encoded and stored again'
+
+
+def test_concurrent_writers(tmp_path):
+    directory = str(tmp_path)
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        outputs = list(executor.map(encode_cached, [directory] * 8, [1000003] * 8))
+
+    assert len(InstanceCache(directory).entries()) == 1
+    assert not [name for _, _, names in os.walk(directory) for name in names if name.endswith('.tmp')]
+    assert all(set(output.splitlines()) == set(outputs[0].splitlines()) for output in outputs)
+
+
+def test_batch(tmp_path):
+    cache = str(tmp_path / 'cache')
+    instances = batch.create_instances(str(tmp_path / 'out'), 100, 10000, 10, 1, 1, 1, seed=7, cache=cache)
+    rows = batch.generate_batch(instances, str(tmp_path / 'out'), workers=1)
+    assert len(InstanceCache(cache).entries()) == len(instances)
+
+    assert batch.generate_batch(instances, str(tmp_path / 'out'), workers=2) == rows
@@ -1,9 +1,12 @@
+import random
+
 import pytest
 from hypothesis import given, assume
 from hypothesis.strategies import integers, booleans
 
 from gen_factor_sat import utils
 from gen_factor_sat.circuit.instances import TseitinFactoringStrategy
+from gen_factor_sat.formula.cnf import CNFBuilder
 
 
 @pytest.fixture(scope='module')
@@ -67,3 +70,24 @@ def test_shift(tseitin_circuit, number, shifts):
 
     assert len(shifted_xs) == len(bin_number) + shifts
     assert utils.to_int(shifted_xs) == (2 ** shifts) * number
+
+
+@pytest.mark.parametrize('length', [1024, 4096, 16384])
+def test_n_bit_adder_scaling(tseitin_circuit, length):
+    rand = random.Random(length)
+    number_1 = rand.getrandbits(length) | (1 << (length - 1))
+    number_2 = rand.getrandbits(length // 2)
+
+    bin_result = tseitin_circuit.n_bit_adder(utils.to_bin_list(number_1), utils.to_bin_list(number_2), '1', None)
+    assert utils.to_int(bin_result) == number_1 + number_2 + 1, 'Large numbers should not exceed the recursion limit'
+
+    cnf_builder = CNFBuilder()
+    variables_1 = cnf_builder.next_variables(length)
+    variables_2 = cnf_builder.next_variables(length // 2)
+
+    tseitin_circuit.n_bit_adder(variables_1, variables_2, tseitin_circuit.zero, cnf_builder)
+
+    # Full adders without carry need 2 gates, full adders need 2 cells, and half adders need 2 gates
+    expected_gates = 2 + 2 * (len(variables_2) - 1) + 2 * (len(variables_1) - len(variables_2))
+    assert cnf_builder.number_of_variables == len(variables_1) + len(variables_2) + expected_gates, \
+        'The number of gates should grow linearly'
@@ -0,0 +1,62 @@
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, lists, sets
+
+import gen_factor_sat.circuit.tseitin.encoding as te
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.clause_store import ClauseStore
+from gen_factor_sat.formula.cnf import CNF, is_no_tautology
+from gen_factor_sat.formula.symbol import variable
+
+literals = integers(min_value=-50, max_value=50).filter(bool)
+
+
+@given(lists(sets(literals, max_size=4), max_size=100))
+def test_store_behaves_like_filtered_set(clauses):
+    store = ClauseStore(capacity=1)
+    store.update(clauses)
+
+    expected = set(filter(is_no_tautology, map(frozenset, clauses)))
+
+    assert len(store) == len(expected), 'Duplicates and tautologies should be removed'
+    assert set(map(frozenset, store)) == expected, 'The store should contain all remaining clauses'
+    assert store == expected
+
+
+def test_clauses_are_sorted_and_ordered():
+    store = ClauseStore()
+    store.update([te.clause([variable(3), variable(-1)]), te.unit_clause(variable(7)), te.empty_clause()])
+
+    assert list(store) == [(-1, 3), (7,), ()], 'Clauses should be sorted and kept in insertion order'
+
+
+def test_tautologies_are_not_added():
+    store = ClauseStore()
+
+    assert not store.add([1, -1, 2]), 'Tautologies should be rejected'
+    assert store.add([1, 2]), 'New clauses should be accepted'
+    assert not store.add([2, 1]), 'Duplicates should be rejected'
+    assert len(store) == 1
+
+
+def test_store_to_dimacs():
+    store = ClauseStore()
+    store.update(te.xor_equality(variable(1), variable(2), variable(3)))
+
+    dimacs = CNF(3, store).to_dimacs()
+    lines = dimacs.splitlines()
+
+    assert lines[0] == 'p cnf 3 4'
+    assert set(lines[1:]) == {'-3 -2 -1 0', '-2 1 3 0', '-1 2 3 0', '-3 1 2 0'}
+
+
+@pytest.mark.parametrize('number', [2, 17, 2 ** 15 + 17896, 2 ** 23 + 1247561])
+def test_compact_factoring(number):
+    factor_sat = FactoringSat.factorize_number(number)
+    compact_factor_sat = FactoringSat.factorize_number(number, compact=True)
+
+    assert isinstance(compact_factor_sat.cnf.clauses, ClauseStore)
+    assert compact_factor_sat.cnf.number_of_variables == factor_sat.cnf.number_of_variables
+    assert set(map(frozenset, compact_factor_sat.cnf.clauses)) == factor_sat.cnf.clauses, \
+        'The compact encoding should produce the same clauses'
+    assert compact_factor_sat == factor_sat
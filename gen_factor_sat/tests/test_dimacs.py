@@ -1,3 +1,4 @@
+import io
 import re
 from collections import Counter
 
@@ -121,3 +122,50 @@ def test_encoded_cnf(factoring_instance):
 
     assert len(clauses) == len(factoring_instance.cnf.clauses)
     assert set(clauses) == factoring_instance.cnf.clauses
+
+
+class UnseekableStringIO(io.StringIO):
+    def seekable(self):
+        return False
+
+
+@pytest.mark.parametrize('file_type', [io.StringIO, UnseekableStringIO])
+def test_streamed_dimacs(factoring_instance, file_type):
+    file = file_type()
+    streamed_instance = FactoringSat.factorize_number(factoring_instance.number.value, file=file)
+    dimacs = file.getvalue()
+
+    clauses = set()
+    lines = dimacs.splitlines(keepends=False)
+    comments = [line[2:] for line in lines if comment_line.match(line)]
+    assert comments == factoring_instance.comments(), 'The comments should be written upfront'
+
+    for line in lines:
+        if problem_line.match(line):
+            match = problem_line.match(line)
+            assert int(match.group('variables')) == factoring_instance.cnf.number_of_variables
+            assert int(match.group('clauses')) == len(factoring_instance.cnf.clauses)
+
+        elif clause_line.match(line):
+            clauses.add(frozenset(map(int, line.split(' ')[:-1])))
+
+    assert clauses == factoring_instance.cnf.clauses, 'The streamed clauses should match the stored ones'
+    assert len(streamed_instance.cnf.clauses) == len(factoring_instance.cnf.clauses)
+    assert streamed_instance.cnf.number_of_variables == factoring_instance.cnf.number_of_variables
+
+
+def test_streamed_append(tmp_path):
+    expected = io.StringIO()
+    FactoringSat.factorize_number(35, file=expected)
+
+    filename = str(tmp_path / 'factor.cnf')
+    with open(filename, 'w') as file:
+        file.write('c previous\n')
+
+    with open(filename, 'a') as file:
+        FactoringSat.factorize_number(35, file=file)
+
+    with open(filename) as file:
+        assert file.read() == 'c previous\n' + expected.getvalue(), 'The problem line should precede the clauses'
+
+    assert all(line == line.rstrip() for line in expected.getvalue().splitlines() if problem_line.match(line))
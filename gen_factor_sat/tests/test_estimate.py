@@ -0,0 +1,65 @@
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import booleans, integers, sampled_from
+
+import gen_factor_sat
+from gen_factor_sat import estimate
+from gen_factor_sat.circuit.instances import strategies
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.template import TemplateCache
+
+
+@settings(deadline=None)
+@given(integers(min_value=2, max_value=2 ** 64), sampled_from(sorted(strategies())), booleans())
+def test_counts(number, strategy, polarity):
+    counted = FactoringSat.factorize_number(number, strategy=strategies()[strategy](), polarity=polarity, count=True)
+    stored = FactoringSat.factorize_number(number, strategy=strategies()[strategy](), polarity=polarity, compact=True)
+    sink = counted.cnf.clauses
+
+    assert counted.cnf.number_of_variables == stored.cnf.number_of_variables
+    assert len(sink) == len(stored.cnf.clauses)
+    assert sink.number_of_literals == len(stored.cnf.clauses.literals)
+    assert sum(sink.lengths.values()) == len(sink)
+    assert sink.dimacs_bytes == len(stored.to_dimacs()) + 1, 'The size should match the DIMACS'
+
+
+@settings(deadline=None, max_examples=20)
+@given(integers(min_value=2, max_value=2 ** 32))
+def test_template(number):
+    templates = TemplateCache()
+    counted = FactoringSat.factorize_number(number, templates=templates, count=True)
+    assert len(counted.cnf.clauses) == len(FactoringSat.factorize_number(number).cnf.clauses)
+
+
+@pytest.mark.parametrize('bits', [2, 17, 64])
+def test_estimate(bits):
+    entry = estimate.estimate('TseitinFactoringStrategy', bits, seed=3)
+    assert entry.number.bit_length() == bits
+
+    stored = FactoringSat.factorize_number(entry.number, compact=True)
+    assert entry.variables == stored.cnf.number_of_variables
+    assert entry.clauses == len(stored.cnf.clauses)
+    assert entry.compact_bytes == stored.cnf.clauses.nbytes
+
+
+def test_incompatible_options():
+    with pytest.raises(ValueError):
+        FactoringSat.factorize_number(35, count=True, file=io.StringIO())
+
+    with pytest.raises(ValueError):
+        FactoringSat.factorize_number(35, count=True, simplify=True)
+
+    with pytest.raises(ValueError):
+        estimate.estimate('UnknownStrategy', 16)
+
+
+def test_without_resource():
+    # The resource module only exists on Unix, the CLI and the estimator must not depend on it
+    code = "import sys; sys.modules['resource'] = None; import gen_factor_sat.estimate, gen_factor_sat.benchmark.scaling"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(gen_factor_sat.__file__)))
+    subprocess.run([sys.executable, '-c', code], cwd=root, check=True)
@@ -41,10 +41,15 @@ def test_seeded_reproducibility(max_value, min_value, seed):
 @settings(deadline=None)
 def test_seeded_prime_reproducibility(max_value, min_value, seed, prime, error):
     assume(min_value <= max_value - 10)
-    factoring_1 = FactoringSat.factorize_random_number(max_value, min_value, seed, prime, error)
-    factoring_2 = FactoringSat.factorize_random_number(max_value, min_value, seed, prime, error)
 
-    assert factoring_1 == factoring_2, 'Multiple calls should yield the same result'
+    def factorize():
+        try:
+            return FactoringSat.factorize_random_number(max_value, min_value, seed, prime, error)
+        except StopIteration as e:
+            # Without iterations of the prime test (error 1.0) no composite number can be found
+            return str(e)
+
+    assert factorize() == factorize(), 'Multiple calls should yield the same result'
 
 
 @pytest.mark.parametrize("factor_1", [2, 2 ** 10 + 659, 2 ** 15 + 5217])
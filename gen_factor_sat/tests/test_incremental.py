@@ -0,0 +1,62 @@
+import io
+
+import pytest
+from pysat.solvers import Solver
+
+import gen_factor_sat.tests.utils as test_utils
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.number_generator import is_prime
+
+numbers = list(range(2 ** 11, 2 ** 11 + 40))
+
+
+def test_incremental_queries():
+    factor_sat = FactoringSat.factorize_numbers(numbers)
+
+    with Solver(name='cadical', bootstrap_with=factor_sat.cnf.clauses) as solver:
+        for number in numbers:
+            if is_prime(number):
+                assert not solver.solve(assumptions=factor_sat.assumptions(number)), \
+                    'A prime number should be in UNSAT'
+            else:
+                assert solver.solve(assumptions=factor_sat.assumptions(number)), \
+                    'A composite number should be in SAT'
+
+                model = solver.get_model()
+                result_a = test_utils.assignment_to_int(factor_sat.factor_1, model)
+                result_b = test_utils.assignment_to_int(factor_sat.factor_2, model)
+                assert result_a * result_b == number, 'The factors should be valid'
+                assert 1 not in (result_a, result_b)
+
+
+def test_icnf_format():
+    factor_sat = FactoringSat.factorize_numbers([35, 33, 39], compact=True)
+    lines = factor_sat.to_icnf().splitlines()
+
+    assert 'c To reproduce this results call: gen_factor_sat numbers 35 33 39' in lines
+    assert lines[len(factor_sat.comments())] == 'p inccnf'
+    assert lines[-3:] == ['a 9 -10 -11 -12 13 14 0', 'a 9 -10 -11 -12 -13 14 0', 'a 9 -10 -11 12 13 14 0']
+
+    file = io.StringIO()
+    FactoringSat.factorize_numbers([35, 33, 39], file=file)
+    assert set(map(frozenset, map(str.split, file.getvalue().splitlines()))) \
+           == set(map(frozenset, map(str.split, lines))), 'The streamed iCNF should contain the same lines'
+    assert file.getvalue().splitlines()[-3:] == lines[-3:], 'The assumptions should follow the clauses'
+
+
+def test_shared_circuit_size():
+    shared = FactoringSat.factorize_numbers(numbers, compact=True).to_icnf()
+    separate = sum(len(FactoringSat.factorize_number(number).to_dimacs()) for number in numbers)
+
+    assert len(shared) * 10 < separate, 'The shared circuit should be much smaller than separate instances'
+
+
+def test_invalid_numbers():
+    with pytest.raises(ValueError):
+        FactoringSat.factorize_numbers([])
+
+    with pytest.raises(ValueError):
+        FactoringSat.factorize_numbers([35, 7])
+
+    with pytest.raises(ValueError):
+        FactoringSat.factorize_numbers([35]).assumptions(7)
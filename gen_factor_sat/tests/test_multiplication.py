@@ -1,11 +1,13 @@
 import pytest
-from hypothesis import given, assume
+from hypothesis import given, assume, settings
 from hypothesis.strategies import integers
 
 import gen_factor_sat.tests.utils as test_utils
 from gen_factor_sat import utils
 from gen_factor_sat.circuit.instances import ConstantFactoringStrategy, ConstantWallaceFactoringStrategy, \
-    TseitinFactoringStrategy, TseitinWallaceFactoringStrategy
+    TseitinFactoringStrategy, TseitinWallaceFactoringStrategy, TseitinHashingFactoringStrategy, \
+    ConstantDaddaFactoringStrategy, TseitinDaddaFactoringStrategy, ConstantToomCookFactoringStrategy, \
+    TseitinToomCookFactoringStrategy
 from gen_factor_sat.circuit.tseitin.circuit import CNFBuilder
 
 
@@ -34,11 +36,26 @@ def test_wallace(constant_wallace_strategy, factor_1, factor_2):
     assert run_eval_mult(constant_wallace_strategy, factor_1, factor_2) == factor_1 * factor_2
 
 
+@given(factor_1=integers(0, 2 ** 40), factor_2=integers(0, 2 ** 40))
+def test_dadda(factor_1, factor_2):
+    assert run_eval_mult(ConstantDaddaFactoringStrategy(), factor_1, factor_2) == factor_1 * factor_2
+
+
 @given(factor_1=integers(0, 2 ** 60), factor_2=integers(0, 2 ** 60))
 def test_karatsuba(constant_strategy, factor_1, factor_2):
     assert run_eval_mult(constant_strategy, factor_1, factor_2) == factor_1 * factor_2
 
 
+@given(factor_1=integers(0, 2 ** 200), factor_2=integers(0, 2 ** 200))
+@settings(deadline=None, max_examples=50)
+def test_toom_cook(factor_1, factor_2):
+    strategy = ConstantToomCookFactoringStrategy()
+    strategy.toom_min_len = 30
+
+    assert run_eval_mult(strategy, factor_1, factor_2) == factor_1 * factor_2
+    assert run_eval_mult(strategy, factor_1, factor_2) == run_eval_mult(ConstantFactoringStrategy(), factor_1, factor_2)
+
+
 @given(factor_1=integers(2 ** 21, 2 ** 60), factor_2=integers(0, 2 ** 30))
 def test_split_simplification(constant_strategy, factor_1, factor_2):
     assume(len(utils.to_bin_list(factor_1)) > 2 * len(utils.to_bin_list(factor_2)))
@@ -57,6 +74,40 @@ def test_tseitin_mult(tseitin_strategy, factor_1, factor_2):
     assert run_tseitin_mult(tseitin_strategy, factor_1, factor_2) == factor_1 * factor_2
 
 
+@pytest.mark.parametrize('factor_1', [1, 17, 2 ** 10 + 865, 2 ** 21 + 46196])
+@pytest.mark.parametrize('factor_2', [0, 2, 2 ** 21 + 510579])
+def test_tseitin_hashing_mult(factor_1, factor_2):
+    assert run_tseitin_mult(TseitinHashingFactoringStrategy(), factor_1, factor_2) == factor_1 * factor_2
+
+
+@pytest.mark.parametrize('factor_1', [1, 17, 2 ** 10 + 865, 2 ** 21 + 46196])
+@pytest.mark.parametrize('factor_2', [0, 2, 2 ** 21 + 510579])
+def test_tseitin_dadda_mult(factor_1, factor_2):
+    assert run_tseitin_mult(TseitinDaddaFactoringStrategy(), factor_1, factor_2) == factor_1 * factor_2
+
+
+@pytest.mark.parametrize('factor_1', [1, 2 ** 31 + 865, 2 ** 47 + 46196])
+@pytest.mark.parametrize('factor_2', [0, 2 ** 40 + 7, 2 ** 47 + 510579])
+def test_tseitin_toom_cook_mult(factor_1, factor_2):
+    strategy = TseitinToomCookFactoringStrategy()
+    strategy.toom_min_len = 30
+
+    assert run_tseitin_mult(strategy, factor_1, factor_2) == factor_1 * factor_2
+
+
+def test_dadda_uses_fewer_gates():
+    wallace_builder, dadda_builder = CNFBuilder(), CNFBuilder()
+
+    for strategy, cnf_builder in [(TseitinWallaceFactoringStrategy(), wallace_builder),
+                                  (TseitinDaddaFactoringStrategy(), dadda_builder)]:
+        factor_1 = cnf_builder.next_variables(32)
+        factor_2 = cnf_builder.next_variables(32)
+        strategy.multiply(factor_1, factor_2, cnf_builder)
+
+    assert dadda_builder.number_of_variables < wallace_builder.number_of_variables
+    assert len(dadda_builder.build_clauses()) < len(wallace_builder.build_clauses())
+
+
 def run_eval_mult(circuit, factor_1, factor_2):
     bin_factor_1 = utils.to_bin_list(factor_1)
     bin_factor_2 = utils.to_bin_list(factor_2)
@@ -0,0 +1,86 @@
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, floats
+
+from gen_factor_sat import number_generator
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.number_generator import Number, DetPrime, DetComposite, ProbPrime, is_prime, is_prob_prime
+
+
+def sieve(limit):
+    primes = [True] * limit
+    primes[0] = primes[1] = False
+    for x in range(2, limit):
+        if primes[x]:
+            for y in range(x * x, limit, x):
+                primes[y] = False
+
+    return primes
+
+
+def test_small_numbers():
+    primes = sieve(2 ** 16)
+    assert all(is_prime(x) == primes[x] for x in range(2, len(primes))), 'Should match the sieve'
+
+
+def test_baillie_psw():
+    primes = sieve(2 ** 16)
+    assert all(
+        (number_generator._miller_rabin(x, 2) and number_generator._strong_lucas(x)) == primes[x]
+        for x in range(3, len(primes), 2)
+    ), 'The Baillie-PSW test should match the sieve'
+
+
+@pytest.mark.parametrize('value', [
+    2 ** 61 - 1,
+    2 ** 89 - 1,
+    2 ** 127 - 1,
+    2 ** 521 - 1,
+    3317044064679887385961783
+])
+def test_large_primes(value):
+    assert is_prime(value)
+
+
+@pytest.mark.parametrize('value', [
+    561,  # Carmichael numbers
+    1105,
+    2047,  # Strong pseudoprimes to base 2
+    3215031751,
+    3825123056546413051,  # Strong pseudoprime to the bases 2 ... 23
+    318665857834031151167461,  # Strong pseudoprime to the bases 2 ... 37
+    3317044064679887385961981,  # Strong pseudoprime to the bases 2 ... 41
+    (2 ** 61 - 1) * (2 ** 89 - 1),
+    (2 ** 127 - 1) ** 2
+])
+def test_large_composites(value):
+    assert not is_prime(value)
+
+
+@pytest.mark.parametrize('value', [5459, 5777, 10877, 16109, 18971])
+def test_strong_lucas_pseudoprimes(value):
+    assert number_generator._strong_lucas(value), 'Strong Lucas pseudoprimes pass the Lucas test'
+    assert not number_generator._miller_rabin(value, 2), 'but are detected by the Miller-Rabin test'
+
+
+@given(integers(min_value=2, max_value=2 ** 64), integers(), floats(min_value=1e-12, max_value=0.5))
+def test_prob_prime(value, seed, error):
+    assert is_prob_prime(value, error, seed) == is_prob_prime(value, error, seed), 'The seed should be respected'
+
+    if is_prime(value):
+        assert is_prob_prime(value, error, seed), 'Prime numbers are never rejected'
+
+
+def test_seeded_prob_prime():
+    # The seeded results must not change, including composites that are declared prime for a large error
+    assert is_prob_prime(1018081, 0.5, 8) and is_prob_prime(1067089, 0.5, 87) and is_prob_prime(1104601, 0.5, 98)
+    assert not is_prob_prime(1018081, 0.5, 9)
+    assert all(is_prob_prime(91, 0.5, seed) for seed in [6, 10, 21])
+    assert is_prob_prime(2 * 1000003, 1.0, 0), 'Without iterations every number is declared prime'
+    assert is_prob_prime(28, 0.5, 13) and not is_prob_prime(28, 0.5, 0), 'Even numbers should be tested as before'
+    assert FactoringSat.factorize_random_number(100, 10, seed=38, prime=True, error=0.5).number == ProbPrime(91, 0.5)
+
+
+def test_create():
+    assert Number.create(2 ** 127 - 1, seed=0, error=0.0) == DetPrime(2 ** 127 - 1)
+    assert Number.create(2 ** 127 + 1, seed=0, error=0.0) == DetComposite(2 ** 127 + 1)
@@ -0,0 +1,59 @@
+import io
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import booleans, integers, sampled_from
+
+import gen_factor_sat.tests.utils as test_utils
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.cnf import CNF
+from gen_factor_sat.formula.ordering import ORDERS, order
+from gen_factor_sat.template import TemplateCache
+
+
+@settings(deadline=None, max_examples=20)
+@given(integers(min_value=2, max_value=2 ** 32), sampled_from(ORDERS), booleans())
+def test_deterministic(number, ordering, xor):
+    outputs = []
+    for compact, templates in [(False, None), (True, None), (False, TemplateCache())]:
+        file = io.StringIO()
+        FactoringSat.factorize_number(number, file=file, compact=compact, templates=templates, ordering=ordering, xor=xor)
+        outputs.append(file.getvalue())
+
+    assert outputs[0] == outputs[1] == outputs[2], 'The DIMACS should not depend on the container of the clauses'
+    assert '--order {0}'.format(ordering) in outputs[0]
+
+
+@settings(deadline=None)
+@given(integers(min_value=2, max_value=2 ** 32))
+def test_topological(number):
+    result = FactoringSat.factorize_number(number, ordering='topological')
+    largest = [max(map(abs, clause), default=0) for clause in result.cnf.clauses]
+
+    assert largest == sorted(largest), 'The clauses should be grouped by their largest variable'
+    assert set(result.cnf.clauses) == set(map(tuple, map(sorted, FactoringSat.factorize_number(number).cnf.clauses)))
+
+
+@settings(deadline=None)
+@given(integers(min_value=2, max_value=2 ** 16), booleans())
+def test_breadth_first(number, simplify):
+    result = FactoringSat.factorize_number(number, ordering='bfs', simplify=simplify)
+    factors = result.factor_1 + result.factor_2
+    assert factors == list(range(1, len(factors) + 1)), 'The factors should keep the first variables'
+
+    satisfiable = test_utils.assert_factorization(result, number)
+    assert satisfiable == test_utils.is_satisfiable(FactoringSat.factorize_number(number).cnf), \
+        'The ordered CNF should be equisatisfiable'
+
+
+def test_breadth_first_numbering():
+    cnf = CNF(5, {frozenset([5, -1]), frozenset([4, 5]), frozenset([-3, 2])})
+    ordering = order(cnf, inputs=[2], renumber=True)
+
+    assert ordering.mapping == {2: 1, 3: 2, 1: 3, 4: 4, 5: 5}
+    assert ordering.cnf.clauses == [(-2, 1), (-3, 5), (4, 5)]
+
+
+def test_unknown_ordering():
+    with pytest.raises(ValueError):
+        FactoringSat.factorize_number(35, ordering='random')
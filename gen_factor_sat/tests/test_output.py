@@ -0,0 +1,109 @@
+import bz2
+import functools
+import gzip
+import io
+import lzma
+import os
+import tempfile
+
+import pytest
+
+from gen_factor_sat import batch, output
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.output import COMPRESSIONS, compression_of, default_number_file, write_cnf
+
+decompress = {'gz': gzip.open, 'xz': lzma.open, 'bz2': bz2.open}
+
+
+def test_compression_of():
+    assert compression_of('factor.cnf.gz') == 'gz'
+    assert compression_of('out/factor.cnf.xz') == 'xz'
+    assert compression_of('factor.cnf.bz2') == 'bz2'
+    assert compression_of('factor.cnf') is None
+
+
+@pytest.mark.parametrize('compression', COMPRESSIONS)
+@pytest.mark.parametrize('number', [2, 35, 1000003, 2 ** 32 + 15])
+def test_compressed_file(tmp_path, compression, number):
+    expected = io.StringIO()
+    FactoringSat.factorize_number(number, file=expected)
+
+    encode = functools.partial(FactoringSat.factorize_number, number)
+    filename = os.path.join(str(tmp_path), 'factor.cnf.{0}'.format(compression))
+    write_cnf(encode, filename, default_number_file)
+
+    with decompress[compression](filename, 'rt') as file:
+        assert file.read() == expected.getvalue()
+
+
+@pytest.mark.parametrize('compression', COMPRESSIONS)
+def test_compressed_spool(tmp_path, monkeypatch, compression):
+    expected = io.StringIO()
+    FactoringSat.factorize_number(1000003, file=expected)
+
+    # Keep the temporary files to inspect them afterwards
+    spool = tmp_path / 'spool'
+    spool.mkdir()
+    directories = []
+
+    def temporary_file(mode='w+b', dir=None, **kwargs):
+        directories.append(dir)
+        return tempfile.NamedTemporaryFile(mode=mode, dir=str(spool), delete=False, **kwargs)
+
+    monkeypatch.setattr(tempfile, 'TemporaryFile', temporary_file)
+    filename = os.path.join(str(tmp_path), 'factor.cnf.{0}'.format(compression))
+    write_cnf(functools.partial(FactoringSat.factorize_number, 1000003), filename, default_number_file)
+
+    assert directories == [str(tmp_path)], 'The clauses should be spooled next to the output'
+    temporary, = spool.iterdir()
+    clauses = decompress[compression](str(temporary), 'rt').read()
+    header, _ = expected.getvalue().split('p cnf ', 1)
+    assert clauses == expected.getvalue().split('\n', header.count('\n') + 1)[-1], \
+        'Only the compressed clauses should be spooled'
+
+
+@pytest.mark.parametrize('compression', COMPRESSIONS)
+def test_default_file(tmp_path, compression):
+    encode = functools.partial(FactoringSat.factorize_number, 1000003, ordering='topological')
+    write_cnf(encode, str(tmp_path), default_number_file, compression=compression)
+
+    filename = os.path.join(str(tmp_path), 'factor_number1000003.cnf.{0}'.format(compression))
+    with open(filename, 'rb') as file:
+        content = file.read()
+
+    os.remove(filename)
+    write_cnf(encode, str(tmp_path), default_number_file, compression=compression)
+    with open(filename, 'rb') as file:
+        assert file.read() == content, 'The compressed output should be deterministic'
+
+
+def test_compressed_batch(tmp_path):
+    instances = batch.create_instances(str(tmp_path), 100, 1000, 10, 1, 1, 1, seed=7, compression='gz')
+    rows = batch.generate_batch(instances, str(tmp_path), workers=1)
+
+    for instance, row in zip(instances, rows):
+        assert row[0].endswith('.cnf.gz')
+
+        expected = io.StringIO()
+        FactoringSat.factorize_random_number(
+            max_value=instance.max_value,
+            min_value=instance.min_value,
+            seed=instance.seed,
+            prime=instance.prime,
+            file=expected
+        )
+
+        with gzip.open(os.path.join(str(tmp_path), row[0]), 'rt') as file:
+            assert file.read() == expected.getvalue()
+
+
+def test_unwritable_file(tmp_path, monkeypatch):
+    def unwritable(*args, **kwargs):
+        raise PermissionError('read-only directory')
+
+    # The temporary file is never created, its removal must not hide the actual error
+    monkeypatch.setattr(output, 'open', unwritable, raising=False)
+    with pytest.raises(PermissionError, match='read-only'):
+        write_cnf(functools.partial(FactoringSat.factorize_number, 35), str(tmp_path), default_number_file)
+
+    assert os.listdir(str(tmp_path)) == []
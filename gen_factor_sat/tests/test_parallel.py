@@ -0,0 +1,77 @@
+import io
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import booleans, integers, sampled_from
+
+import gen_factor_sat.tests.utils as test_utils
+from gen_factor_sat.circuit import parallel
+from gen_factor_sat.circuit.instances import TseitinFactoringStrategy, TseitinHashingFactoringStrategy, \
+    TseitinWallaceFactoringStrategy
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.cnf import CNFBuilder
+from gen_factor_sat.formula.stats import EncodingStats
+
+
+def small_strategy(strategy_class=TseitinFactoringStrategy):
+    # Split small factors as well, such that the parallel expansion has several levels
+    strategy = strategy_class()
+    strategy.min_len = 4
+    return strategy
+
+
+@settings(deadline=None, max_examples=20)
+@given(integers(min_value=2, max_value=2 ** 24), integers(min_value=0, max_value=3), booleans(), booleans())
+def test_workers(number, depth, xor, polarity):
+    outputs = []
+    for workers in [1, 2]:
+        file = io.StringIO()
+        FactoringSat.factorize_number(
+            number, strategy=small_strategy(), file=file, xor=xor, polarity=polarity, parallel_depth=depth,
+            workers=workers
+        )
+        outputs.append(file.getvalue())
+
+    assert outputs[0] == outputs[1], 'The CNF should not depend on the number of workers'
+    assert '--parallel-depth {0}'.format(depth) in outputs[0]
+
+
+@settings(deadline=None, max_examples=20)
+@given(integers(min_value=2, max_value=64), integers(min_value=0, max_value=3))
+def test_size(bits, depth):
+    factor_1, factor_2 = list(range(1, bits + 1)), list(range(bits + 1, 2 * bits + 1))
+
+    serial_builder = CNFBuilder(2 * bits)
+    serial = small_strategy().multiply(factor_1, factor_2, serial_builder)
+
+    parallel_builder = CNFBuilder(2 * bits)
+    result = parallel.multiply(small_strategy(), factor_1, factor_2, parallel_builder, depth=depth, workers=1)
+
+    assert len(result) == len(serial)
+    assert parallel_builder.number_of_variables == serial_builder.number_of_variables
+    assert len(parallel_builder.clauses) == len(serial_builder.clauses), 'The same circuit should be encoded'
+
+
+@settings(deadline=None)
+@given(integers(min_value=2, max_value=2 ** 16), integers(min_value=1, max_value=3), sampled_from([
+    TseitinFactoringStrategy, TseitinHashingFactoringStrategy
+]), booleans(), booleans())
+def test_factorization(number, depth, strategy_class, xor, polarity):
+    result = FactoringSat.factorize_number(
+        number, strategy=small_strategy(strategy_class), xor=xor, polarity=polarity, parallel_depth=depth, workers=1
+    )
+
+    satisfiable = test_utils.assert_factorization(result, number)
+    assert satisfiable == test_utils.is_satisfiable(FactoringSat.factorize_number(number).cnf), \
+        'The parallel CNF should be equisatisfiable'
+
+
+def test_unsupported():
+    with pytest.raises(ValueError):
+        FactoringSat.factorize_number(1000003, strategy=TseitinWallaceFactoringStrategy(), parallel_depth=1)
+
+    with pytest.raises(ValueError):
+        FactoringSat.factorize_number(1000003, stats=EncodingStats(), parallel_depth=1)
+
+    with pytest.raises(ValueError):
+        FactoringSat.factorize_number(1000003, parallel_depth=-1)
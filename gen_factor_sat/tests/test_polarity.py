@@ -0,0 +1,68 @@
+import io
+
+from hypothesis import given, settings
+from hypothesis.strategies import booleans, integers
+
+import gen_factor_sat.tests.utils as test_utils
+from gen_factor_sat.circuit.instances import TseitinHashingFactoringStrategy
+from gen_factor_sat.circuit.tseitin.encoding import and_equality, or_equality
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.cnf import CNFBuilder
+from gen_factor_sat.template import TemplateCache
+
+
+def test_deferred_gates():
+    cnf_builder = CNFBuilder(2, polarity=True)
+    and_output = cnf_builder.from_tseitin(and_equality, 1, 2)
+    or_output = cnf_builder.from_tseitin(or_equality, 1, -and_output)
+    cnf_builder.from_tseitin(and_equality, 1, or_output)
+
+    assert not cnf_builder.clauses, 'The gates should be deferred'
+
+    cnf_builder.add_clauses({frozenset([or_output])})
+    assert cnf_builder.clauses == {
+        frozenset([or_output]),
+        frozenset([1, -and_output, -or_output]),
+        frozenset([-1, -2, and_output])
+    }, 'Only the required implications should be added'
+
+    cnf_builder.add_clauses({frozenset([-or_output])})
+    assert frozenset([-1, or_output]) in cnf_builder.clauses
+    assert frozenset([1, -and_output]) in cnf_builder.clauses, 'The converse polarity should be added'
+
+
+@settings(deadline=None)
+@given(integers(min_value=2, max_value=2 ** 16), booleans())
+def test_factorization(number, xor):
+    factor_sat = FactoringSat.factorize_number(number, xor=xor, polarity=True)
+    satisfiable = test_utils.assert_factorization(factor_sat, number)
+
+    plain = FactoringSat.factorize_number(number, xor=xor)
+    assert len(factor_sat.cnf.clauses) <= len(plain.cnf.clauses)
+    assert satisfiable == test_utils.is_satisfiable(plain.cnf), 'The encodings should be equisatisfiable'
+
+
+@settings(deadline=None, max_examples=20)
+@given(integers(min_value=2, max_value=2 ** 24))
+def test_template(number):
+    strategy = TseitinHashingFactoringStrategy()
+    templates = TemplateCache()
+
+    for value in [number, number]:
+        result = FactoringSat.factorize_number(value, strategy=strategy, templates=templates, polarity=True)
+        expected = FactoringSat.factorize_number(value, strategy=strategy, polarity=True)
+        assert set(result.cnf.clauses) == set(expected.cnf.clauses)
+
+    assert len(templates) == 1
+
+
+@given(integers(min_value=2, max_value=2 ** 24))
+def test_stream(number):
+    file = io.StringIO()
+    FactoringSat.factorize_number(number, file=file, polarity=True)
+    assert 'gen_factor_sat number --polarity {0}'.format(number) in file.getvalue()
+
+    expected = FactoringSat.factorize_number(number, polarity=True)
+    lines = file.getvalue().splitlines()
+    clauses = {frozenset(map(int, line.split()[:-1])) for line in lines if not line.startswith(('c', 'p'))}
+    assert clauses == set(expected.cnf.clauses)
@@ -0,0 +1,59 @@
+import pytest
+
+from gen_factor_sat.benchmark import scaling
+from gen_factor_sat.benchmark.scaling import ScalingPoint
+from gen_factor_sat.circuit.instances import TseitinFactoringStrategy
+
+
+def points(strategy, exponent, bits=(16, 32, 64, 128)):
+    return [
+        ScalingPoint(strategy, length, 0, 0.5 * length ** exponent, 1000, 2 * length ** 2, 7 * length ** 2)
+        for length in bits
+    ]
+
+
+def test_strategies():
+    strategies = scaling.strategies()
+
+    assert strategies['TseitinFactoringStrategy'] is TseitinFactoringStrategy
+    assert all(name.startswith('Tseitin') for name in strategies), 'Only strategies creating a CNF can be measured'
+
+
+@pytest.mark.parametrize('exponent', [1.0, 1.58, 2.0])
+def test_fit_exponent(exponent):
+    bits = [16, 32, 64, 128]
+    fitted_exponent, factor = scaling.fit_exponent(bits, [3 * x ** exponent for x in bits])
+
+    assert fitted_exponent == pytest.approx(exponent)
+    assert factor == pytest.approx(3)
+    assert scaling.fit_exponent([16], [1]) is None
+
+
+def test_compare():
+    baseline = scaling.to_json(points('S', 1.5), 'base', 'stream')
+    assert scaling.exponents(points('S', 1.5))['S']['time_ms'] == pytest.approx(1.5)
+
+    assert not scaling.compare(points('S', 1.5), baseline, 0.1, 0.1), 'Equal results should not regress'
+    assert not scaling.compare(points('T', 3.0), baseline, 0.1, 0.1), 'Only measured strategies are compared'
+
+    regressions = scaling.compare(points('S', 2.0), baseline, 10 ** 6, 0.1)
+    assert [(regression.metric, regression.bits) for regression in regressions] == [('time_ms', None)], \
+        'Superlinear growth should be detected by the exponent'
+
+    regressions = scaling.compare(points('S', 1.55), baseline, 0.2, 0.1)
+    assert {regression.bits for regression in regressions} == {64, 128}, \
+        'Values above the tolerance should be detected'
+
+    assert not scaling.compare(points('S', 2.0), baseline, 10 ** 6, 0.1, metrics=['clauses'])
+
+
+def test_sweep(tmp_path):
+    sweep = scaling.sweep(['TseitinFactoringStrategy'], [8, 4], seed=1, time_limit=60)
+
+    assert [point.bits for point in sweep] == [4, 8]
+    assert all(point.number.bit_length() == point.bits for point in sweep)
+    assert sweep[0].clauses < sweep[1].clauses
+
+    filename = str(tmp_path / 'baseline' / 'scaling.json')
+    scaling.store(filename, scaling.to_json(sweep, 'test', 'stream'))
+    assert not scaling.compare(sweep, scaling.load(filename), 0.0, 0.0, metrics=['variables', 'clauses'])
@@ -0,0 +1,93 @@
+import io
+import itertools
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, lists, sets
+from pysat.solvers import Solver
+
+import gen_factor_sat.tests.utils as test_utils
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.clause_store import ClauseStore
+from gen_factor_sat.formula.cnf import CNF
+from gen_factor_sat.formula.simplify import simplify, propagate_units
+
+literals = integers(min_value=-6, max_value=6).filter(bool)
+
+
+def brute_force_sat(number_of_variables, clauses):
+    for values in itertools.product([False, True], repeat=number_of_variables):
+        if all(any(values[abs(x) - 1] == (x > 0) for x in clause) for clause in clauses):
+            return True
+
+    return False
+
+
+@given(lists(sets(literals, min_size=1, max_size=3), max_size=20))
+def test_simplify_preserves_satisfiability(clauses):
+    cnf = CNF(6, set(map(frozenset, clauses)))
+    simplification = simplify(cnf)
+
+    assert brute_force_sat(6, cnf.clauses) == brute_force_sat(
+        simplification.cnf.number_of_variables,
+        simplification.cnf.clauses
+    ), 'The simplified CNF should be equisatisfiable'
+
+    variables = {abs(x) for clause in simplification.cnf.clauses for x in clause}
+    assert variables == set(range(1, simplification.cnf.number_of_variables + 1)), \
+        'The variables should be numbered densely'
+    assert all(len(clause) > 1 for clause in simplification.cnf.clauses if clause), \
+        'No units should remain'
+
+
+def test_simplify_keeps_variables():
+    cnf = CNF(5, {frozenset([5]), frozenset([-5, 3]), frozenset([-3, 1, 4]), frozenset([2, 4, -1])})
+    simplification = simplify(cnf, keep=[3, 2])
+
+    assert simplification.map_variables([3, 2, 5]) == [1, 2, '1']
+    assert simplification.cnf.clauses == {frozenset([1]), frozenset([3, 4]), frozenset([2, 4, -3])}
+    assert simplification.cnf.number_of_variables == 4
+
+
+def test_conflict():
+    assert propagate_units([(1,), (-1, 2), (-2, -1)]) is None
+
+    simplification = simplify(CNF(3, {frozenset([1]), frozenset([-1, 2]), frozenset([-2, -1])}), keep=[3])
+    assert simplification.cnf.clauses == {frozenset()}, 'A conflict should result in the empty clause'
+    assert simplification.cnf.number_of_variables == 1
+
+
+@pytest.mark.parametrize('number', [6, 35, 2 ** 10 + 659, (2 ** 10 + 659) * (2 ** 15 + 1414)])
+def test_simplified_composite(number):
+    factor_sat = FactoringSat.factorize_number(number, simplify=True)
+    unsimplified = FactoringSat.factorize_number(number)
+
+    assert factor_sat.simplified
+    assert factor_sat.cnf.number_of_variables < unsimplified.cnf.number_of_variables
+    assert factor_sat.factor_1 == list(range(1, len(unsimplified.factor_1) + 1)), 'Factors should be numbered first'
+
+    with Solver(name='cadical', bootstrap_with=factor_sat.cnf.clauses) as solver:
+        assert solver.solve(), 'The simplified formula of a composite number should be in SAT'
+
+        for model in solver.enum_models():
+            result_a = test_utils.assignment_to_int(factor_sat.factor_1, model)
+            result_b = test_utils.assignment_to_int(factor_sat.factor_2, model)
+            assert result_a * result_b == number, 'The factors should remain valid'
+            assert 1 not in (result_a, result_b)
+
+
+@pytest.mark.parametrize('number', [2, 3, 1031, 32771])
+def test_simplified_prime(number):
+    factor_sat = FactoringSat.factorize_number(number, simplify=True)
+
+    with Solver(name='cadical', bootstrap_with=factor_sat.cnf.clauses) as solver:
+        assert not solver.solve(), 'The simplified formula of a prime number should be in UNSAT'
+
+
+def test_simplified_dimacs():
+    file = io.StringIO()
+    factor_sat = FactoringSat.factorize_number(2 ** 15 + 17896, file=file, simplify=True)
+
+    assert isinstance(factor_sat.cnf.clauses, ClauseStore)
+    assert 'gen_factor_sat number --simplify 50664' in file.getvalue()
+    assert file.getvalue().split() == factor_sat.to_dimacs().split(), 'The simplified CNF should be written'
@@ -0,0 +1,78 @@
+from hypothesis import given, settings, strategies as st
+
+from gen_factor_sat import utils
+from gen_factor_sat.circuit import simulation
+from gen_factor_sat.circuit.instances import BitParallelFactoringStrategy, BitParallelWallaceFactoringStrategy, \
+    BitParallelDaddaFactoringStrategy, BitParallelToomCookFactoringStrategy, ConstantFactoringStrategy
+
+LANES = 1000
+
+
+def karatsuba(lanes):
+    strategy = BitParallelFactoringStrategy(lanes)
+    strategy.min_len = 8
+    return strategy
+
+
+def toom_cook(lanes):
+    strategy = BitParallelToomCookFactoringStrategy(lanes)
+    strategy.toom_min_len = 16
+    strategy.min_len = 8
+    return strategy
+
+
+@given(st.lists(st.integers(min_value=0, max_value=2 ** 64 - 1), max_size=50))
+def test_pack_unpack(values):
+    wires = simulation.pack(values, 64)
+    assert len(wires) == 64
+    assert simulation.unpack(wires, len(values)) == values
+
+
+@settings(deadline=None, max_examples=5)
+@given(st.integers(min_value=0), st.sampled_from([1, 2, 17, 64, 256, 1024]), st.integers(min_value=1, max_value=64))
+def test_karatsuba(seed, width_1, width_2):
+    factors_1, factors_2 = simulation.random_factors(seed, LANES, width_1, width_2)
+    products = simulation.multiply(karatsuba, factors_1, factors_2, width_1, width_2)
+    assert products == [x * y for x, y in zip(factors_1, factors_2)]
+
+
+@settings(deadline=None, max_examples=5)
+@given(st.integers(min_value=0), st.sampled_from([1, 2, 17, 64, 256, 1024]))
+def test_toom_cook(seed, width):
+    factors_1, factors_2 = simulation.random_factors(seed, LANES, width)
+    products = simulation.multiply(toom_cook, factors_1, factors_2, width)
+    assert products == [x * y for x, y in zip(factors_1, factors_2)]
+
+
+@settings(deadline=None, max_examples=5)
+@given(st.integers(min_value=0), st.sampled_from([1, 2, 17, 64, 256]), st.integers(min_value=1, max_value=256))
+def test_wallace_dadda(seed, width_1, width_2):
+    factors_1, factors_2 = simulation.random_factors(seed, LANES, width_1, width_2)
+    expected = [x * y for x, y in zip(factors_1, factors_2)]
+
+    assert simulation.multiply(BitParallelWallaceFactoringStrategy, factors_1, factors_2, width_1, width_2) == expected
+    assert simulation.multiply(BitParallelDaddaFactoringStrategy, factors_1, factors_2, width_1, width_2) == expected
+
+
+@settings(deadline=None, max_examples=3)
+@given(st.integers(min_value=0))
+def test_agreement(seed):
+    width = 256
+    factors_1, factors_2 = simulation.random_factors(seed, LANES, width)
+
+    results = [
+        simulation.multiply(strategy, factors_1, factors_2, width)
+        for strategy in [karatsuba, toom_cook, BitParallelWallaceFactoringStrategy, BitParallelDaddaFactoringStrategy]
+    ]
+
+    assert all(result == results[0] for result in results)
+
+
+@given(st.integers(min_value=0, max_value=2 ** 40), st.integers(min_value=0, max_value=2 ** 40))
+def test_constant_agreement(factor_1, factor_2):
+    bin_1 = utils.to_bin_list(factor_1)
+    bin_2 = utils.to_bin_list(factor_2)
+    constant_product = utils.to_int(ConstantFactoringStrategy().multiply(bin_1, bin_2, None))
+
+    products = simulation.multiply(karatsuba, [factor_1], [factor_2], len(bin_1), len(bin_2))
+    assert products == [constant_product]
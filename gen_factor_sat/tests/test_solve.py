@@ -0,0 +1,66 @@
+import csv
+
+import pytest
+
+from gen_factor_sat import solve
+from gen_factor_sat.factoring_sat import FactoringSat
+
+
+@pytest.mark.parametrize('simplify', [False, True])
+@pytest.mark.parametrize('xor', [False, True])
+def test_solve(simplify, xor):
+    composite = solve.solve(FactoringSat.factorize_number(2 ** 10 + 659, simplify=simplify, xor=xor))
+    assert composite.result == solve.SATISFIABLE
+    assert composite.type == 'composite'
+    assert composite.factor_1 * composite.factor_2 == 2 ** 10 + 659
+    assert 1 not in (composite.factor_1, composite.factor_2)
+
+    prime = solve.solve(FactoringSat.factorize_number(1031, simplify=simplify, xor=xor), 'glucose4')
+    assert prime.result == solve.UNSATISFIABLE
+    assert prime.type == 'prime'
+    assert prime.factor_1 is None and prime.solver == 'glucose4'
+
+
+def test_portfolio():
+    factor_sat = FactoringSat.factorize_random_number(2 ** 20, 2 ** 19, seed=3, prime=False)
+    result = solve.solve_portfolio(factor_sat, ['cadical', 'glucose4', 'minisat22'])
+
+    assert result.result == solve.SATISFIABLE
+    assert result.solver in ('cadical', 'glucose4', 'minisat22')
+    assert result.factor_1 * result.factor_2 == factor_sat.number.value
+
+
+def test_portfolio_timeout():
+    hard = FactoringSat.factorize_number((2 ** 40 + 15) * (2 ** 40 + 63))
+    result = solve.solve_portfolio(hard, ['cadical'], timeout=0.2)
+
+    assert result.result == solve.UNKNOWN
+    assert result.type == 'random'
+    assert result.solver is None
+
+
+def test_portfolio_errors():
+    factor_sat = FactoringSat.factorize_number(35)
+
+    with pytest.raises(ValueError):
+        solve.solve_portfolio(factor_sat, ['unknown-solver'])
+
+    assert solve.solve_portfolio(factor_sat, ['unknown-solver', 'cadical']).result == solve.SATISFIABLE, \
+        'A failing solver should not abort the portfolio'
+
+
+def test_append_results(tmp_path):
+    filename = str(tmp_path / 'results.csv')
+    results = [solve.solve(FactoringSat.factorize_number(number)) for number in (35, 1031)]
+
+    solve.append_results(filename, results[:1])
+    solve.append_results(filename, results[1:])
+
+    with open(filename, newline='') as file:
+        rows = list(csv.reader(file))
+
+    assert rows[0] == solve.RESULTS_HEADER
+    assert [row[:4] for row in rows[1:]] == [
+        ['35', '6', 'composite', 'SATISFIABLE'],
+        ['1031', '11', 'prime', 'UNSATISFIABLE']
+    ]
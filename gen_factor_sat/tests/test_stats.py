@@ -0,0 +1,108 @@
+import io
+
+import pytest
+
+from gen_factor_sat.circuit.instances import TseitinFactoringStrategy, TseitinHashingFactoringStrategy
+from gen_factor_sat.circuit.instrumentation import instrument
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.stats import EncodingStats, InstrumentedCNFBuilder
+from gen_factor_sat.template import TemplateCache
+
+
+@pytest.mark.parametrize('strategy', [TseitinFactoringStrategy(), TseitinHashingFactoringStrategy()])
+@pytest.mark.parametrize('number', [2, 17, 2 ** 15 + 17896, 2 ** 61 - 1])
+def test_stats_do_not_change_encoding(strategy, number):
+    stats = EncodingStats()
+    factor_sat = FactoringSat.factorize_number(number, strategy=strategy, stats=stats)
+
+    assert factor_sat == FactoringSat.factorize_number(number, strategy=strategy), \
+        'The instrumented encoding should be the same'
+    assert stats.number_of_variables == factor_sat.cnf.number_of_variables
+    assert stats.number_of_clauses == len(factor_sat.cnf.clauses)
+
+
+def test_stats_counts():
+    stats = EncodingStats()
+    factor_sat = FactoringSat.factorize_number(2 ** 61 - 1, stats=stats)
+
+    created = sum(gate['created'] for gate in stats.gates.values())
+    assert created == factor_sat.cnf.number_of_variables - 31 - 60, \
+        'Every variable except the factors should be allocated by a gate'
+    assert stats.gates['and']['folded'] > 0, 'Gates with constant inputs should be folded'
+
+    assert sum(stats.clauses.values()) >= len(factor_sat.cnf.clauses), 'All emitted clauses should be counted'
+    assert stats.clauses[1] == 1, 'Only the expected result should be a unit clause'
+
+
+def test_stats_multiplication_levels():
+    stats = EncodingStats()
+    FactoringSat.factorize_number(2 ** 127 - 1, stats=stats)
+
+    assert stats.operations['multiply[0]']['calls'] == 1
+    assert stats.operations['multiply[1]']['calls'] == 3, 'Karatsuba should recurse three times'
+    assert all(operation['time_ms'] >= 0 for operation in stats.operations.values())
+    assert set(stats.phases) == {'allocate', 'circuit', 'build'}
+
+
+def test_stats_with_templates_and_simplification():
+    templates = TemplateCache()
+    FactoringSat.factorize_number(2 ** 15 + 1, templates=templates)
+
+    stats = EncodingStats()
+    dimacs = io.StringIO()
+    factor_sat = FactoringSat.factorize_number(2 ** 15 + 3, file=dimacs, templates=templates, simplify=True, stats=stats)
+
+    assert set(stats.phases) == {'template', 'circuit', 'build', 'simplify', 'write'}
+    assert not any(key.startswith('multiply') for key in stats.operations), \
+        'The multiplication of a cached template should not be counted'
+    assert stats.number_of_clauses == len(factor_sat.cnf.clauses)
+
+
+def test_instrumented_strategy():
+    strategy = TseitinFactoringStrategy()
+    strategy.min_len = 4
+
+    instrumented = instrument(strategy)
+    assert instrumented.min_len == 4, 'The configuration should be copied'
+    assert type(instrument(TseitinFactoringStrategy())) is type(instrumented), 'The class should be reused'
+    assert instrument(instrumented) is instrumented
+
+    stats = EncodingStats()
+    writer = InstrumentedCNFBuilder(stats)
+    x, y = writer.next_variables(2)
+
+    instrumented.wire_and(x, y, writer)
+    instrumented.wire_and(x, instrumented.zero, writer)
+    instrumented.wire_not(x, writer)
+
+    assert stats.gates['and'] == {'created': 1, 'folded': 1}
+    assert stats.gates['not'] == {'created': 0, 'folded': 1}, 'A negation should not allocate a variable'
+    assert stats.clauses == {2: 2, 3: 1}
+
+
+@pytest.mark.parametrize('strategy', [TseitinFactoringStrategy(), TseitinHashingFactoringStrategy()])
+def test_derived_gates(strategy):
+    stats = EncodingStats()
+    writer = InstrumentedCNFBuilder(stats)
+    instrumented = instrument(strategy)
+    x, y = writer.next_variables(2)
+
+    instrumented.wire_or(x, y, writer)
+    instrumented.xor(x, y, writer)
+
+    assert dict(stats.gates) == {'or': {'created': 1, 'folded': 0}, 'xor': {'created': 1, 'folded': 0}}, \
+        'Only the outermost gate should be counted'
+
+    if isinstance(strategy, TseitinHashingFactoringStrategy):
+        instrumented.wire_or(x, y, writer)
+        assert stats.gates['or'] == {'created': 1, 'folded': 1}, 'An existing gate should be folded'
+
+
+def test_stats_to_dict():
+    stats = EncodingStats()
+    FactoringSat.factorize_number(1000003, stats=stats)
+
+    result = stats.to_dict()
+    assert result['variables'] == stats.number_of_variables
+    assert set(result['gates']) == {'and', 'or', 'not', 'xor', 'xor3', 'majority'}
+    assert all(isinstance(length, str) for length in result['clause_lengths'])
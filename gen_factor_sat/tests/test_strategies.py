@@ -2,6 +2,9 @@ import itertools
 
 import pytest
 
+import gen_factor_sat.tests.utils as test_utils
+from gen_factor_sat import utils
+from gen_factor_sat.circuit.instances import TseitinFactoringStrategy, TseitinHashingFactoringStrategy
 from gen_factor_sat.circuit.tseitin.circuit import CNFBuilder, TseitinGateStrategy
 from gen_factor_sat.circuit.tseitin.encoding import and_equality, or_equality, xor_equality, equal_equality
 from gen_factor_sat.formula.symbol import constant, variable
@@ -121,3 +124,66 @@ def check_constant_prop(method, args, expected):
 
         assert result == expected, \
             'Constant propagation should return the expected result'
+
+
+def test_structural_hashing():
+    cnf_builder = CNFBuilder(2)
+    strategy = TseitinHashingFactoringStrategy()
+    variable_1, variable_2 = variable(1), variable(2)
+
+    result_and = strategy.wire_and(variable_1, variable_2, cnf_builder)
+    assert strategy.wire_and(variable_2, variable_1, cnf_builder) == result_and, \
+        'The order of the inputs should not matter'
+
+    result_or = strategy.wire_or(-variable_1, -variable_2, cnf_builder)
+    assert result_or == -result_and, 'An OR-Gate should reuse the AND-Gate of the negated inputs'
+
+    result_xor = strategy.xor(variable_1, variable_2, cnf_builder)
+    assert strategy.xor(-variable_2, variable_1, cnf_builder) == -result_xor, \
+        'Negated inputs should reuse the XOR-Gate'
+
+    assert cnf_builder.number_of_variables == 4, 'Only one AND-Gate and one XOR-Gate should be encoded'
+    assert len(cnf_builder.clauses) == 7
+
+
+@pytest.mark.parametrize('method, args, expected', [
+    ('wire_and', [1, 1], 1),
+    ('wire_and', [1, -1], '0'),
+    ('wire_or', [-1, -1], -1),
+    ('wire_or', [1, -1], '1'),
+    ('xor', [1, 1], '0'),
+    ('xor', [1, -1], '1')
+])
+def test_structural_hashing_identities(method, args, expected):
+    strategy = TseitinHashingFactoringStrategy()
+    check_constant_prop(getattr(strategy, method), list(map(variable, args)), expected)
+
+
+@pytest.mark.parametrize('strategy', [TseitinFactoringStrategy(), TseitinHashingFactoringStrategy()])
+@pytest.mark.parametrize('signs', list(itertools.product([1, -1], repeat=3)))
+def test_full_adder_cells(strategy, signs):
+    cnf_builder = CNFBuilder(3)
+    inputs = [sign * variable(x) for sign, x in zip(signs, [1, 2, 3])]
+    output_sum, output_carry = strategy.full_adder(*inputs, cnf_builder)
+
+    assert cnf_builder.number_of_variables == 5, 'The sum and the carry should be encoded as single cells'
+
+    for values in itertools.product([False, True], repeat=3):
+        assignment = list(test_utils.assign([1, 2, 3], values))
+        result = test_utils.run_cnf(assignment, [output_carry, output_sum], cnf_builder.clauses)
+
+        bits = [value == (sign > 0) for value, sign in zip(values, signs)]
+        assert utils.to_int(result) == sum(bits)
+
+
+@pytest.mark.parametrize('args, expected', [
+    ([1, 1, 2], (2, 1)),
+    ([1, -1, 2], (-2, 2)),
+    ([1, '0', '1'], (-1, 1))
+])
+def test_full_adder_folding(args, expected):
+    strategy = TseitinHashingFactoringStrategy()
+    cnf_builder = CNFBuilder(2)
+
+    assert strategy.full_adder(*args, cnf_builder) == expected
+    assert cnf_builder.number_of_variables == 2, 'Repeated and constant inputs should be folded'
@@ -0,0 +1,68 @@
+import io
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import integers
+
+from gen_factor_sat.circuit.instances import TseitinHashingFactoringStrategy
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.template import TemplateCache
+
+
+@settings(deadline=None)
+@given(integers(min_value=2 ** 15, max_value=2 ** 16 - 1))
+def test_template_matches_encoding(number):
+    templates = TemplateCache()
+    FactoringSat.factorize_number(2 ** 15, templates=templates)
+
+    assert len(templates) == 1
+    assert FactoringSat.factorize_number(number, templates=templates) == FactoringSat.factorize_number(number), \
+        'The template should produce the same encoding'
+    assert len(templates) == 1, 'Numbers of the same length should share the template'
+
+
+@pytest.mark.parametrize('number', [2, 17, 2 ** 15 + 17896, 2 ** 23 + 1247561])
+def test_template_containers(number):
+    templates = TemplateCache()
+
+    dimacs, template_dimacs = io.StringIO(), io.StringIO()
+    FactoringSat.factorize_number(number, file=dimacs)
+    FactoringSat.factorize_number(number, file=template_dimacs, templates=templates)
+    assert template_dimacs.getvalue() == dimacs.getvalue(), 'The streamed DIMACS should be the same'
+
+    compact = FactoringSat.factorize_number(number, compact=True)
+    template_compact = FactoringSat.factorize_number(number, compact=True, templates=templates)
+    assert list(template_compact.cnf.clauses) == list(compact.cnf.clauses), 'The clause order should be the same'
+
+
+def test_template_keys():
+    templates = TemplateCache()
+    strategy = TseitinHashingFactoringStrategy()
+
+    FactoringSat.factorize_number(1000, templates=templates)
+    FactoringSat.factorize_number(1001, templates=templates)
+    assert len(templates) == 1
+
+    FactoringSat.factorize_number(10000, templates=templates)
+    assert len(templates) == 2, 'Different lengths should use different templates'
+
+    factor_sat = FactoringSat.factorize_number(1000, strategy=strategy, templates=templates)
+    assert len(templates) == 3, 'Different strategies should use different templates'
+    assert factor_sat == FactoringSat.factorize_number(1000, strategy=strategy)
+
+
+def test_template_eviction():
+    templates = TemplateCache(max_size=2)
+    created = []
+
+    def create(key):
+        return lambda: created.append(key) or key
+
+    templates.get(1, create(1))
+    templates.get(2, create(2))
+    templates.get(1, create(1))
+    templates.get(3, create(3))
+
+    assert created == [1, 2, 3]
+    assert 1 in templates and 3 in templates
+    assert 2 not in templates, 'The least recently used template should be evicted'
@@ -23,3 +23,12 @@ def check_assignments(variables, clauses, bool_expr):
         result = test_utils.run_cnf(assignment, [], clauses)
 
         assert (result is not None) == bool_expr(*values)
+
+
+@pytest.mark.parametrize('variables', [[1, 2, 3, 4]])
+@pytest.mark.parametrize('tseitin, bool_expr', [
+    (te.xor3_equality, lambda x, y, c, z: (x ^ y ^ c) == z),
+    (te.majority_equality, lambda x, y, c, z: (x + y + c >= 2) == z)
+])
+def test_cell_assignments(variables, tseitin, bool_expr):
+    check_assignments(variables, tseitin(*variables), bool_expr)
@@ -0,0 +1,123 @@
+import io
+import itertools
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import booleans, integers, lists, sets, tuples
+from pysat.solvers import Solver
+
+import gen_factor_sat.tests.utils as test_utils
+from gen_factor_sat.circuit.instances import TseitinHashingFactoringStrategy
+from gen_factor_sat.factoring_sat import FactoringSat
+from gen_factor_sat.formula.cnf import CNF
+from gen_factor_sat.formula.simplify import simplify
+from gen_factor_sat.formula.xor import XorConstraint, merge_chains
+from gen_factor_sat.template import TemplateCache
+
+literals = integers(min_value=-6, max_value=6).filter(bool)
+xors = tuples(sets(integers(min_value=1, max_value=6), max_size=4), booleans()).map(
+    lambda xor: XorConstraint(frozenset(xor[0]), xor[1])
+)
+
+
+def brute_force_sat(number_of_variables, clauses, xor_constraints=()):
+    for values in itertools.product([False, True], repeat=number_of_variables):
+        if all(any(values[abs(x) - 1] == (x > 0) for x in clause) for clause in clauses) \
+                and all(sum(values[x - 1] for x in xor.variables) % 2 == xor.parity for xor in xor_constraints):
+            return True
+
+    return False
+
+
+def test_xor_constraint():
+    xor = XorConstraint.of([3, -1, 2, 2], parity=False)
+
+    assert xor == XorConstraint(frozenset([1, 3]), True), 'Negations should flip the parity'
+    assert xor.to_dimacs() == 'x1 3 0'
+    assert XorConstraint.of([3, 1], parity=False).to_dimacs() == 'x-1 3 0'
+    assert xor.assign({1: True}) == XorConstraint(frozenset([3]), False)
+    assert XorConstraint(frozenset(), True).to_dimacs() == '0'
+
+
+@given(xors)
+def test_xor_to_clauses(xor):
+    for values in itertools.product([False, True], repeat=6):
+        satisfied = sum(values[x - 1] for x in xor.variables) % 2 == xor.parity
+        assert satisfied == all(any(values[abs(x) - 1] == (x > 0) for x in clause) for clause in xor.to_clauses())
+
+
+def test_merge_chain():
+    chain = [XorConstraint.of([1, 2, 4], parity=False), XorConstraint.of([4, 3, 5], parity=False)]
+
+    assert merge_chains(chain, [frozenset([5, 6])], keep=[1, 2, 3]) == [XorConstraint(frozenset([1, 2, 3, 5]), False)]
+    assert merge_chains(chain, [frozenset([4, 5])], keep=[1, 2, 3]) == chain, 'Variables in clauses should be kept'
+    assert merge_chains(chain, [], keep=[1, 2, 3]) == [], 'Free variables can satisfy their constraint'
+
+
+@given(lists(xors, max_size=6), lists(sets(literals, min_size=1, max_size=3), max_size=6))
+def test_merge_preserves_satisfiability(xor_constraints, clauses):
+    merged = merge_chains(xor_constraints, clauses, keep=[1])
+
+    assert brute_force_sat(6, clauses, xor_constraints) == brute_force_sat(6, clauses, merged)
+
+
+@given(lists(xors, max_size=6), lists(sets(literals, min_size=1, max_size=3), max_size=10))
+def test_simplify_xors(xor_constraints, clauses):
+    cnf = CNF(6, set(map(frozenset, clauses)), xor_constraints)
+    simplification = simplify(cnf)
+
+    assert brute_force_sat(6, cnf.clauses, cnf.xors) == brute_force_sat(
+        simplification.cnf.number_of_variables,
+        simplification.cnf.clauses,
+        simplification.cnf.xors
+    ), 'The simplified CNF should be equisatisfiable'
+
+
+@pytest.mark.parametrize('number', [6, 35, 2 ** 10 + 659, (2 ** 10 + 659) * (2 ** 15 + 1414)])
+def test_xor_composite(number):
+    factor_sat = FactoringSat.factorize_number(number, xor=True)
+    unsimplified = FactoringSat.factorize_number(number)
+
+    assert factor_sat.cnf.xors, 'XOR-Gates should be encoded as constraints'
+    assert len(factor_sat.cnf.clauses) < len(unsimplified.cnf.clauses)
+
+    with Solver(name='cadical', bootstrap_with=test_utils.expand(factor_sat.cnf)) as solver:
+        assert solver.solve(), 'The formula of a composite number should be in SAT'
+
+        for model in solver.enum_models():
+            result_a = test_utils.assignment_to_int(factor_sat.factor_1, model)
+            result_b = test_utils.assignment_to_int(factor_sat.factor_2, model)
+            assert result_a * result_b == number, 'The factors should be valid'
+            assert 1 not in (result_a, result_b)
+
+
+@pytest.mark.parametrize('strategy', [None, TseitinHashingFactoringStrategy()])
+@pytest.mark.parametrize('number', [2, 1031, 32771])
+def test_xor_prime(strategy, number):
+    factor_sat = FactoringSat.factorize_number(number, strategy=strategy, xor=True, simplify=True)
+
+    assert not test_utils.is_satisfiable(factor_sat.cnf), 'The formula of a prime number should be in UNSAT'
+
+
+def test_xor_dimacs():
+    file = io.StringIO()
+    factor_sat = FactoringSat.factorize_number(2 ** 15 + 17896, file=file, xor=True)
+    lines = [line.strip() for line in file.getvalue().splitlines()]
+
+    assert 'c To reproduce this results call: gen_factor_sat number --xor 50664' in lines
+    assert file.getvalue().split() == factor_sat.to_dimacs().split()
+    assert sum(line.startswith('x') for line in lines) == len(factor_sat.cnf.xors)
+    assert 'p cnf {0} {1}'.format(
+        factor_sat.cnf.number_of_variables,
+        len(factor_sat.cnf.clauses) + len(factor_sat.cnf.xors)
+    ) in lines
+
+
+def test_xor_template():
+    templates = TemplateCache()
+    FactoringSat.factorize_number(2 ** 15 + 1, templates=templates, xor=True)
+
+    assert FactoringSat.factorize_number(2 ** 15 + 3, templates=templates, xor=True) \
+           == FactoringSat.factorize_number(2 ** 15 + 3, xor=True)
+    assert FactoringSat.factorize_number(2 ** 15 + 3, templates=templates) \
+           == FactoringSat.factorize_number(2 ** 15 + 3), 'The XOR mode should use separate templates'
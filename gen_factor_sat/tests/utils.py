@@ -30,3 +30,27 @@ def assignment_to_bin(variables, assignments):
             yield utils.to_bin_string(assignment >= 0)
         else:
             raise ValueError("Invalid output: " + variable)
+
+
+def expand(cnf):
+    # Replace the XOR constraints by clauses, such that any solver can be used
+    return list(cnf.clauses) + [clause for xor in cnf.xors for clause in xor.to_clauses()]
+
+
+def is_satisfiable(cnf):
+    with Solver(name='cadical', bootstrap_with=expand(cnf)) as solver:
+        return solver.solve()
+
+
+def assert_factorization(factor_sat, number):
+    # Solve the instance and check the factors of the model, returns whether the instance is satisfiable
+    with Solver(name='cadical', bootstrap_with=expand(factor_sat.cnf)) as solver:
+        satisfiable = solver.solve()
+        if satisfiable:
+            model = solver.get_model()
+            factor_1 = assignment_to_int(factor_sat.factor_1, model)
+            factor_2 = assignment_to_int(factor_sat.factor_2, model)
+            assert factor_1 * factor_2 == number, 'The factors should be valid'
+            assert factor_1 > 1 and factor_2 > 1, 'The factors should be non trivial'
+
+    return satisfiable